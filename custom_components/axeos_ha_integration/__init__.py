@@ -1,14 +1,63 @@
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP, Platform
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.util import dt as dt_util
 from datetime import timedelta
 import logging
+import time
 
-from .const import DOMAIN, DEFAULT_SCAN_INTERVAL, CONF_HOST, CONF_NAME
+from .const import (
+    DOMAIN,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_READ_TIMEOUT,
+    CONF_HOST,
+    CONF_NAME,
+    RELOCATED_ADDRESS,
+    AUTOTUNE_STORAGE_VERSION,
+    BACKFILL_STORAGE_VERSION,
+    DERIVED_DATA_KEYS,
+    SYSTEM_INFO_OBJECTS,
+    HASHRATE_HISTORY_SIZE,
+    ASIC_SCAN_INTERVAL,
+    EVENT_ANOMALY,
+    EVENT_CHANGED,
+    EVENT_WATCHDOG,
+    DEFAULT_WATCHDOG_SHARES_WINDOW,
+    DEFAULT_WATCHDOG_HASHRATE_WINDOW,
+    DEFAULT_WATCHDOG_NONCE_WINDOW,
+    DEFAULT_WATCHDOG_NONCE_THRESHOLD,
+    DEFAULT_WATCHDOG_COOLDOWN,
+    DEFAULT_HEAP_RESTART_THRESHOLD,
+    DEFAULT_HEAP_RESTART_HOUR,
+    DEFAULT_FAN_TARGET_TEMP,
+    ENERGY_MAX_GAP,
+    FAN_CONTROL_STALE_TIMEOUT,
+)
 from .api import AxeOSAPI
+from .binary_sensor import BINARY_SENSOR_TYPES
+from .number import NUMBER_TYPES
+from .sensor import SENSOR_TYPES
+from .switch import SWITCH_TYPES
+from .anomaly import AxeOSAnomalyDetector
+from .asic import AxeOSAsicReader
+from .backfill import AxeOSStatisticsBackfill
+from .longterm import HourlyStatistics
+from .changes import diff_snapshots
+from .heap import HeapForecaster
+from .energy import EnergyMeter
+from .fan_control import AxeOSFanController, FanControlSettings
+from .watchdog import ACTION_RESTART, AxeOSWatchdog, WatchdogSettings
+from .exporter import async_register_metrics_view
+from .autotune import AxeOSAutotuner
+from .fleet import async_close_fleet_session, async_get_fleet_data, async_get_fleet_session
+from .power_budget import async_get_power_budget_controller
+from .profiles import async_sync_entity_registry
 from .services import async_setup_services, async_unload_services
 
 def get_logger(level):
@@ -16,6 +65,24 @@ def get_logger(level):
     logger.setLevel(getattr(logging, level.upper(), logging.INFO))
     return logger
 
+def system_info_fields() -> set[str]:
+    """Top-level /api/system/info keys read by any entity.
+
+    Nested paths like ["stratum", "poolMode"] and "stratum.usingFallback"
+    only need their top-level object; other sensor paths with several keys
+    list alternatives, which are all kept. Keys the integration adds itself
+    (DERIVED_DATA_KEYS) are not part of the response.
+    """
+    fields: set[str] = set(SWITCH_TYPES)
+    for _name, _unit, path, *_rest in SENSOR_TYPES.values():
+        nested = path[0] in SYSTEM_INFO_OBJECTS or path[0] in DERIVED_DATA_KEYS
+        fields.update(path[:1] if nested else path)
+    for _name, path, *_rest in BINARY_SENSOR_TYPES.values():
+        fields.update(key.split(".")[0] for key in path)
+    for _name, _unit, path, *_rest in NUMBER_TYPES.values():
+        fields.add(path)
+    return fields - set(DERIVED_DATA_KEYS)
+
 PLATFORMS: list[Platform] = [
     Platform.SENSOR,
     Platform.BUTTON,
@@ -32,29 +99,175 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     host = entry.data[CONF_HOST]
     name = entry.data.get(CONF_NAME, host)
 
-    # Use shared aiohttp session from Home Assistant
-    session = async_get_clientsession(hass)
-    api = AxeOSAPI(session, host)
-
+    # Dedicated keep-alive connection pool shared by all miners
+    session = async_get_fleet_session(hass)
+    # Keep only the fields entities read, unless the full response is wanted for debugging
+    fields = None if entry.options.get("raw_system_info", False) else system_info_fields()
+    scan_interval = entry.options.get("scan_interval", entry.data.get("scan_interval", DEFAULT_SCAN_INTERVAL))
+    # The MAC address recorded on the device lets a miner be found again after
+    # a DHCP lease change, even when it is unreachable at startup
+    device_registry = dr.async_get(hass)
+    device = device_registry.async_get_device(identifiers={(DOMAIN, entry.entry_id)})
+    mac_addr = next(
+        (value for kind, value in device.connections if kind == dr.CONNECTION_NETWORK_MAC),
+        None,
+    ) if device else None
     entry_data = hass.data.setdefault(DOMAIN, {}).setdefault(entry.entry_id, {})
 
+    @callback
+    def _async_relocated(address: str) -> None:
+        # Kept across setup retries and restarts
+        hass.config_entries.async_update_entry(entry, data={**entry.data, RELOCATED_ADDRESS: address})
+
+    api = AxeOSAPI(
+        session,
+        host,
+        fields=fields,
+        mac_addr=mac_addr,
+        connect_timeout=entry.options.get("connect_timeout", DEFAULT_CONNECT_TIMEOUT),
+        read_timeout=entry.options.get("read_timeout", DEFAULT_READ_TIMEOUT),
+        # Retries of a failed poll have to finish before the next one is due
+        poll_budget=scan_interval,
+        # Setup retries create a new client; the scan interval still applies
+        last_rediscovery=entry_data.get("last_rediscovery"),
+        on_relocate=_async_relocated,
+    )
+    if relocated := entry.data.get(RELOCATED_ADDRESS):
+        api.resolver.relocate(relocated)
+    anomaly_detector = AxeOSAnomalyDetector()
+    heap_forecaster = HeapForecaster()
+    heap_restart = entry.options.get("heap_restart", False)
+    heap_restart_threshold = entry.options.get("heap_restart_threshold", DEFAULT_HEAP_RESTART_THRESHOLD)
+    heap_restart_hour = entry.options.get("heap_restart_hour", DEFAULT_HEAP_RESTART_HOUR)
+    watchdog = None
+    if entry.options.get("watchdog", False):
+        watchdog = entry_data["watchdog"] = AxeOSWatchdog(
+            WatchdogSettings(
+                shares_window=entry.options.get("watchdog_shares_window", DEFAULT_WATCHDOG_SHARES_WINDOW),
+                hashrate_window=entry.options.get("watchdog_hashrate_window", DEFAULT_WATCHDOG_HASHRATE_WINDOW),
+                nonce_window=entry.options.get("watchdog_nonce_window", DEFAULT_WATCHDOG_NONCE_WINDOW),
+                nonce_threshold=entry.options.get("watchdog_nonce_threshold", DEFAULT_WATCHDOG_NONCE_THRESHOLD),
+                cooldown=entry.options.get("watchdog_cooldown", DEFAULT_WATCHDOG_COOLDOWN),
+            )
+        )
+    fan_controller = None
+    if entry.options.get("fan_control", False):
+        fan_controller = entry_data["fan_controller"] = AxeOSFanController(
+            FanControlSettings(
+                target_temp=entry.options.get("fan_target_temp", DEFAULT_FAN_TARGET_TEMP),
+                throttle_frequency=entry.options.get("fan_throttle_frequency", False),
+                # Checked every scan interval, so it has to span a few of them
+                stale_timeout=max(FAN_CONTROL_STALE_TIMEOUT, 3 * scan_interval),
+            )
+        )
+    last_poll = time.monotonic()
+    # Energy sensor total; the sensor restores it across restarts
+    energy_meter = entry_data["energy_meter"] = EnergyMeter(max(ENERGY_MAX_GAP, 3 * scan_interval))
+    host_id = str(host).replace(" ", "_").replace(".", "_").lower()
+    # Hourly mean/min/max of the high-churn values, written as external statistics
+    hourly = None
+    if entry.options.get("hourly_statistics", False):
+        hourly = HourlyStatistics(
+            hass, host_id, name, {key: (label, unit) for key, (label, unit, *_rest) in SENSOR_TYPES.items()}
+        )
+        entry.async_on_unload(hourly.async_start())
+    # Hours missed while the miner (or Home Assistant) was down are rebuilt
+    # from the miner's statistics buffer once it answers again
+    backfill = AxeOSStatisticsBackfill(
+        hass,
+        api,
+        host_id,
+        {key: unit for key, (_name, unit, *_rest) in SENSOR_TYPES.items()},
+        Store(hass, BACKFILL_STORAGE_VERSION, f"{DOMAIN}.backfill.{entry.entry_id}"),
+        hourly,
+    )
+    await backfill.async_load()
+
     async def async_update_data():
+        nonlocal last_poll
         system_info = await api.get_system_info()
         if system_info is None:
             raise UpdateFailed(f"Cannot fetch system info from {host}")
+        last_poll = time.monotonic()
+        energy_meter.add(system_info, last_poll)
+
+        if gap := backfill.poll_succeeded():
+            entry.async_create_background_task(
+                hass, backfill.async_backfill(*gap), f"{DOMAIN}_backfill_{host}"
+            )
+        if hourly is not None:
+            hourly.add(system_info)
+
+        # Runs on unchanged bodies too: a hung miner may keep sending the same one
+        if watchdog is not None:
+            if incident := watchdog.update(system_info):
+                hass.bus.async_fire(
+                    EVENT_WATCHDOG,
+                    {"entry_id": entry.entry_id, "host": host, "name": name, **incident},
+                )
+                if incident["action"] == ACTION_RESTART:
+                    entry.async_create_background_task(
+                        hass, watchdog.async_restart(api, incident), f"{DOMAIN}_watchdog_{host}"
+                    )
+            state = dict(watchdog.state)
+            if system_info is coordinator.data and system_info.get("watchdog") != state:
+                # Byte-identical body with a new watchdog state: a new object,
+                # so entities are notified, which the client hands back for
+                # the next identical body to keep the short-circuit below
+                system_info = {**system_info, "watchdog": state}
+                api.adopt_snapshot(system_info)
+                return system_info
+            system_info["watchdog"] = state
+
+        # Byte-identical body: the API hands back the snapshot we already
+        # processed, so there is nothing to diff, record or dispatch
+        if system_info is coordinator.data:
+            return system_info
+
+        # One compact event per poll with every field that changed since the last one
+        if coordinator.data and (
+            changes := diff_snapshots(coordinator.data, system_info, ignore=DERIVED_DATA_KEYS)
+        ):
+            hass.bus.async_fire(
+                EVENT_CHANGED,
+                {"entry_id": entry.entry_id, "host": host, "name": name, "changes": changes},
+            )
 
         hr = system_info.get("hashRate")
         if hr is not None:
-            history = entry_data.get("hashrate_history", [])
+            history = entry_data.setdefault("hashrate_history", [])
             history.append(hr)
-            if len(history) > 100:
-                history = history[-100:]
-            entry_data["hashrate_history"] = history
+            del history[:-HASHRATE_HISTORY_SIZE]
             system_info["hashrate_history"] = history
 
+        for change in anomaly_detector.update(system_info):
+            hass.bus.async_fire(
+                EVENT_ANOMALY,
+                {"entry_id": entry.entry_id, "host": host, "name": name, **change},
+            )
+        system_info["anomaly"] = dict(anomaly_detector.state)
+
+        # Leak rate and time left until freeHeap runs out
+        system_info["heap"] = heap_forecaster.update(system_info)
+        if heap_restart and heap_forecaster.restart_due(
+            dt_util.now(), heap_restart_threshold, heap_restart_hour
+        ):
+            _LOGGER.warning(
+                "Free heap of %s forecast to run out in %s h, restarting",
+                host,
+                system_info["heap"]["hours_to_exhaustion"],
+            )
+            entry.async_create_background_task(hass, api.restart_system(), f"{DOMAIN}_heap_restart_{host}")
+
+        if fan_controller is not None:
+            if command := fan_controller.update(system_info):
+                entry.async_create_background_task(
+                    hass, fan_controller.async_apply(api, command), f"{DOMAIN}_fan_control_{host}"
+                )
+            system_info["fan_control"] = dict(fan_controller.state)
+
         return system_info
 
-    scan_interval = entry.options.get("scan_interval", entry.data.get("scan_interval", DEFAULT_SCAN_INTERVAL))
     coordinator = DataUpdateCoordinator(
         hass,
         _LOGGER,
@@ -62,41 +275,114 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         name=f"{DOMAIN}_{host}",
         update_method=async_update_data,
         update_interval=timedelta(seconds=scan_interval),
+        # Only notify entities when the snapshot actually changed
+        always_update=False,
     )
 
     # Initial update to check connectivity; raises ConfigEntryNotReady on failure
-    await coordinator.async_config_entry_first_refresh()
+    try:
+        await coordinator.async_config_entry_first_refresh()
+    except ConfigEntryNotReady:
+        # A failed setup never gets to REDISCOVERY_FAILURES polls, so a miner
+        # that got a new DHCP lease while unreachable is searched for here
+        try:
+            moved = await api.async_rediscover()
+        finally:
+            entry_data["last_rediscovery"] = api.last_rediscovery
+        if not moved:
+            raise
+        await coordinator.async_config_entry_first_refresh()
+
+    # Per-chip telemetry of multi-ASIC boards, on its own slower schedule so
+    # the main poll stays as cheap as before
+    asic_coordinator = None
+    if (coordinator.data.get("asicCount") or 1) > 1:
+        asic_reader = AxeOSAsicReader(api)
+
+        async def async_update_asics():
+            chips = await asic_reader.async_read()
+            if chips is None:
+                raise UpdateFailed(f"Cannot fetch ASIC data from {host}")
+            return chips
+
+        asic_coordinator = DataUpdateCoordinator(
+            hass,
+            _LOGGER,
+            config_entry=entry,
+            name=f"{DOMAIN}_{host}_asic",
+            update_method=async_update_asics,
+            update_interval=timedelta(seconds=ASIC_SCAN_INTERVAL),
+            always_update=False,
+        )
+        # Not fatal: the board-level sensors work without it
+        await asic_coordinator.async_refresh()
 
     # Store coordinator and API client in hass.data for platforms
     entry_data.update(
         {
             "coordinator": coordinator,
+            "asic_coordinator": asic_coordinator,
             "api": api,
+            "autotuner": AxeOSAutotuner(
+                api, Store(hass, AUTOTUNE_STORAGE_VERSION, f"{DOMAIN}.autotune.{entry.entry_id}")
+            ),
             "host": host,
             "name": name,
         }
     )
 
+    if fan_controller is not None:
+        # Hand the fan back to the firmware whenever this loop can no longer
+        # drive it: stalled polling and Home Assistant shutdown (unloading is
+        # handled in async_unload_entry, while the session is still open)
+        async def _async_release_fan(_event) -> None:
+            await fan_controller.async_release(api)
+
+        @callback
+        def _async_check_stale(_now) -> None:
+            if command := fan_controller.check_stale(last_poll):
+                entry.async_create_background_task(
+                    hass, fan_controller.async_apply(api, command), f"{DOMAIN}_fan_control_{host}"
+                )
+
+        entry.async_on_unload(
+            async_track_time_interval(hass, _async_check_stale, timedelta(seconds=scan_interval))
+        )
+        entry.async_on_unload(hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_release_fan))
+
     # Register device in device registry
-    device_registry = dr.async_get(hass)
     device_registry.async_get_or_create(
         config_entry_id=entry.entry_id,
         identifiers={(DOMAIN, entry.entry_id)},
+        connections={(dr.CONNECTION_NETWORK_MAC, dr.format_mac(api.mac_addr))} if api.mac_addr else set(),
         name=name,
         manufacturer="BitAxe",
         model=coordinator.data.get("boardVersion", "BitAxe Miner"),
         sw_version=coordinator.data.get("version", ""),
     )
 
+    # Entities registered under an earlier profile
+    async_sync_entity_registry(hass, entry, host_id)
+
     # Load platforms (sensor + button if desired)
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     
     # Setup services
     await async_setup_services(hass)
 
+    # Fleet-wide OpenMetrics endpoint
+    async_register_metrics_view(hass)
+
+    # Resume a fleet power budget persisted before a restart
+    await async_get_power_budget_controller(hass).async_start()
+
     # Reload entry when options change
+    options = dict(entry.options)
+
     async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
-        await hass.config_entries.async_reload(entry.entry_id)
+        # A relocation only changes entry.data, and the client already uses it
+        if entry.options != options:
+            await hass.config_entries.async_reload(entry.entry_id)
 
     entry.async_on_unload(entry.add_update_listener(_async_update_listener))
 
@@ -106,10 +392,26 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Called when the config entry is removed."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        entry_data = hass.data[DOMAIN].pop(entry.entry_id)
+        # Before the shared session may be closed below
+        entry_data["api"].cancel_rediscovery()
+        # Background tasks are only cancelled after this returns; the tuner
+        # restores the original setpoint on the way out
+        if (autotuner := entry_data.get("autotuner")) is not None:
+            await autotuner.async_stop()
+        if (fan_controller := entry_data.get("fan_controller")) is not None:
+            await fan_controller.async_release(entry_data["api"])
         
-        # Unload services if this is the last entry
+        # Unload services and fleet controllers if this is the last entry
         if not hass.data[DOMAIN]:
             await async_unload_services(hass)
+            if (power_budget := async_get_fleet_data(hass).get("power_budget")) is not None:
+                power_budget.async_stop()
+            await async_close_fleet_session(hass)
             
     return unload_ok
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Called when the config entry is deleted; drop its persisted state."""
+    await Store(hass, AUTOTUNE_STORAGE_VERSION, f"{DOMAIN}.autotune.{entry.entry_id}").async_remove()
+    await Store(hass, BACKFILL_STORAGE_VERSION, f"{DOMAIN}.backfill.{entry.entry_id}").async_remove()
@@ -0,0 +1,141 @@
+"""Streaming anomaly detection on miner telemetry.
+
+Every detector keeps a constant amount of state per metric (an EWMA mean and
+variance plus a one-sided CUSUM accumulator), so it can run on every poll for the
+whole fleet.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any
+
+DIRECTION_LOW = -1
+DIRECTION_HIGH = 1
+
+
+class StreamingDetector:
+    """EWMA baseline with z-score and one-sided CUSUM change-point detection.
+
+    ``direction`` selects which deviations are anomalous (DIRECTION_LOW for
+    sags, DIRECTION_HIGH for rises). A sample is anomalous once the detector
+    is warmed up and either its z-score against the baseline exceeds
+    ``z_threshold`` or the CUSUM of standardized deviations exceeds
+    ``cusum_h``; the latter catches slow drifts that never produce a large
+    single z-score.
+    """
+
+    __slots__ = (
+        "alpha",
+        "z_threshold",
+        "cusum_k",
+        "cusum_h",
+        "warmup",
+        "direction",
+        "min_std",
+        "rel_std",
+        "mean",
+        "var",
+        "count",
+        "cusum",
+        "z",
+    )
+
+    def __init__(
+        self,
+        direction: int,
+        *,
+        alpha: float = 0.05,
+        z_threshold: float = 4.0,
+        cusum_k: float = 0.5,
+        cusum_h: float = 8.0,
+        warmup: int = 10,
+        min_std: float = 0.0,
+        rel_std: float = 0.0,
+    ) -> None:
+        self.alpha = alpha
+        self.z_threshold = z_threshold
+        self.cusum_k = cusum_k
+        self.cusum_h = cusum_h
+        self.warmup = warmup
+        self.direction = direction
+        self.min_std = min_std
+        self.rel_std = rel_std
+        self.mean = 0.0
+        self.var = 0.0
+        self.count = 0
+        self.cusum = 0.0
+        self.z = 0.0
+
+    def update(self, value: float) -> bool:
+        """Feed one sample; return whether the metric is currently anomalous."""
+        self.count += 1
+        if self.count == 1:
+            self.mean = value
+            return False
+
+        std = max(math.sqrt(self.var), self.min_std, self.rel_std * abs(self.mean))
+        deviation = value - self.mean
+        self.z = self.direction * deviation / std if std else 0.0
+        # Capped so the alarm clears within cusum_h / cusum_k samples of recovery
+        self.cusum = min(max(0.0, self.cusum + self.z - self.cusum_k), 2 * self.cusum_h)
+
+        # Exponentially weighted mean/variance (West's incremental form)
+        increment = self.alpha * deviation
+        self.mean += increment
+        self.var = (1 - self.alpha) * (self.var + deviation * increment)
+
+        if self.count <= self.warmup:
+            self.cusum = 0.0
+            return False
+        return self.z > self.z_threshold or self.cusum > self.cusum_h
+
+
+class AxeOSAnomalyDetector:
+    """Per-miner set of detectors for hashrate sag, VR temperature creep and reject spikes."""
+
+    METRICS = ("hashrate", "vr_temp", "rejects")
+
+    def __init__(self) -> None:
+        self._detectors = {
+            "hashrate": StreamingDetector(DIRECTION_LOW, rel_std=0.02),
+            "vr_temp": StreamingDetector(DIRECTION_HIGH, min_std=0.5),
+            "rejects": StreamingDetector(DIRECTION_HIGH, min_std=1.0, cusum_h=5.0),
+        }
+        self._last_rejected: float | None = None
+        self.state = dict.fromkeys(self.METRICS, False)
+
+    def _samples(self, data: dict[str, Any]) -> dict[str, float]:
+        samples: dict[str, float] = {}
+        hashrate = data.get("hashRate_1m", data.get("hashRate"))
+        if isinstance(hashrate, (int, float)):
+            samples["hashrate"] = hashrate
+        if isinstance(data.get("vrTemp"), (int, float)) and data["vrTemp"] > 0:
+            samples["vr_temp"] = data["vrTemp"]
+        rejected = data.get("sharesRejected")
+        if isinstance(rejected, (int, float)):
+            # Rejected shares per poll; the counter restarts with the miner
+            if self._last_rejected is not None and rejected >= self._last_rejected:
+                samples["rejects"] = rejected - self._last_rejected
+            self._last_rejected = rejected
+        return samples
+
+    def update(self, data: dict[str, Any]) -> list[dict[str, Any]]:
+        """Feed a system info snapshot; return the metrics whose anomaly state changed."""
+        changes: list[dict[str, Any]] = []
+        for metric, value in self._samples(data).items():
+            detector = self._detectors[metric]
+            active = detector.update(value)
+            if active != self.state[metric]:
+                self.state[metric] = active
+                changes.append(
+                    {
+                        "metric": metric,
+                        "active": active,
+                        "value": value,
+                        "baseline": round(detector.mean, 3),
+                        "z_score": round(detector.z, 2),
+                        "cusum": round(detector.cusum, 2),
+                    }
+                )
+        return changes
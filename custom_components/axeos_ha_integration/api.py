@@ -1,56 +1,558 @@
 import asyncio
 import aiohttp
+import hashlib
+import ipaddress
+import json
 import logging
+import os
+import random
+import socket
+import time
+from collections.abc import AsyncIterator, Callable, Collection
+from typing import Any
+
+try:
+    from orjson import loads as json_loads
+except ImportError:  # pragma: no cover - orjson ships with Home Assistant
+    json_loads = json.loads
 
 from .const import (
+    CONNECTION_KEEPALIVE_TIMEOUT,
+    MAX_CONNECTIONS_PER_MINER,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_MAX_IN_FLIGHT,
+    DEFAULT_READ_TIMEOUT,
+    DEFAULT_SCAN_INTERVAL,
+    DNS_CACHE_TTL,
+    POLL_ATTEMPTS,
+    POLL_RETRY_BACKOFF,
+    REDISCOVERY_CONCURRENCY,
+    REDISCOVERY_FAILURES,
+    REDISCOVERY_INTERVAL,
+    REDISCOVERY_PROBE_TIMEOUT,
+    MAX_STATISTICS_BYTES,
+    MAX_SYSTEM_INFO_BYTES,
     API_SYSTEM,
     API_SYSTEM_INFO,
+    API_SYSTEM_STATISTICS,
+    API_SYSTEM_ASIC,
+    API_SYSTEM_OTA,
+    API_SYSTEM_OTAWWW,
+    OTA_CHUNK_SIZE,
+    OTA_TIMEOUT,
     API_SYSTEM_RESTART,
     API_SYSTEM_FREQUENCY,
     API_SYSTEM_VOLTAGE,
     API_SYSTEM_FANSPEED,
 )
+from .scheduler import PRIORITY_POLL, PRIORITY_WRITE, RequestScheduler
 
 _LOGGER = logging.getLogger(__name__)
 
+OUTCOME_OK = "ok"
+OUTCOME_TIMEOUT = "timeout"
+OUTCOME_CONNECTION_ERROR = "connection_error"
+OUTCOME_HTTP_ERROR = "http_error"
+OUTCOME_INVALID_RESPONSE = "invalid_response"
+
+
+class HTTPStatusError(Exception):
+    """Non-200 answer from the miner."""
+
+    def __init__(self, status: int) -> None:
+        super().__init__(f"HTTP {status}")
+        self.status = status
+
+
+def classify_error(err: Exception) -> tuple[str, bool]:
+    """Return the outcome of a failed request and whether a GET may be retried."""
+    if isinstance(err, TimeoutError):
+        return OUTCOME_TIMEOUT, True
+    if isinstance(err, aiohttp.ClientError):
+        return OUTCOME_CONNECTION_ERROR, True
+    if isinstance(err, HTTPStatusError):
+        return OUTCOME_HTTP_ERROR, err.status >= 500
+    return OUTCOME_INVALID_RESPONSE, False
+
+
+async def _on_connection_create_end(session, ctx, params) -> None:
+    if isinstance(ctx.trace_request_ctx, dict) and "connections_opened" in ctx.trace_request_ctx:
+        ctx.trace_request_ctx["connections_opened"] += 1
+
+
+async def _on_connection_reuseconn(session, ctx, params) -> None:
+    if isinstance(ctx.trace_request_ctx, dict) and "connections_reused" in ctx.trace_request_ctx:
+        ctx.trace_request_ctx["connections_reused"] += 1
+
+
+def create_session() -> aiohttp.ClientSession:
+    """Create a session with a connection pool tuned for AxeOS miners.
+
+    The ESP32 web server only has a few sockets, so connections are capped per
+    miner and kept alive across polls instead of being reopened every time.
+    Each AxeOSAPI counts opened vs. reused connections through trace hooks.
+    """
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_connection_create_end.append(_on_connection_create_end)
+    trace_config.on_connection_reuseconn.append(_on_connection_reuseconn)
+    connector = aiohttp.TCPConnector(
+        limit_per_host=MAX_CONNECTIONS_PER_MINER,
+        keepalive_timeout=CONNECTION_KEEPALIVE_TIMEOUT,
+    )
+    return aiohttp.ClientSession(connector=connector, trace_configs=[trace_config])
+
+
+def _is_ip(value: str) -> bool:
+    try:
+        ipaddress.ip_address(value)
+    except ValueError:
+        return False
+    return True
+
+
+class HostResolver:
+    """Resolves a miner's configured host to the IPv4 address requests go to.
+
+    Host names are looked up at most once per ``ttl`` seconds. The address
+    that last answered is pinned and used whenever a lookup fails (e.g. mDNS
+    hiccups). ``relocate`` overrides both host name and configured IP once a
+    miner has been found at a new address.
+    """
+
+    def __init__(self, host: str, ttl: float = DNS_CACHE_TTL) -> None:
+        name, _sep, port = host.rpartition(":")
+        if not _sep or not port.isdigit() or ":" in name:
+            name, port = host, ""
+        self.name = name
+        self.port = port
+        self.ttl = ttl
+        self.is_ip = _is_ip(name)
+        self.pinned: str | None = None
+        self.relocated: str | None = None
+        self.lookups = 0
+        self._cached: str | None = None
+        self._expires = 0.0
+
+    def netloc(self, address: str) -> str:
+        return f"{address}:{self.port}" if self.port else address
+
+    @property
+    def known_address(self) -> str | None:
+        """Best address known without a lookup."""
+        if self.relocated is not None:
+            return self.relocated
+        if self.is_ip:
+            return self.name
+        return self.pinned or self._cached
+
+    async def async_resolve(self) -> str:
+        """Return the address to connect to."""
+        if self.relocated is not None:
+            return self.relocated
+        if self.is_ip:
+            return self.name
+        if self._cached is not None and time.monotonic() < self._expires:
+            return self._cached
+        self.lookups += 1
+        try:
+            infos = await asyncio.get_running_loop().getaddrinfo(
+                self.name, None, family=socket.AF_INET, type=socket.SOCK_STREAM
+            )
+        except OSError as err:
+            if self.pinned is None:
+                raise
+            _LOGGER.debug("Resolving %s failed (%s), using %s", self.name, err, self.pinned)
+            return self.pinned
+        self._cached = infos[0][4][0]
+        self._expires = time.monotonic() + self.ttl
+        return self._cached
+
+    def pin(self, address: str) -> None:
+        """Remember the address that just answered."""
+        self.pinned = address
+
+    def relocate(self, address: str) -> None:
+        """Send all further requests to ``address``, whatever the host resolves to."""
+        self.relocated = self.pinned = address
+
+
+async def _file_chunks(path: str, chunk_size: int = OTA_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """Read a file in chunks in the executor, so it is never fully in memory."""
+    loop = asyncio.get_running_loop()
+    file = await loop.run_in_executor(None, open, path, "rb")
+    try:
+        while chunk := await loop.run_in_executor(None, file.read, chunk_size):
+            yield chunk
+    finally:
+        await loop.run_in_executor(None, file.close)
+
+
 class AxeOSAPI:
     """Client class to communicate with an AxeOS miner via HTTP.
        Only the /api/system/info endpoint is queried."""
 
-    def __init__(self, session: aiohttp.ClientSession, host: str):
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        host: str,
+        fields: Collection[str] | None = None,
+        mac_addr: str | None = None,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float = DEFAULT_READ_TIMEOUT,
+        poll_budget: float = DEFAULT_SCAN_INTERVAL,
+        last_rediscovery: float | None = None,
+        on_relocate: Callable[[str], None] | None = None,
+    ):
         # Remove protocol if already present
         if host.startswith("http://"):
             host = host[len("http://"):]
         self.session = session
         self.host = host
-        self.system_info = {}
+        self.resolver = HostResolver(host)
+        # Identifies the miner when it has to be found at a new address
+        self.mac_addr = mac_addr
+        # Monotonic time of the last scan, carried over from an earlier client
+        # for the same miner so setup retries do not scan more often
+        self.last_rediscovery = last_rediscovery
+        # Called with the new address once the miner was found there
+        self.on_relocate = on_relocate
+        self._rediscovery: asyncio.Task | None = None
+        # Top-level system info keys to keep; None keeps the full response
+        self.fields = frozenset(fields) if fields is not None else None
+        # Per-phase socket timeouts plus an overall cap for a single request
+        self._timeout = aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout)
+        self.request_timeout = connect_timeout + read_timeout
+        # Time a poll may spend on retries of the GET, usually the scan interval
+        self.poll_budget = poll_budget
+        # Digest and decoded snapshot of the last body; identical bodies skip
+        # decoding. The snapshot is the dict the coordinator keeps as its data.
+        self._last_payload: tuple[bytes, dict] | None = None
+        self.payload_unchanged = False
+        # Client-side counters, exposed via diagnostics and the metrics endpoint
+        self.stats: dict[str, Any] = {
+            "polls": 0,
+            "poll_failures": 0,
+            "consecutive_failures": 0,
+            "poll_seconds_total": 0.0,
+            "last_poll_seconds": None,
+            "unchanged_payloads": 0,
+            "coalesced_polls": 0,
+            "retries": 0,
+            "write_failures": 0,
+            "connections_opened": 0,
+            "connections_reused": 0,
+            "dns_lookups": 0,
+            "rediscoveries": 0,
+            "outcomes": {
+                OUTCOME_OK: 0,
+                OUTCOME_TIMEOUT: 0,
+                OUTCOME_CONNECTION_ERROR: 0,
+                OUTCOME_HTTP_ERROR: 0,
+                OUTCOME_INVALID_RESPONSE: 0,
+            },
+        }
+        # Passing the stats lets the trace hooks of create_session() count connections per miner
+        self._request_kwargs: dict[str, Any] = {"timeout": self._timeout, "trace_request_ctx": self.stats}
+        # All requests to the miner are queued here; writes go before polls
+        self.scheduler = RequestScheduler(DEFAULT_MAX_IN_FLIGHT, self.stats)
+        # Poll waiting for a slot; concurrent callers share it instead of queueing another
+        self._queued_poll: asyncio.Future | None = None
+
+    def _record_poll(self, duration: float, success: bool) -> None:
+        stats = self.stats
+        stats["polls"] += 1
+        stats["poll_seconds_total"] += duration
+        stats["last_poll_seconds"] = duration
+        if success:
+            stats["consecutive_failures"] = 0
+        else:
+            stats["poll_failures"] += 1
+            stats["consecutive_failures"] += 1
+
+    @staticmethod
+    async def _read_body(resp: aiohttp.ClientResponse, limit: int = MAX_SYSTEM_INFO_BYTES) -> bytes:
+        """Read a response body, refusing anything above ``limit`` bytes."""
+        if resp.content_length is not None and resp.content_length > limit:
+            raise ValueError(f"Response of {resp.content_length} bytes exceeds limit")
+        body = bytearray()
+        async for chunk in resp.content.iter_any():
+            body += chunk
+            if len(body) > limit:
+                raise ValueError(f"Response exceeds {limit} bytes")
+        return bytes(body)
+
+    def _project(self, data: Any) -> dict:
+        if not isinstance(data, dict):
+            raise ValueError("System info is not a JSON object")
+        if self.fields is None:
+            return data
+        fields = self.fields
+        return {key: value for key, value in data.items() if key in fields}
 
     async def get_system_info(self) -> dict | None:
-        """Fetches system info (GET /api/system/info)."""
-        url = f"http://{self.host}{API_SYSTEM_INFO}"
+        """Fetches system info (GET /api/system/info).
+
+        When the body is byte-identical to the previous one, the previously
+        decoded dict is returned as is and ``payload_unchanged`` is set.
+        Callers arriving while a poll is still queued get that poll's result.
+        """
+        if self._queued_poll is not None:
+            self.stats["coalesced_polls"] += 1
+        else:
+            self._queued_poll = asyncio.ensure_future(self._async_poll())
+        return await asyncio.shield(self._queued_poll)
+
+    async def _async_poll(self) -> dict | None:
+        """Poll with up to POLL_ATTEMPTS tries, as long as they fit into the poll budget.
+
+        Timeouts, connection errors and 5xx answers are retried after a
+        jittered exponential backoff; the slot is released while backing off.
+        """
+        result = None
+        started = deadline = None
         try:
-            async with asyncio.timeout(10):
-                resp = await self.session.get(url)
-                if resp.status == 200:
-                    self.system_info = await resp.json()
-                    return self.system_info
-                _LOGGER.error("Error fetching system info from %s: %s", url, resp.status)
-                return None
-        except Exception as e:
-            _LOGGER.error("Exception fetching system info from %s: %s", self.host, e)
+            for attempt in range(POLL_ATTEMPTS):
+                async with self.scheduler.slot(PRIORITY_POLL):
+                    # Requests from now on need a fresh poll; on a retry the
+                    # queued poll may already be a newer one, which stays
+                    if self._queued_poll is asyncio.current_task():
+                        self._queued_poll = None
+                    if started is None:
+                        started = time.monotonic()
+                        deadline = started + self.poll_budget
+                    try:
+                        result = await self._async_fetch_system_info()
+                    except Exception as err:
+                        error = err
+                        outcome, retryable = classify_error(err)
+                        self.stats["outcomes"][outcome] += 1
+                    else:
+                        self.stats["outcomes"][OUTCOME_OK] += 1
+                        break
+
+                delay = random.uniform(0, POLL_RETRY_BACKOFF * 2**attempt)
+                if (
+                    not retryable
+                    or attempt == POLL_ATTEMPTS - 1
+                    or time.monotonic() + delay + self.request_timeout > deadline
+                ):
+                    _LOGGER.error("Error fetching system info from %s: %s", self.host, error or outcome)
+                    break
+                _LOGGER.debug(
+                    "Retrying system info from %s in %.2fs after %s: %s", self.host, delay, outcome, error
+                )
+                self.stats["retries"] += 1
+                await asyncio.sleep(delay)
+        finally:
+            if self._queued_poll is asyncio.current_task():
+                self._queued_poll = None
+            if started is not None:
+                self._record_poll(time.monotonic() - started, result is not None)
+        if result is not None:
+            if mac_addr := result.get("macAddr"):
+                self.mac_addr = mac_addr
+        elif self.stats["consecutive_failures"] >= REDISCOVERY_FAILURES:
+            self._start_rediscovery()
+        return result
+
+    async def _async_url(self, path: str) -> tuple[str, str]:
+        """Return the resolved address and the URL of ``path`` on it."""
+        address = await self.resolver.async_resolve()
+        self.stats["dns_lookups"] = self.resolver.lookups
+        return address, f"http://{self.resolver.netloc(address)}{path}"
+
+    async def _async_fetch_system_info(self) -> dict:
+        """Single GET attempt; raises on any failure."""
+        async with asyncio.timeout(self.request_timeout):
+            address, url = await self._async_url(API_SYSTEM_INFO)
+            async with self.session.get(url, **self._request_kwargs) as resp:
+                if resp.status != 200:
+                    raise HTTPStatusError(resp.status)
+                body = await self._read_body(resp)
+        self.resolver.pin(address)
+        self.payload_unchanged = False
+        digest = hashlib.blake2b(body, digest_size=16).digest()
+        if self._last_payload is not None and self._last_payload[0] == digest:
+            self.payload_unchanged = True
+            self.stats["unchanged_payloads"] += 1
+        else:
+            self._last_payload = (digest, self._project(json_loads(body)))
+        return self._last_payload[1]
+
+    def adopt_snapshot(self, data: dict) -> None:
+        """Return ``data`` instead of the cached snapshot for the next identical body."""
+        if self._last_payload is not None:
+            self._last_payload = (self._last_payload[0], data)
+
+    async def _async_get_json(
+        self, path: str, params: dict[str, str] | None = None, limit: int = MAX_SYSTEM_INFO_BYTES
+    ) -> dict | None:
+        """Single GET at poll priority for the slower endpoints; None on any failure."""
+        try:
+            async with self.scheduler.slot(PRIORITY_POLL), asyncio.timeout(self.request_timeout):
+                _address, url = await self._async_url(path)
+                async with self.session.get(url, params=params, **self._request_kwargs) as resp:
+                    if resp.status != 200:
+                        raise HTTPStatusError(resp.status)
+                    body = await self._read_body(resp, limit)
+            data = json_loads(body)
+            if not isinstance(data, dict):
+                raise ValueError(f"{path} did not return a JSON object")
+        except Exception as err:
+            outcome, _retryable = classify_error(err)
+            self.stats["outcomes"][outcome] += 1
+            _LOGGER.debug("Error fetching %s from %s: %s", path, self.host, err or outcome)
+            return None
+        self.stats["outcomes"][OUTCOME_OK] += 1
+        return data
+
+    async def get_statistics(self, columns: Collection[str] | None = None) -> dict | None:
+        """Fetches the on-device statistics buffer (GET /api/system/statistics).
+
+        The firmware narrows the response by ``columns`` only; there is no
+        time window, so the whole buffer is always returned. Returns None on
+        any failure, including firmware without the endpoint.
+        """
+        params = {"columns": ",".join(columns)} if columns else None
+        return await self._async_get_json(API_SYSTEM_STATISTICS, params, MAX_STATISTICS_BYTES)
+
+    async def get_asic_info(self) -> dict | None:
+        """Fetches ASIC details (GET /api/system/asic); None on any failure."""
+        return await self._async_get_json(API_SYSTEM_ASIC)
+
+    async def get_full_system_info(self) -> dict | None:
+        """Fetches /api/system/info without projection or caching, for the slower readers."""
+        return await self._async_get_json(API_SYSTEM_INFO)
+
+    def _start_rediscovery(self) -> None:
+        """Start looking for the miner by MAC address in the /24 of its last known address.
+
+        Runs after REDISCOVERY_FAILURES failed polls (or from
+        ``async_rediscover``), at most once per REDISCOVERY_INTERVAL. The scan
+        runs in the background: polls keep failing (the miner stays
+        unavailable) until it has found the miner.
+        """
+        now = time.monotonic()
+        known = self.resolver.known_address
+        if (
+            self.mac_addr is None
+            or known is None
+            or (self._rediscovery is not None and not self._rediscovery.done())
+            or (self.last_rediscovery is not None and now - self.last_rediscovery < REDISCOVERY_INTERVAL)
+        ):
+            return
+        self.last_rediscovery = now
+        network = ipaddress.ip_network(f"{known}/24", strict=False)
+        if network.version != 4:
+            return
+        self._rediscovery = asyncio.create_task(
+            self._async_rediscover(known, network), name=f"axeos_rediscover_{self.host}"
+        )
+
+    async def async_rediscover(self) -> bool:
+        """Search for the miner now, without waiting for failed polls; True if it moved.
+
+        Used when the miner does not answer at setup. The same limits as for
+        the background scan apply.
+        """
+        relocated = self.resolver.relocated
+        self._start_rediscovery()
+        if self._rediscovery is None:
+            return False
+        try:
+            await asyncio.wait([self._rediscovery])
+        finally:
+            self.cancel_rediscovery()
+        return self.resolver.relocated != relocated
+
+    def cancel_rediscovery(self) -> None:
+        """Stop a running rediscovery scan, e.g. before the session is closed."""
+        if self._rediscovery is not None:
+            self._rediscovery.cancel()
+
+    async def _async_rediscover(self, known: str, network: ipaddress.IPv4Network) -> None:
+        """Probe every address of ``network``; a match becomes the address for all requests."""
+        mac_addr = self.mac_addr.lower()
+        semaphore = asyncio.Semaphore(REDISCOVERY_CONCURRENCY)
+        timeout = aiohttp.ClientTimeout(total=REDISCOVERY_PROBE_TIMEOUT)
+
+        async def probe(address: str) -> str | None:
+            url = f"http://{self.resolver.netloc(address)}{API_SYSTEM_INFO}"
+            async with semaphore:
+                try:
+                    async with self.session.get(url, timeout=timeout) as resp:
+                        if resp.status != 200:
+                            return None
+                        info = json_loads(await self._read_body(resp))
+                except Exception:
+                    return None
+            if isinstance(info, dict) and str(info.get("macAddr", "")).lower() == mac_addr:
+                return address
             return None
 
+        _LOGGER.debug("Searching %s for %s (%s)", network, self.host, self.mac_addr)
+        tasks = [
+            asyncio.create_task(probe(str(address)))
+            for address in network.hosts()
+            if str(address) != known
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                if (address := await next_done) is not None:
+                    _LOGGER.warning(
+                        "Miner %s (%s) moved from %s to %s", self.host, self.mac_addr, known, address
+                    )
+                    self.resolver.relocate(address)
+                    self.stats["rediscoveries"] += 1
+                    if self.on_relocate is not None:
+                        self.on_relocate(address)
+                    return
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _async_write(
+        self, method: str, path: str, read_timeout: float | None = None, **kwargs: Any
+    ) -> int:
+        """Send a control request exactly once and return the HTTP status.
+
+        Writes are not idempotent, so they are never retried. ``read_timeout``
+        replaces the configured one for slow requests such as uploads.
+        """
+        request_kwargs = self._request_kwargs
+        request_timeout = self.request_timeout
+        if read_timeout is not None:
+            timeout = aiohttp.ClientTimeout(sock_connect=self._timeout.sock_connect, sock_read=read_timeout)
+            request_kwargs = {**request_kwargs, "timeout": timeout}
+            request_timeout = self._timeout.sock_connect + read_timeout
+        try:
+            async with self.scheduler.slot(PRIORITY_WRITE), asyncio.timeout(request_timeout):
+                _address, url = await self._async_url(path)
+                async with getattr(self.session, method)(url, **kwargs, **request_kwargs) as resp:
+                    status = resp.status
+                    # Drain the short body so the connection can be reused
+                    await resp.read()
+        except Exception as err:
+            self.stats["outcomes"][classify_error(err)[0]] += 1
+            self.stats["write_failures"] += 1
+            raise
+        if status == 200:
+            self.stats["outcomes"][OUTCOME_OK] += 1
+        else:
+            self.stats["outcomes"][OUTCOME_HTTP_ERROR] += 1
+            self.stats["write_failures"] += 1
+        return status
+
     async def restart_system(self) -> bool:
         """Restarts the miner (POST /api/system/restart)."""
         url = f"http://{self.host}{API_SYSTEM_RESTART}"
         try:
-            async with asyncio.timeout(10):
-                resp = await self.session.post(url)
-                if resp.status == 200:
-                    _LOGGER.info("Restart command sent successfully to %s", self.host)
-                    return True
-                _LOGGER.error("Error restarting miner at %s: %s", url, resp.status)
-                return False
+            status = await self._async_write("post", API_SYSTEM_RESTART)
+            if status == 200:
+                _LOGGER.info("Restart command sent successfully to %s", self.host)
+                return True
+            _LOGGER.error("Error restarting miner at %s: %s", url, status)
+            return False
         except Exception as e:
             _LOGGER.error("Exception when restarting miner at %s: %s", self.host, e)
             return False
@@ -59,13 +561,12 @@ class AxeOSAPI:
         """Set the mining frequency."""
         url = f"http://{self.host}{API_SYSTEM_FREQUENCY}"
         try:
-            async with asyncio.timeout(10):
-                resp = await self.session.post(url, json={"frequency": frequency})
-                if resp.status == 200:
-                    _LOGGER.info("Frequency set to %s MHz on %s", frequency, self.host)
-                    return True
-                _LOGGER.error("Error setting frequency on %s: %s", url, resp.status)
-                return False
+            status = await self._async_write("post", API_SYSTEM_FREQUENCY, json={"frequency": frequency})
+            if status == 200:
+                _LOGGER.info("Frequency set to %s MHz on %s", frequency, self.host)
+                return True
+            _LOGGER.error("Error setting frequency on %s: %s", url, status)
+            return False
         except Exception as e:
             _LOGGER.error("Exception setting frequency on %s: %s", self.host, e)
             return False
@@ -74,13 +575,12 @@ class AxeOSAPI:
         """Set the core voltage."""
         url = f"http://{self.host}{API_SYSTEM_VOLTAGE}"
         try:
-            async with asyncio.timeout(10):
-                resp = await self.session.post(url, json={"voltage": voltage})
-                if resp.status == 200:
-                    _LOGGER.info("Voltage set to %s mV on %s", voltage, self.host)
-                    return True
-                _LOGGER.error("Error setting voltage on %s: %s", url, resp.status)
-                return False
+            status = await self._async_write("post", API_SYSTEM_VOLTAGE, json={"voltage": voltage})
+            if status == 200:
+                _LOGGER.info("Voltage set to %s mV on %s", voltage, self.host)
+                return True
+            _LOGGER.error("Error setting voltage on %s: %s", url, status)
+            return False
         except Exception as e:
             _LOGGER.error("Exception setting voltage on %s: %s", self.host, e)
             return False
@@ -89,13 +589,12 @@ class AxeOSAPI:
         """Set the fan speed percentage."""
         url = f"http://{self.host}{API_SYSTEM_FANSPEED}"
         try:
-            async with asyncio.timeout(10):
-                resp = await self.session.post(url, json={"fanspeed": fanspeed})
-                if resp.status == 200:
-                    _LOGGER.info("Fan speed set to %s%% on %s", fanspeed, self.host)
-                    return True
-                _LOGGER.error("Error setting fan speed on %s: %s", url, resp.status)
-                return False
+            status = await self._async_write("post", API_SYSTEM_FANSPEED, json={"fanspeed": fanspeed})
+            if status == 200:
+                _LOGGER.info("Fan speed set to %s%% on %s", fanspeed, self.host)
+                return True
+            _LOGGER.error("Error setting fan speed on %s: %s", url, status)
+            return False
         except Exception as e:
             _LOGGER.error("Exception setting fan speed on %s: %s", self.host, e)
             return False
@@ -104,13 +603,37 @@ class AxeOSAPI:
         """Update a boolean setting via PATCH /api/system."""
         url = f"http://{self.host}{API_SYSTEM}"
         try:
-            async with asyncio.timeout(10):
-                resp = await self.session.patch(url, json={key: value})
-                if resp.status == 200:
-                    _LOGGER.info("Setting %s=%s on %s", key, value, self.host)
-                    return True
-                _LOGGER.error("Error setting %s on %s: %s", key, self.host, resp.status)
-                return False
+            status = await self._async_write("patch", API_SYSTEM, json={key: value})
+            if status == 200:
+                _LOGGER.info("Setting %s=%s on %s", key, value, self.host)
+                return True
+            _LOGGER.error("Error setting %s on %s: %s", key, self.host, status)
+            return False
         except Exception as e:
             _LOGGER.error("Exception setting %s on %s: %s", key, self.host, e)
             return False
+
+    async def upload_firmware(self, path: str, www: bool = False) -> bool:
+        """Upload a firmware image (POST /api/system/OTA, /api/system/OTAWWW for the web UI).
+
+        The file is streamed from disk with its Content-Length, which the
+        ESP32 OTA handler needs to size the partition write.
+        """
+        endpoint = API_SYSTEM_OTAWWW if www else API_SYSTEM_OTA
+        try:
+            size = (await asyncio.get_running_loop().run_in_executor(None, os.stat, path)).st_size
+            status = await self._async_write(
+                "post",
+                endpoint,
+                read_timeout=OTA_TIMEOUT,
+                data=_file_chunks(path),
+                headers={"Content-Type": "application/octet-stream", "Content-Length": str(size)},
+            )
+            if status == 200:
+                _LOGGER.info("Uploaded %s (%d bytes) to %s%s", path, size, self.host, endpoint)
+                return True
+            _LOGGER.error("Error uploading %s to %s%s: %s", path, self.host, endpoint, status)
+            return False
+        except Exception as e:
+            _LOGGER.error("Exception uploading %s to %s%s: %s", path, self.host, endpoint, e)
+            return False
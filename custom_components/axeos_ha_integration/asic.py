@@ -0,0 +1,69 @@
+"""Per-ASIC telemetry for multi-chip boards.
+
+Chip-level values are not part of the projected /api/system/info snapshot, so
+they do not add to the cost of the main poll. They are read on their own,
+slower schedule: from /api/system/asic when the firmware lists the chips
+there, otherwise from the ``hashrateMonitor.asics`` block of newer firmware.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from .api import AxeOSAPI
+
+# Normalized metric -> keys used by the different firmware variants
+ASIC_METRIC_KEYS: dict[str, tuple[str, ...]] = {
+    "hashrate": ("hashrate", "hashRate", "total"),
+    "temp": ("temp", "temperature"),
+    "frequency": ("frequency", "freq"),
+    "errors": ("errorCount", "errors"),
+}
+
+
+def parse_asic_chips(data: dict[str, Any] | None) -> list[dict[str, float]]:
+    """Per-chip metrics (one dict per chip, in chip order) found in ``data``."""
+    if not isinstance(data, dict):
+        return []
+    chips = data.get("asics")
+    if not isinstance(chips, list):
+        monitor = data.get("hashrateMonitor")
+        chips = monitor.get("asics") if isinstance(monitor, dict) else None
+    if not isinstance(chips, list):
+        return []
+
+    parsed = []
+    for chip in chips:
+        values: dict[str, float] = {}
+        if isinstance(chip, dict):
+            for metric, keys in ASIC_METRIC_KEYS.items():
+                for key in keys:
+                    value = chip.get(key)
+                    if isinstance(value, (int, float)) and not isinstance(value, bool):
+                        values[metric] = value
+                        break
+        parsed.append(values)
+    return parsed
+
+
+class AxeOSAsicReader:
+    """Reads per-chip data from whichever source the firmware provides."""
+
+    def __init__(self, api: AxeOSAPI) -> None:
+        self.api = api
+        # Set once /api/system/asic turned out not to list the chips
+        self._use_system_info = False
+
+    async def async_read(self) -> list[dict[str, float]] | None:
+        """Per-chip metrics, or None when the miner did not answer."""
+        if not self._use_system_info:
+            data = await self.api.get_asic_info()
+            if data is None:
+                return None
+            if chips := parse_asic_chips(data):
+                return chips
+            self._use_system_info = True
+        data = await self.api.get_full_system_info()
+        if data is None:
+            return None
+        return parse_asic_chips(data)
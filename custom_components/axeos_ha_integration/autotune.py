@@ -0,0 +1,382 @@
+"""Closed-loop frequency/core voltage autotuner for AxeOS miners."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from .api import AxeOSAPI
+
+_LOGGER = logging.getLogger(__name__)
+
+STATUS_IDLE = "idle"
+STATUS_RUNNING = "running"
+STATUS_STOPPED = "stopped"
+STATUS_COMPLETED = "completed"
+STATUS_FAILED = "failed"
+# A run that was going when Home Assistant stopped
+STATUS_INTERRUPTED = "interrupted"
+
+REASON_STABLE = "stable"
+REASON_UNSTABLE = "unstable"
+REASON_THERMAL = "thermal"
+REASON_NO_DATA = "no_data"
+
+# Attempts per frequency/voltage write before the run is aborted
+APPLY_ATTEMPTS = 3
+
+
+class SetpointError(RuntimeError):
+    """The miner did not accept a frequency or voltage write."""
+
+
+@dataclass
+class AutotuneSettings:
+    """Sweep bounds, timing and safety limits of an autotune run."""
+
+    min_frequency: int = 400
+    max_frequency: int = 600
+    frequency_step: int = 25
+    min_voltage: int = 1100
+    max_voltage: int = 1300
+    voltage_step: int = 10
+    # hashRate_1m needs a full minute to forget the previous setpoint
+    settle_time: float = 60
+    measure_time: float = 120
+    sample_interval: float = 10
+    max_temp: float = 65
+    max_vr_temp: float = 80
+    min_hashrate_ratio: float = 0.94
+
+    def __post_init__(self) -> None:
+        if self.min_frequency > self.max_frequency:
+            raise ValueError("min_frequency must not exceed max_frequency")
+        if self.min_voltage > self.max_voltage:
+            raise ValueError("min_voltage must not exceed max_voltage")
+        if self.frequency_step <= 0 or self.voltage_step <= 0:
+            raise ValueError("Step sizes must be positive")
+
+
+def _as_bool(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.lower() in ("true", "1", "on", "yes")
+    return bool(value)
+
+
+def _point_key(frequency: int, voltage: int) -> str:
+    return f"{frequency}:{voltage}"
+
+
+class AxeOSAutotuner:
+    """Sweeps frequency/voltage pairs and converges to the most efficient stable one.
+
+    For every frequency (ascending) the lowest stable core voltage is searched,
+    starting at the voltage that was stable for the previous frequency. Each
+    step is held for a settle and a measurement window in which hashRate_1m,
+    power, temp and vrTemp are sampled. A step is stable when it stays within
+    the thermal limits, never enters overheat mode and delivers at least
+    ``min_hashrate_ratio`` of the expected hashrate. Hitting a thermal limit
+    reverts to the original setpoint and ends the sweep, since higher
+    frequencies only run hotter.
+
+    A frequency or voltage write the miner does not accept is retried; when
+    it keeps failing the run is aborted, since the measurements would belong
+    to a different setpoint.
+
+    Progress is persisted through ``store`` (anything providing ``async_load``
+    and ``async_save``) after every step, so an interrupted run can resume.
+    """
+
+    # Seconds between two attempts of a failed write
+    retry_delay: float = 2.0
+
+    def __init__(self, api: AxeOSAPI, store=None) -> None:
+        self.api = api
+        self._store = store
+        self.state: dict[str, Any] | None = None
+        self.task: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        return self.task is not None and not self.task.done()
+
+    @property
+    def status(self) -> str:
+        if self.state is None:
+            return STATUS_IDLE
+        return self.state["status"]
+
+    async def async_stop(self) -> None:
+        """Cancel a running sweep and wait until the original setpoint is restored."""
+        if self.running:
+            self.task.cancel()
+            await asyncio.wait([self.task])
+
+    async def async_load(self) -> None:
+        """Load the persisted state of the last run."""
+        if self._store is not None and self.state is None:
+            self.state = await self._store.async_load()
+            if self.state is not None and self.state["status"] == STATUS_RUNNING:
+                self.state["status"] = STATUS_INTERRUPTED
+
+    async def _async_save(self) -> None:
+        if self._store is not None:
+            await self._store.async_save(self.state)
+
+    async def async_run(self, settings: AutotuneSettings, resume: bool = True) -> dict[str, Any]:
+        """Run (or resume) a full sweep and apply the best stable setpoint."""
+        await self.async_load()
+        if not (
+            resume
+            and self.state is not None
+            and self.state["status"] in (STATUS_RUNNING, STATUS_STOPPED, STATUS_INTERRUPTED)
+            and self.state["settings"] == asdict(settings)
+        ):
+            info = await self.api.get_system_info()
+            if info is None:
+                raise RuntimeError(f"Cannot read current setpoint from {self.api.host}")
+            self.state = {
+                "settings": asdict(settings),
+                "original": {
+                    "frequency": int(info["frequency"]),
+                    "voltage": int(info["coreVoltage"]),
+                },
+                "results": {},
+                "best": None,
+                "started": time.time(),
+                "finished": None,
+            }
+        self.state["status"] = STATUS_RUNNING
+        await self._async_save()
+
+        original = self.state["original"]
+        try:
+            baseline = await self._async_step(
+                settings, original["frequency"], original["voltage"]
+            )
+            if baseline["reason"] != REASON_THERMAL:
+                await self._async_sweep(settings)
+            best = await self._async_converge(settings)
+        except asyncio.CancelledError:
+            _LOGGER.info("Autotune on %s stopped, restoring original setpoint", self.api.host)
+            self.state["status"] = STATUS_STOPPED
+            await self._async_restore()
+            await self._async_save()
+            raise
+        except SetpointError as err:
+            _LOGGER.error("Autotune on %s aborted: %s", self.api.host, err)
+            self.state["status"] = STATUS_FAILED
+            self.state["error"] = str(err)
+            self.state["finished"] = time.time()
+            await self._async_restore()
+            await self._async_save()
+            return self.report()
+
+        self.state["best"] = best
+        self.state["finished"] = time.time()
+        if best is None:
+            _LOGGER.warning("Autotune on %s found no stable setpoint", self.api.host)
+            self.state["status"] = STATUS_FAILED
+            await self._async_restore()
+        else:
+            _LOGGER.info(
+                "Autotune on %s converged to %s MHz / %s mV (%.2f J/TH)",
+                self.api.host,
+                best["frequency"],
+                best["voltage"],
+                best["j_per_th"],
+            )
+            self.state["status"] = STATUS_COMPLETED
+        await self._async_save()
+        return self.report()
+
+    async def _async_sweep(self, settings: AutotuneSettings) -> None:
+        voltage = settings.min_voltage
+        for frequency in range(
+            settings.min_frequency, settings.max_frequency + 1, settings.frequency_step
+        ):
+            while voltage <= settings.max_voltage:
+                result = await self._async_step(settings, frequency, voltage)
+                if result["reason"] == REASON_THERMAL:
+                    original = self.state["original"]
+                    await self._async_apply(original["frequency"], original["voltage"])
+                    return
+                if result["stable"]:
+                    break
+                voltage += settings.voltage_step
+            else:
+                # No stable voltage left within bounds for this frequency
+                return
+
+    async def _async_converge(self, settings: AutotuneSettings) -> dict[str, Any] | None:
+        """Verify candidates from most to least efficient and keep the first that holds."""
+        candidates = sorted(
+            (r for r in self.state["results"].values() if r["stable"]),
+            key=lambda r: r["hashrate_per_watt"],
+            reverse=True,
+        )
+        for candidate in candidates:
+            verified = await self._async_measure(
+                settings, candidate["frequency"], candidate["voltage"]
+            )
+            if verified["stable"]:
+                return verified
+            candidate["stable"] = False
+            candidate["reason"] = verified["reason"]
+            await self._async_save()
+        return None
+
+    async def _async_step(self, settings: AutotuneSettings, frequency: int, voltage: int) -> dict[str, Any]:
+        """Measure a setpoint unless a resumed run already has its result."""
+        key = _point_key(frequency, voltage)
+        if (cached := self.state["results"].get(key)) is not None:
+            return cached
+        result = await self._async_measure(settings, frequency, voltage)
+        self.state["results"][key] = result
+        await self._async_save()
+        return result
+
+    async def _async_apply(self, frequency: int, voltage: int) -> None:
+        # Raise the voltage before the frequency and lower it afterwards so
+        # the chip is never clocked above what its voltage supports
+        applied = self.state["applied"] = dict(self.state.get("applied") or self.state["original"])
+        writes = [("voltage", self.api.set_voltage, voltage), ("frequency", self.api.set_frequency, frequency)]
+        if voltage < applied["voltage"]:
+            writes.reverse()
+        for key, setter, value in writes:
+            for attempt in range(APPLY_ATTEMPTS):
+                if attempt:
+                    await asyncio.sleep(self.retry_delay)
+                if await setter(value):
+                    break
+            else:
+                raise SetpointError(f"{self.api.host} did not accept {key} {value} after {APPLY_ATTEMPTS} attempts")
+            # Either order leaves a safe pair behind when the second write fails
+            applied[key] = value
+
+    async def _async_restore(self) -> None:
+        original = self.state["original"]
+        try:
+            await self._async_apply(original["frequency"], original["voltage"])
+        except SetpointError as err:
+            _LOGGER.error("Autotune on %s could not restore the original setpoint: %s", self.api.host, err)
+
+    async def _async_measure(self, settings: AutotuneSettings, frequency: int, voltage: int) -> dict[str, Any]:
+        _LOGGER.debug("Autotune on %s: testing %s MHz / %s mV", self.api.host, frequency, voltage)
+        await self._async_apply(frequency, voltage)
+        result: dict[str, Any] = {
+            "frequency": frequency,
+            "voltage": voltage,
+            "stable": False,
+            "reason": REASON_NO_DATA,
+            "samples": 0,
+        }
+
+        if await self._async_hold(settings, settings.settle_time, None):
+            result["reason"] = REASON_THERMAL
+            return result
+        samples: list[dict[str, Any]] = []
+        if await self._async_hold(settings, settings.measure_time, samples):
+            result["reason"] = REASON_THERMAL
+            return result
+        if not samples:
+            return result
+
+        def mean(key: str) -> float:
+            return sum(s[key] for s in samples) / len(samples)
+
+        hashrate = mean("hashrate")
+        power = mean("power")
+        result.update(
+            {
+                "samples": len(samples),
+                "hashrate": round(hashrate, 2),
+                "power": round(power, 3),
+                "temp": round(max(s["temp"] for s in samples), 1),
+                "vr_temp": round(max(s["vr_temp"] for s in samples), 1),
+                "hashrate_per_watt": round(hashrate / power, 3) if power else 0.0,
+                "j_per_th": round(power / hashrate * 1000, 3) if hashrate else None,
+            }
+        )
+        expected = samples[-1]["expected"]
+        if expected and hashrate < expected * settings.min_hashrate_ratio:
+            result["reason"] = REASON_UNSTABLE
+        else:
+            result["stable"] = True
+            result["reason"] = REASON_STABLE
+        return result
+
+    async def _async_hold(self, settings: AutotuneSettings, duration: float, samples: list | None) -> bool:
+        """Poll the miner for ``duration`` seconds; return True on a thermal violation."""
+        deadline = time.monotonic() + duration
+        while True:
+            info = await self.api.get_system_info()
+            if info is not None:
+                temp = info.get("temp") or 0
+                vr_temp = info.get("vrTemp") or 0
+                if (
+                    _as_bool(info.get("overheat_mode"))
+                    or temp > settings.max_temp
+                    or vr_temp > settings.max_vr_temp
+                ):
+                    _LOGGER.warning(
+                        "Autotune on %s hit thermal limit (temp=%s, vrTemp=%s)",
+                        self.api.host,
+                        temp,
+                        vr_temp,
+                    )
+                    return True
+                if samples is not None and info.get("power"):
+                    expected = info.get("expectedHashrate")
+                    if not expected and info.get("smallCoreCount"):
+                        expected = (
+                            info.get("frequency", 0)
+                            * info["smallCoreCount"]
+                            * (info.get("asicCount") or 1)
+                            / 1000
+                        )
+                    samples.append(
+                        {
+                            "hashrate": info.get("hashRate_1m", info.get("hashRate")) or 0,
+                            "power": info["power"],
+                            "temp": temp,
+                            "vr_temp": vr_temp,
+                            "expected": expected,
+                        }
+                    )
+            if time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(settings.sample_interval)
+
+    def report(self) -> dict[str, Any]:
+        """Summarise the current or last run."""
+        if self.state is None:
+            return {"status": STATUS_IDLE}
+        results = sorted(
+            self.state["results"].values(), key=lambda r: (r["frequency"], r["voltage"])
+        )
+        original = self.state["original"]
+        baseline = self.state["results"].get(
+            _point_key(original["frequency"], original["voltage"])
+        )
+        best = self.state.get("best")
+        report: dict[str, Any] = {
+            "status": self.state["status"],
+            "original": original,
+            "best": best,
+            "baseline": baseline,
+            "steps": len(results),
+            "results": results,
+            "started": self.state["started"],
+            "finished": self.state["finished"],
+        }
+        if "error" in self.state:
+            report["error"] = self.state["error"]
+        if best and baseline and baseline.get("hashrate_per_watt"):
+            report["efficiency_gain_percent"] = round(
+                (best["hashrate_per_watt"] / baseline["hashrate_per_watt"] - 1) * 100, 1
+            )
+        return report
@@ -0,0 +1,210 @@
+"""Backfill of long-term statistics from the miner's own statistics buffer.
+
+AxeOS keeps a ring buffer of recent samples (/api/system/statistics). When
+Home Assistant loses contact with a miner, or is itself down, the hours it
+missed are rebuilt from that buffer on reconnect and imported into the
+recorder's long-term statistics of the matching sensors.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import time
+from collections.abc import Iterable
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.recorder.statistics import async_import_statistics
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.storage import Store
+
+from .api import AxeOSAPI
+from .const import DOMAIN, STATISTICS_COLUMNS
+
+if TYPE_CHECKING:
+    from .longterm import HourlyStatistics
+
+try:
+    from homeassistant.components.recorder.models import StatisticMeanType
+except ImportError:  # Home Assistant < 2025.4
+    StatisticMeanType = None
+
+_LOGGER = logging.getLogger(__name__)
+
+HOUR = 3600
+# last_seen is written back at most this often
+SAVE_DELAY = 60  # in seconds
+
+
+def parse_statistics(payload: dict[str, Any], received: float) -> list[tuple[float, dict[str, float]]]:
+    """Turn a /api/system/statistics payload into (wall time, {sensor key: value}) samples.
+
+    Sample timestamps are milliseconds since boot; ``currentTimestamp`` is
+    the device clock when the response was rendered, ``received`` the wall
+    time it arrived. Unknown columns and non-numeric values are skipped.
+    """
+    labels = payload.get("labels")
+    rows = payload.get("statistics")
+    current = payload.get("currentTimestamp")
+    if not isinstance(labels, list) or not isinstance(rows, list) or not isinstance(current, (int, float)):
+        raise ValueError("Unexpected statistics payload")
+    if "timestamp" not in labels:
+        raise ValueError("Statistics payload has no timestamp column")
+    ts_index = labels.index("timestamp")
+    columns = [
+        (index, STATISTICS_COLUMNS[label])
+        for index, label in enumerate(labels)
+        if label in STATISTICS_COLUMNS
+    ]
+
+    samples = []
+    for row in rows:
+        if not isinstance(row, list) or len(row) != len(labels):
+            continue
+        values = {
+            key: float(row[index])
+            for index, key in columns
+            if isinstance(row[index], (int, float)) and not isinstance(row[index], bool)
+        }
+        if values:
+            samples.append((received - (current - row[ts_index]) / 1000, values))
+    samples.sort(key=lambda sample: sample[0])
+    return samples
+
+
+def gap_hours(last_seen: float, now: float) -> tuple[float, float] | None:
+    """The whole clock hours strictly between ``last_seen`` and ``now``, if any.
+
+    Hours that Home Assistant recorded in part already have statistics from
+    the recorder itself and are left alone.
+    """
+    start = math.ceil(last_seen / HOUR) * HOUR
+    end = math.floor(now / HOUR) * HOUR
+    if end - start < HOUR:
+        return None
+    return start, end
+
+
+def aggregate_hourly(
+    samples: Iterable[tuple[float, dict[str, float]]], start: float, end: float
+) -> dict[str, list[dict[str, Any]]]:
+    """Hourly mean/min/max per sensor key for the samples in [start, end)."""
+    buckets: dict[str, dict[float, list[float]]] = {}
+    for timestamp, values in samples:
+        if not start <= timestamp < end:
+            continue
+        hour = timestamp - timestamp % HOUR
+        for key, value in values.items():
+            buckets.setdefault(key, {}).setdefault(hour, []).append(value)
+    return {
+        key: [
+            {
+                "start": datetime.fromtimestamp(hour, timezone.utc),
+                "mean": sum(values) / len(values),
+                "min": min(values),
+                "max": max(values),
+            }
+            for hour, values in sorted(hours.items())
+        ]
+        for key, hours in buckets.items()
+    }
+
+
+def statistic_metadata(
+    statistic_id: str, unit: str | None, source: str = "recorder", name: str | None = None
+) -> dict[str, Any]:
+    """Recorder metadata for mean/min/max statistics of a measurement."""
+    metadata = {
+        "has_sum": False,
+        "name": name,
+        "source": source,
+        "statistic_id": statistic_id,
+        "unit_of_measurement": unit,
+    }
+    if StatisticMeanType is None:
+        metadata["has_mean"] = True
+    else:
+        metadata["mean_type"] = StatisticMeanType.ARITHMETIC
+    return metadata
+
+
+class AxeOSStatisticsBackfill:
+    """Imports the hours missed while a miner was out of reach.
+
+    ``last_seen`` (wall time of the last successful poll) is persisted, so
+    Home Assistant restarts count as gaps too. Only whole hours inside the
+    gap are imported. With ``hourly`` set, its metrics are also imported into
+    the external hourly statistics.
+
+    The firmware can only narrow the statistics endpoint by column, not by
+    time, so every backfill downloads the whole buffer (up to
+    MAX_STATISTICS_BYTES) and the samples outside the gap are dropped here.
+    Backfills only run once per reconnect with a gap of at least an hour.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api: AxeOSAPI,
+        host_id: str,
+        units: dict[str, str | None],
+        store: Store,
+        hourly: HourlyStatistics | None = None,
+    ) -> None:
+        self.hass = hass
+        self.api = api
+        self.host_id = host_id
+        self.units = units
+        self._store = store
+        self.hourly = hourly
+        self.last_seen: float | None = None
+        # Set when the endpoint answered with nothing usable, e.g. older firmware
+        self.unsupported = False
+
+    async def async_load(self) -> None:
+        if (data := await self._store.async_load()) is not None:
+            self.last_seen = data.get("last_seen")
+
+    def poll_succeeded(self, now: float | None = None) -> tuple[float, float] | None:
+        """Record a successful poll; returns the gap to backfill, if there is one."""
+        now = time.time() if now is None else now
+        gap = None
+        if self.last_seen is not None and not self.unsupported:
+            gap = gap_hours(self.last_seen, now)
+        self.last_seen = now
+        self._store.async_delay_save(lambda: {"last_seen": self.last_seen}, SAVE_DELAY)
+        return gap
+
+    async def async_backfill(self, start: float, end: float) -> int:
+        """Fetch the device buffer and import the hours in [start, end); returns the hours imported.
+
+        The whole buffer is fetched; samples outside the gap are filtered out here.
+        """
+        if "recorder" not in self.hass.config.components:
+            return 0
+        payload = await self.api.get_statistics(STATISTICS_COLUMNS)
+        if payload is None:
+            return 0
+        try:
+            samples = parse_statistics(payload, time.time())
+        except ValueError as err:
+            _LOGGER.debug("Statistics of %s cannot be backfilled: %s", self.api.host, err)
+            self.unsupported = True
+            return 0
+
+        entity_registry = er.async_get(self.hass)
+        imported = 0
+        for key, rows in aggregate_hourly(samples, start, end).items():
+            if self.hourly is not None and key in self.hourly.keys:
+                self.hourly.import_rows(key, rows)
+                imported = max(imported, len(rows))
+            entity_id = entity_registry.async_get_entity_id("sensor", DOMAIN, f"{self.host_id}_{key}")
+            if entity_id is None:
+                continue
+            async_import_statistics(self.hass, statistic_metadata(entity_id, self.units.get(key)), rows)
+            imported = max(imported, len(rows))
+        if imported:
+            _LOGGER.info("Backfilled %d hour(s) of statistics for %s", imported, self.api.host)
+        return imported
@@ -14,6 +14,7 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
+from .profiles import entity_enabled
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -27,6 +28,14 @@ BINARY_SENSOR_TYPES: dict[str, tuple[str, list[str], BinarySensorDeviceClass | N
     "otp": ("One-Time Programming", ["otp"], None, EntityCategory.DIAGNOSTIC),
     "stratumEnonceSubscribe": ("Stratum Enonce Subscribe", ["stratumEnonceSubscribe"], None, EntityCategory.DIAGNOSTIC),
     "fallbackStratumEnonceSubscribe": ("Fallback Stratum Enonce Subscribe", ["fallbackStratumEnonceSubscribe"], None, EntityCategory.DIAGNOSTIC),
+    # Streaming anomaly detection (computed by the integration, see anomaly.py)
+    "anomaly_hashrate": ("Hashrate Anomaly", ["anomaly.hashrate"], BinarySensorDeviceClass.PROBLEM, None),
+    "anomaly_vr_temp": ("VR Temperature Anomaly", ["anomaly.vr_temp"], BinarySensorDeviceClass.PROBLEM, None),
+    "anomaly_rejects": ("Rejected Shares Anomaly", ["anomaly.rejects"], BinarySensorDeviceClass.PROBLEM, None),
+    # Hung-miner watchdog (see watchdog.py), only with the watchdog option
+    "watchdog_stalled": ("Hashing Stalled", ["watchdog.stalled"], BinarySensorDeviceClass.PROBLEM, None),
+    # Integration-side fan control (see fan_control.py), only with the fan_control option
+    "fan_control_active": ("Fan Control Active", ["fan_control.active"], None, EntityCategory.DIAGNOSTIC),
 }
 
 def get_value(data: dict, keys: list[str]) -> bool | None:
@@ -72,14 +81,20 @@ async def async_setup_entry(
 
     entities: list[BinarySensorEntity] = []
     for key, (suffix, path, device_class, entity_category) in BINARY_SENSOR_TYPES.items():
+        if key == "watchdog_stalled" and not entry.options.get("watchdog", False):
+            continue
+        if key == "fan_control_active" and not entry.options.get("fan_control", False):
+            continue
+        if (enabled := entity_enabled(entry.options, "binary_sensor", key)) is None:
+            continue
         name = suffix
         unique_id = f"{host_id}_{key}"
-        entities.append(
-            AxeOSBinarySensor(
-                coordinator, entry.entry_id, name, unique_id, path, key,
-                device_class, entity_category
-            )
+        sensor = AxeOSBinarySensor(
+            coordinator, entry.entry_id, name, unique_id, path, key,
+            device_class, entity_category
         )
+        sensor._attr_entity_registry_enabled_default = enabled
+        entities.append(sensor)
 
     async_add_entities(entities)
 
@@ -88,7 +103,7 @@ class AxeOSBinarySensor(CoordinatorEntity, BinarySensorEntity):
     """Binary sensor for AxeOS-HA boolean values."""
 
     _attr_has_entity_name = True
-    entity_registry_enabled_default = True
+    _attr_entity_registry_enabled_default = True
 
     def __init__(
         self,
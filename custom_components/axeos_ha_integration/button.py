@@ -9,6 +9,7 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import DOMAIN
 from .api import AxeOSAPI
+from .profiles import RESTART_KEY, entity_enabled
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -20,23 +21,25 @@ async def async_setup_entry(
 ) -> None:
     """Register the restart button entity for each miner."""
     api: AxeOSAPI = hass.data[DOMAIN][entry.entry_id]["api"]
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
     miner_name: str = hass.data[DOMAIN][entry.entry_id]["name"]
     host: str = hass.data[DOMAIN][entry.entry_id]["host"]
 
     # stabile host_id aus entry.data oder entry_id
     host_id = str(host or entry.entry_id).replace(" ", "_").replace(".", "_").lower()
 
-    async_add_entities(
-        [AxeOSRestartButton(entry.entry_id, miner_name, host_id, api)],
-        update_before_add=False,
-    )
+    if (enabled := entity_enabled(entry.options, "button", RESTART_KEY)) is None:
+        return
+    button = AxeOSRestartButton(entry.entry_id, miner_name, host_id, api, coordinator)
+    button._attr_entity_registry_enabled_default = enabled
+    async_add_entities([button], update_before_add=False)
 
 
 class AxeOSRestartButton(ButtonEntity):
     """Button to restart the AxeOS miner."""
 
     _attr_has_entity_name = True
-    entity_registry_enabled_default = True  # ab Werk aktiviert
+    _attr_entity_registry_enabled_default = True  # ab Werk aktiviert
 
     def __init__(
         self,
@@ -44,12 +47,14 @@ class AxeOSRestartButton(ButtonEntity):
         miner_name: str,
         host_id: str,
         api: AxeOSAPI,
+        coordinator,
     ) -> None:
         """Initialize the restart button."""
         self.entry_id = entry_id
         self.miner_name = miner_name
         self.host_id = host_id
         self.api = api
+        self.coordinator = coordinator
 
         self._attr_name = "Restart"
         self._attr_icon = "mdi:restart"
@@ -67,12 +72,12 @@ class AxeOSRestartButton(ButtonEntity):
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        return bool(self.api.system_info)
+        return bool(self.coordinator.data)
 
     @property
     def device_info(self):
         # Flexibles Mapping für Modell und Version
-        info = getattr(self.api, "system_info", {}) or {}
+        info = self.coordinator.data or {}
         model = info.get("boardVersion") or info.get("deviceModel") or "BitAxe Miner"
         sw_version = info.get("version", "")
         return {
@@ -0,0 +1,36 @@
+"""Field-level diffs between consecutive system info snapshots."""
+
+from __future__ import annotations
+
+from typing import Any
+
+_MISSING = object()
+
+
+def diff_snapshots(
+    old: dict[str, Any],
+    new: dict[str, Any],
+    ignore: tuple[str, ...] = (),
+    _prefix: str = "",
+) -> dict[str, dict[str, Any]]:
+    """Return ``{path: {"old": ..., "new": ...}}`` for every field that differs.
+
+    Nested objects such as ``stratum`` are compared recursively and reported
+    with dotted paths (``stratum.usingFallback``); lists are compared as a
+    whole. Fields that appear or disappear are reported with ``None`` on the
+    missing side. Top-level keys in ``ignore`` are skipped.
+    """
+    changes: dict[str, dict[str, Any]] = {}
+    for key in (*new, *(k for k in old if k not in new)):
+        if not _prefix and key in ignore:
+            continue
+        before = old.get(key, _MISSING)
+        after = new.get(key, _MISSING)
+        if isinstance(before, dict) and isinstance(after, dict):
+            changes.update(diff_snapshots(before, after, _prefix=f"{_prefix}{key}."))
+        elif before != after:
+            changes[f"{_prefix}{key}"] = {
+                "old": None if before is _MISSING else before,
+                "new": None if after is _MISSING else after,
+            }
+    return changes
@@ -10,10 +10,43 @@ from homeassistant import config_entries
 from homeassistant.config_entries import ConfigFlowResult
 from homeassistant.core import callback
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+import homeassistant.helpers.config_validation as cv
 from homeassistant import exceptions
 
-from .const import DOMAIN, CONF_HOST, CONF_NAME, DEFAULT_SCAN_INTERVAL
+from .const import (
+    DOMAIN,
+    CONF_HOST,
+    CONF_NAME,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_READ_TIMEOUT,
+    DEFAULT_MIN_PUBLISH_INTERVAL,
+    DEFAULT_MAX_PUBLISH_INTERVAL,
+    DEFAULT_WATCHDOG_SHARES_WINDOW,
+    DEFAULT_WATCHDOG_HASHRATE_WINDOW,
+    DEFAULT_WATCHDOG_NONCE_WINDOW,
+    DEFAULT_WATCHDOG_NONCE_THRESHOLD,
+    DEFAULT_WATCHDOG_COOLDOWN,
+    DEFAULT_HEAP_RESTART_THRESHOLD,
+    DEFAULT_HEAP_RESTART_HOUR,
+    DEFAULT_FAN_TARGET_TEMP,
+)
 from .api import AxeOSAPI
+from .binary_sensor import BINARY_SENSOR_TYPES
+from .number import NUMBER_TYPES
+from .profiles import (
+    ASIC_KEY,
+    DEFAULT_PROFILE,
+    ENERGY_KEY,
+    PLATFORM_KEYS,
+    PROFILE_CUSTOM,
+    PROFILE_ENTITIES,
+    PROFILE_STANDARD,
+    PROFILES,
+    RESTART_KEY,
+)
+from .sensor import DEADBAND_TYPES, SENSOR_TYPES
+from .switch import SWITCH_TYPES
 
 STEP_USER_DATA_SCHEMA = vol.Schema(
     {
@@ -85,11 +118,23 @@ class AxeOSHaIntegrationConfigFlow(
 class AxeOSOptionsFlowHandler(config_entries.OptionsFlow):
     """Handle option flow, e.g. scan_interval, logging."""
 
+    def __init__(self) -> None:
+        """Initialize the options flow."""
+        self._options: dict[str, Any] = {}
+
     async def async_step_init(self, user_input=None):
         """Manage the options."""
         options = self.config_entry.options or {}
         if user_input is not None:
-            return self.async_create_entry(title="", data=user_input)
+            self._options = dict(user_input)
+            # Keep the custom entity selection and deadbands around for when
+            # they are enabled again
+            for key in ("custom_entities", "deadbands"):
+                if key in options:
+                    self._options[key] = options[key]
+            if user_input.get("entity_profile") == PROFILE_CUSTOM:
+                return await self.async_step_entities()
+            return await self._async_step_after_entities()
 
         data_schema = vol.Schema(
             {
@@ -97,6 +142,14 @@ class AxeOSOptionsFlowHandler(config_entries.OptionsFlow):
                     "scan_interval",
                     default=options.get("scan_interval", DEFAULT_SCAN_INTERVAL),
                 ): int,
+                vol.Optional(
+                    "connect_timeout",
+                    default=options.get("connect_timeout", DEFAULT_CONNECT_TIMEOUT),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0.5, max=60)),
+                vol.Optional(
+                    "read_timeout",
+                    default=options.get("read_timeout", DEFAULT_READ_TIMEOUT),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0.5, max=60)),
                 vol.Optional(
                     "logging_level",
                     default=options.get("logging_level", "info"),
@@ -105,7 +158,135 @@ class AxeOSOptionsFlowHandler(config_entries.OptionsFlow):
                     "hide_temperature_sensors",
                     default=options.get("hide_temperature_sensors", False),
                 ): bool,
+                vol.Optional(
+                    "entity_profile",
+                    default=options.get("entity_profile", DEFAULT_PROFILE),
+                ): vol.In(PROFILES),
+                vol.Optional(
+                    "hourly_statistics",
+                    default=options.get("hourly_statistics", False),
+                ): bool,
+                vol.Optional(
+                    "exclude_churn_sensors",
+                    default=options.get("exclude_churn_sensors", False),
+                ): bool,
+                vol.Optional(
+                    "watchdog",
+                    default=options.get("watchdog", False),
+                ): bool,
+                vol.Optional(
+                    "watchdog_shares_window",
+                    default=options.get("watchdog_shares_window", DEFAULT_WATCHDOG_SHARES_WINDOW),
+                ): vol.All(vol.Coerce(int), vol.Range(min=60)),
+                vol.Optional(
+                    "watchdog_hashrate_window",
+                    default=options.get("watchdog_hashrate_window", DEFAULT_WATCHDOG_HASHRATE_WINDOW),
+                ): vol.All(vol.Coerce(int), vol.Range(min=60)),
+                vol.Optional(
+                    "watchdog_nonce_window",
+                    default=options.get("watchdog_nonce_window", DEFAULT_WATCHDOG_NONCE_WINDOW),
+                ): vol.All(vol.Coerce(int), vol.Range(min=60)),
+                vol.Optional(
+                    "watchdog_nonce_threshold",
+                    default=options.get("watchdog_nonce_threshold", DEFAULT_WATCHDOG_NONCE_THRESHOLD),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                vol.Optional(
+                    "watchdog_cooldown",
+                    default=options.get("watchdog_cooldown", DEFAULT_WATCHDOG_COOLDOWN),
+                ): vol.All(vol.Coerce(int), vol.Range(min=60)),
+                vol.Optional(
+                    "heap_restart",
+                    default=options.get("heap_restart", False),
+                ): bool,
+                vol.Optional(
+                    "heap_restart_threshold",
+                    default=options.get("heap_restart_threshold", DEFAULT_HEAP_RESTART_THRESHOLD),
+                ): vol.All(vol.Coerce(float), vol.Range(min=1, max=168)),
+                vol.Optional(
+                    "heap_restart_hour",
+                    default=options.get("heap_restart_hour", DEFAULT_HEAP_RESTART_HOUR),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=23)),
+                vol.Optional(
+                    "fan_control",
+                    default=options.get("fan_control", False),
+                ): bool,
+                vol.Optional(
+                    "fan_target_temp",
+                    default=options.get("fan_target_temp", DEFAULT_FAN_TARGET_TEMP),
+                ): vol.All(vol.Coerce(float), vol.Range(min=35, max=65)),
+                vol.Optional(
+                    "fan_throttle_frequency",
+                    default=options.get("fan_throttle_frequency", False),
+                ): bool,
+                vol.Optional(
+                    "raw_system_info",
+                    default=options.get("raw_system_info", False),
+                ): bool,
+                vol.Optional(
+                    "significant_change_filter",
+                    default=options.get("significant_change_filter", False),
+                ): bool,
+                vol.Optional(
+                    "min_publish_interval",
+                    default=options.get("min_publish_interval", DEFAULT_MIN_PUBLISH_INTERVAL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                vol.Optional(
+                    "max_publish_interval",
+                    default=options.get("max_publish_interval", DEFAULT_MAX_PUBLISH_INTERVAL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0)),
             }
         )
 
         return self.async_show_form(step_id="init", data_schema=data_schema)
+
+    async def _async_step_after_entities(self):
+        if self._options.get("significant_change_filter"):
+            return await self.async_step_deadbands()
+        return self.async_create_entry(title="", data=self._options)
+
+    async def async_step_entities(self, user_input=None):
+        """Pick the entities of the custom profile, per platform."""
+        if user_input is not None:
+            self._options["custom_entities"] = {platform: list(user_input[platform]) for platform in PLATFORM_KEYS}
+            return await self._async_step_after_entities()
+
+        choices = {
+            "sensor": {
+                **{key: name for key, (name, *_rest) in SENSOR_TYPES.items()},
+                ENERGY_KEY: "Energy",
+                ASIC_KEY: "Per-ASIC sensors",
+            },
+            "binary_sensor": {key: name for key, (name, *_rest) in BINARY_SENSOR_TYPES.items()},
+            "number": {key: name for key, (name, *_rest) in NUMBER_TYPES.items()},
+            "switch": {key: name for key, (name, *_rest) in SWITCH_TYPES.items()},
+            "button": {RESTART_KEY: "Restart"},
+        }
+        # Start from the standard profile the first time
+        selected = self.config_entry.options.get("custom_entities", PROFILE_ENTITIES[PROFILE_STANDARD])
+        schema = {
+            vol.Optional(platform, default=list(selected.get(platform, ()))): cv.multi_select(choices[platform])
+            for platform in PLATFORM_KEYS
+        }
+        return self.async_show_form(step_id="entities", data_schema=vol.Schema(schema))
+
+    async def async_step_deadbands(self, user_input=None):
+        """Configure per-sensor deadbands for the significant-change filter."""
+        if user_input is not None:
+            self._options["deadbands"] = {
+                key: [user_input[f"{key}_absolute"], user_input[f"{key}_relative"] / 100]
+                for key in DEADBAND_TYPES
+            }
+            return self.async_create_entry(title="", data=self._options)
+
+        deadbands = {**DEADBAND_TYPES, **self.config_entry.options.get("deadbands", {})}
+        schema: dict[Any, Any] = {}
+        for key in DEADBAND_TYPES:
+            absolute, relative = deadbands[key]
+            schema[vol.Optional(f"{key}_absolute", default=absolute)] = vol.All(
+                vol.Coerce(float), vol.Range(min=0)
+            )
+            schema[vol.Optional(f"{key}_relative", default=relative * 100)] = vol.All(
+                vol.Coerce(float), vol.Range(min=0, max=100)
+            )
+
+        return self.async_show_form(step_id="deadbands", data_schema=vol.Schema(schema))
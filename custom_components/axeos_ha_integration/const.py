@@ -2,9 +2,26 @@
 
 DOMAIN = "axeos_ha_integration"
 DEFAULT_SCAN_INTERVAL = 30  # in seconds
+DEFAULT_MIN_PUBLISH_INTERVAL = 0  # in seconds
+DEFAULT_MAX_PUBLISH_INTERVAL = 600  # in seconds
+DEFAULT_WATCHDOG_SHARES_WINDOW = 1800  # in seconds
+DEFAULT_WATCHDOG_HASHRATE_WINDOW = 300  # in seconds
+DEFAULT_WATCHDOG_NONCE_WINDOW = 600  # in seconds
+DEFAULT_WATCHDOG_NONCE_THRESHOLD = 5
+DEFAULT_WATCHDOG_COOLDOWN = 1800  # in seconds
+DEFAULT_HEAP_RESTART_THRESHOLD = 24  # in hours
+DEFAULT_HEAP_RESTART_HOUR = 3  # local time, start of a two hour window
+DEFAULT_FAN_TARGET_TEMP = 60  # in °C
+# The fan goes back to the firmware when no poll succeeded for this long
+FAN_CONTROL_STALE_TIMEOUT = 180  # in seconds
+# Power is not integrated across longer gaps between successful polls
+ENERGY_MAX_GAP = 300  # in seconds
 
 CONF_HOST = "host"
 CONF_NAME = "name"
+# Entry data: address a miner was found at by MAC after it left its configured
+# host. The host itself stays, since the entity unique IDs are derived from it.
+RELOCATED_ADDRESS = "relocated_address"
 
 API_SYSTEM = "/api/system"
 API_SYSTEM_INFO = "/api/system/info"
@@ -12,3 +29,78 @@ API_SYSTEM_RESTART = "/api/system/restart"
 API_SYSTEM_FREQUENCY = "/api/system/frequency"
 API_SYSTEM_VOLTAGE = "/api/system/voltage"
 API_SYSTEM_FANSPEED = "/api/system/fanspeed"
+API_SYSTEM_STATISTICS = "/api/system/statistics"
+API_SYSTEM_ASIC = "/api/system/asic"
+API_SYSTEM_OTA = "/api/system/OTA"
+API_SYSTEM_OTAWWW = "/api/system/OTAWWW"
+
+# Upper bound for an /api/system/info body; real responses are a few KiB
+MAX_SYSTEM_INFO_BYTES = 256 * 1024
+# The statistics ring buffer holds several hours of samples
+MAX_STATISTICS_BYTES = 1024 * 1024
+# Socket connect and read timeouts per request, configurable per entry
+DEFAULT_CONNECT_TIMEOUT = 5  # in seconds
+DEFAULT_READ_TIMEOUT = 5  # in seconds
+# GETs are retried with jittered exponential backoff while the poll budget allows
+POLL_ATTEMPTS = 3
+POLL_RETRY_BACKOFF = 0.5  # in seconds, doubled per attempt
+# Host names are resolved at most this often; the last address that answered is
+# used while resolution fails
+DNS_CACHE_TTL = 300  # in seconds
+# A miner failing this many polls in a row is searched for by MAC address in the
+# /24 of its last known address (DHCP lease changes)
+REDISCOVERY_FAILURES = 3
+REDISCOVERY_INTERVAL = 600  # in seconds
+REDISCOVERY_CONCURRENCY = 32
+REDISCOVERY_PROBE_TIMEOUT = 2  # in seconds
+# Firmware images are streamed in chunks of this size; the miner flashes while
+# receiving, so the answer can take much longer than for other requests
+OTA_CHUNK_SIZE = 64 * 1024
+OTA_TIMEOUT = 300  # in seconds
+# Concurrent requests per miner; the ESP32 web server handles very few sockets
+DEFAULT_MAX_IN_FLIGHT = 1
+# Pooled connections per miner; one spare for the config flow and a request being torn down
+MAX_CONNECTIONS_PER_MINER = 2
+# Idle connections are kept longer than the default scan interval so polls reuse them;
+# the ESP32 only drops idle sockets when it runs out of them
+CONNECTION_KEEPALIVE_TIMEOUT = 45  # in seconds
+
+# Per-ASIC data is read on its own, slower schedule
+ASIC_SCAN_INTERVAL = 300  # in seconds
+
+EVENT_ANOMALY = f"{DOMAIN}_anomaly"
+EVENT_CHANGED = f"{DOMAIN}_changed"
+EVENT_WATCHDOG = f"{DOMAIN}_watchdog"
+
+# Keys the integration adds to coordinator.data on top of /api/system/info
+DERIVED_DATA_KEYS = ("hashrate_history", "anomaly", "watchdog", "heap", "fan_control")
+# Objects in /api/system/info that sensor data paths descend into
+SYSTEM_INFO_OBJECTS = ("stratum",)
+HASHRATE_HISTORY_SIZE = 100  # polls
+
+AUTOTUNE_STORAGE_VERSION = 1
+BACKFILL_STORAGE_VERSION = 1
+# Sensors aggregated into hourly external statistics; with the
+# statistics_only_churn_sensors option they get no entities (and state rows)
+HOURLY_STATISTICS_KEYS = ("hashRate", "power", "temp", "vrTemp")
+# /api/system/statistics column -> sensor key whose long-term statistics are backfilled
+STATISTICS_COLUMNS = {
+    "hashrate": "hashRate",
+    "asicTemp": "temp",
+    "vrTemp": "vrTemp",
+    "power": "power",
+    "voltage": "voltage",
+    "current": "current",
+    "fanSpeed": "fanspeed",
+    "fanRpm": "fanrpm",
+    "wifiRssi": "wifiRSSI",
+    "freeHeap": "freeHeap",
+}
+
+# hass.data key for state shared by all miners; hass.data[DOMAIN] only holds entries
+DATA_FLEET = f"{DOMAIN}_fleet"
+
+POWER_BUDGET_STORAGE_VERSION = 1
+POWER_BUDGET_INTERVAL = 60  # in seconds
+DEFAULT_POWER_BUDGET_MIN_FREQUENCY = 400
+POWER_BUDGET_FREQUENCY_STEP = 25
@@ -0,0 +1,40 @@
+"""Diagnostics support for the AxeOS HA Integration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+TO_REDACT = {
+    "ssid",
+    "macAddr",
+    "stratumUser",
+    "fallbackStratumUser",
+    "stratumPassword",
+    "fallbackStratumPassword",
+    "wifiPass",
+}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    coordinator = entry_data["coordinator"]
+    diagnostics = {
+        "options": dict(entry.options),
+        "last_update_success": coordinator.last_update_success,
+        "client": dict(entry_data["api"].stats),
+        "system_info": async_redact_data(coordinator.data or {}, TO_REDACT),
+    }
+    if (watchdog := entry_data.get("watchdog")) is not None:
+        diagnostics["watchdog_incidents"] = list(watchdog.incidents)
+    if (fan_controller := entry_data.get("fan_controller")) is not None:
+        diagnostics["fan_control"] = dict(fan_controller.state)
+    return diagnostics
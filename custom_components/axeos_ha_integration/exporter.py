@@ -0,0 +1,204 @@
+"""Prometheus/OpenMetrics exporter for all configured miners."""
+
+from __future__ import annotations
+
+import logging
+import math
+from typing import Any
+
+from aiohttp import web
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.http import KEY_HASS, HomeAssistantView
+
+from .const import DOMAIN
+from .fleet import async_get_fleet, async_get_fleet_data
+
+_LOGGER = logging.getLogger(__name__)
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# -------------------------------------------------------------------------
+# METRIC_FAMILIES: metrics rendered from coordinator.data
+# value: Tuple (metric name, type, help text, samples)
+# samples: list of (extra label string, data key); counters get the _total suffix
+# -------------------------------------------------------------------------
+METRIC_FAMILIES: list[tuple[str, str, str, list[tuple[str, str]]]] = [
+    ("axeos_hashrate_ghs", "gauge", "Hashrate in GH/s by averaging window", [
+        ('window="current"', "hashRate"),
+        ('window="1m"', "hashRate_1m"),
+        ('window="10m"', "hashRate_10m"),
+        ('window="1h"', "hashRate_1h"),
+        ('window="1d"', "hashRate_1d"),
+    ]),
+    ("axeos_expected_hashrate_ghs", "gauge", "Expected hashrate in GH/s", [("", "expectedHashrate")]),
+    ("axeos_power_watts", "gauge", "Power consumption in W", [("", "power")]),
+    ("axeos_input_voltage_millivolts", "gauge", "Input voltage in mV", [("", "voltage")]),
+    ("axeos_current_milliamps", "gauge", "Input current in mA", [("", "current")]),
+    ("axeos_core_voltage_millivolts", "gauge", "ASIC core voltage in mV", [
+        ('kind="target"', "coreVoltage"),
+        ('kind="actual"', "coreVoltageActual"),
+    ]),
+    ("axeos_frequency_mhz", "gauge", "ASIC frequency in MHz", [("", "frequency")]),
+    ("axeos_temperature_celsius", "gauge", "Temperature in degrees Celsius", [
+        ('sensor="chip"', "temp"),
+        ('sensor="vr"', "vrTemp"),
+    ]),
+    ("axeos_fan_speed_percent", "gauge", "Fan speed in percent", [("", "fanspeed")]),
+    ("axeos_fan_rpm", "gauge", "Fan speed in RPM", [("", "fanrpm")]),
+    ("axeos_shares_accepted", "counter", "Accepted shares since boot", [("", "sharesAccepted")]),
+    ("axeos_shares_rejected", "counter", "Rejected shares since boot", [("", "sharesRejected")]),
+    ("axeos_uptime_seconds", "gauge", "Miner uptime in seconds", [("", "uptimeSeconds")]),
+    ("axeos_wifi_rssi_dbm", "gauge", "WiFi signal strength in dBm", [("", "wifiRSSI")]),
+    ("axeos_free_heap_bytes", "gauge", "Free heap memory in bytes", [("", "freeHeap")]),
+    ("axeos_overheat", "gauge", "1 while the miner is in overheat mode", [("", "overheat_mode")]),
+]
+
+# Metrics rendered from AxeOSAPI.stats
+# value: Tuple (metric name, type, help text, stats key)
+CLIENT_METRIC_FAMILIES: list[tuple[str, str, str, str]] = [
+    ("axeos_poll_last_duration_seconds", "gauge", "Duration of the last system info poll", "last_poll_seconds"),
+    ("axeos_poll_consecutive_failures", "gauge", "Failed polls since the last success", "consecutive_failures"),
+    ("axeos_poll_failures", "counter", "Failed system info polls", "poll_failures"),
+    ("axeos_poll_unchanged", "counter", "Polls answered with a byte-identical body", "unchanged_payloads"),
+    ("axeos_poll_coalesced", "counter", "Polls served by an already queued poll", "coalesced_polls"),
+    ("axeos_poll_retries", "counter", "Retried system info requests", "retries"),
+    ("axeos_write_failures", "counter", "Failed control writes", "write_failures"),
+    ("axeos_connections_opened", "counter", "TCP connections opened to the miner", "connections_opened"),
+    ("axeos_connections_reused", "counter", "Requests served over a kept-alive connection", "connections_reused"),
+    ("axeos_dns_lookups", "counter", "Host name resolutions for the miner", "dns_lookups"),
+    ("axeos_rediscoveries", "counter", "Times the miner was found at a new address", "rediscoveries"),
+    ("axeos_request_queue_depth", "gauge", "Requests waiting for a slot to the miner", "queue_depth"),
+    ("axeos_request_queue_wait_seconds", "counter", "Time requests spent waiting for a slot", "queue_wait_seconds_total"),
+]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format(value: Any) -> str | None:
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, float):
+        if math.isnan(value):
+            return "NaN"
+        if math.isinf(value):
+            return "+Inf" if value > 0 else "-Inf"
+        return repr(value)
+    return None
+
+
+class _LabelCache:
+    """Pre-rendered sample prefixes (``name{miner="..",host="..",..} ``) per config entry.
+
+    Label sets only change when a miner is renamed, so a scrape just appends
+    formatted values to cached prefixes.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[str, tuple[str, str, str, list[list[str]]]] = {}
+
+    def get(self, entry_id: str, name: str, host: str) -> tuple[str, list[list[str]]]:
+        cached = self._entries.get(entry_id)
+        if cached is None or cached[0] != name or cached[1] != host:
+            labels = f'miner="{_escape(name)}",host="{_escape(host)}"'
+            prefixes = [
+                [
+                    f"{_sample_name(metric, metric_type)}{{{labels}{',' + extra if extra else ''}}} "
+                    for extra, _key in samples
+                ]
+                for metric, metric_type, _help, samples in METRIC_FAMILIES
+            ]
+            cached = self._entries[entry_id] = (name, host, labels, prefixes)
+        return cached[2], cached[3]
+
+
+def _sample_name(name: str, metric_type: str) -> str:
+    return f"{name}_total" if metric_type == "counter" else name
+
+
+def render_metrics(fleet: dict[str, dict[str, Any]], label_cache: _LabelCache) -> str:
+    """Render the latest snapshot of every miner in OpenMetrics text format."""
+    miners = []
+    for entry_id, entry_data in fleet.items():
+        coordinator = entry_data["coordinator"]
+        labels, prefixes = label_cache.get(entry_id, entry_data["name"], entry_data["host"])
+        miners.append(
+            (labels, prefixes, coordinator, coordinator.data or {}, entry_data["api"].stats)
+        )
+
+    lines: list[str] = [
+        "# TYPE axeos_up gauge",
+        "# HELP axeos_up 1 if the last poll of the miner succeeded",
+    ]
+    append = lines.append
+    for labels, _prefixes, coordinator, _data, _stats in miners:
+        append(f"axeos_up{{{labels}}} {1 if coordinator.last_update_success else 0}")
+
+    for index, (name, metric_type, help_text, samples) in enumerate(METRIC_FAMILIES):
+        append(f"# TYPE {name} {metric_type}")
+        append(f"# HELP {name} {help_text}")
+        keys = [key for _extra, key in samples]
+        for _labels, prefixes, _coordinator, data, _stats in miners:
+            for prefix, key in zip(prefixes[index], keys):
+                value = _format(data.get(key))
+                if value is not None:
+                    append(prefix + value)
+
+    append("# TYPE axeos_anomaly gauge")
+    append("# HELP axeos_anomaly 1 while the streaming detector flags the metric")
+    for labels, _prefixes, _coordinator, data, _stats in miners:
+        for metric, active in (data.get("anomaly") or {}).items():
+            append(f'axeos_anomaly{{{labels},metric="{metric}"}} {1 if active else 0}')
+
+    append("# TYPE axeos_poll_duration_seconds summary")
+    append("# HELP axeos_poll_duration_seconds Duration of system info polls")
+    for labels, _prefixes, _coordinator, _data, stats in miners:
+        append(f"axeos_poll_duration_seconds_sum{{{labels}}} {stats['poll_seconds_total']!r}")
+        append(f"axeos_poll_duration_seconds_count{{{labels}}} {stats['polls']}")
+
+    for name, metric_type, help_text, key in CLIENT_METRIC_FAMILIES:
+        append(f"# TYPE {name} {metric_type}")
+        append(f"# HELP {name} {help_text}")
+        sample_name = _sample_name(name, metric_type)
+        for labels, _prefixes, _coordinator, _data, stats in miners:
+            value = _format(stats.get(key))
+            if value is not None:
+                append(f"{sample_name}{{{labels}}} {value}")
+
+    append("# TYPE axeos_requests counter")
+    append("# HELP axeos_requests HTTP requests to the miner by outcome")
+    for labels, _prefixes, _coordinator, _data, stats in miners:
+        for outcome, count in stats["outcomes"].items():
+            append(f'axeos_requests_total{{{labels},outcome="{outcome}"}} {count}')
+
+    append("# EOF")
+    append("")
+    return "\n".join(lines)
+
+
+class AxeOSMetricsView(HomeAssistantView):
+    """Serve all miners' metrics at /api/axeos_ha_integration/metrics."""
+
+    url = f"/api/{DOMAIN}/metrics"
+    name = f"api:{DOMAIN}:metrics"
+    requires_auth = True
+
+    def __init__(self) -> None:
+        self._label_cache = _LabelCache()
+
+    async def get(self, request: web.Request) -> web.Response:
+        hass = request.app[KEY_HASS]
+        body = render_metrics(async_get_fleet(hass), self._label_cache)
+        return web.Response(body=body.encode(), headers={"Content-Type": CONTENT_TYPE})
+
+
+def async_register_metrics_view(hass: HomeAssistant) -> None:
+    """Register the metrics view once; views cannot be removed again."""
+    fleet_data = async_get_fleet_data(hass)
+    if not fleet_data.get("metrics_view_registered"):
+        hass.http.register_view(AxeOSMetricsView())
+        fleet_data["metrics_view_registered"] = True
@@ -0,0 +1,208 @@
+"""Integration-side fan control loop.
+
+The firmware either runs its own fan curve (``autofanspeed``) or holds a fixed
+speed. This controller takes the fan over and drives it from ``temp`` and
+``vrTemp`` with a PID loop, so the setpoint can follow room conditions set in
+Home Assistant. When the fan alone cannot hold the target, the frequency can
+optionally be lowered step by step.
+
+Control is handed back to the firmware's auto fan (and the original frequency
+restored) when a temperature passes the failsafe limit, when no fresh data
+arrived for a while, on a failed write and when Home Assistant stops.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from .api import AxeOSAPI
+
+_LOGGER = logging.getLogger(__name__)
+
+HANDOVER_OVERHEAT = "overheat"
+HANDOVER_STALE = "stale"
+HANDOVER_WRITE_FAILED = "write_failed"
+HANDOVER_STOPPED = "stopped"
+
+
+@dataclass
+class FanControlSettings:
+    """Setpoints, PID gains and write policy of the fan controller."""
+
+    target_temp: float = 60
+    target_vr_temp: float = 75
+    kp: float = 4.0
+    ki: float = 0.05  # per second
+    kd: float = 0.0
+    min_speed: int = 25
+    max_speed: int = 100
+    # A new speed is only written once it differs this much from the last one
+    hysteresis: int = 3  # in percent
+    min_write_interval: float = 30  # in seconds
+    # Hand over to the firmware above these temperatures
+    failsafe_temp: float = 70
+    failsafe_vr_temp: float = 90
+    # Hand over when the last usable snapshot is older than this
+    stale_timeout: float = 180  # in seconds
+    # Lower the frequency while the fan is at max_speed and still too hot
+    throttle_frequency: bool = False
+    frequency_step: int = 25
+    min_frequency: int = 400
+    frequency_interval: float = 300  # in seconds
+
+    def __post_init__(self) -> None:
+        if not 0 <= self.min_speed <= self.max_speed <= 100:
+            raise ValueError("Fan speeds must satisfy 0 <= min_speed <= max_speed <= 100")
+        if self.failsafe_temp <= self.target_temp:
+            raise ValueError("failsafe_temp must be above target_temp")
+
+
+class AxeOSFanController:
+    """PID fan control for one miner.
+
+    ``update`` is fed every poll and returns the command to send, if any: a
+    dict with ``autofanspeed``, ``fanspeed`` and/or ``frequency``. Taking over
+    starts from the current fan speed, so the fan does not jump. The
+    integral is only accumulated while the output is not clamped.
+    """
+
+    def __init__(self, settings: FanControlSettings | None = None) -> None:
+        self.settings = settings or FanControlSettings()
+        self.state: dict[str, Any] = {"active": False, "output": None, "error": None, "handover": None}
+        self._integral = 0.0
+        self._last_error: float | None = None
+        self._last_at: float | None = None
+        self._written: int | None = None
+        self._written_at = float("-inf")
+        self._original_frequency: int | None = None
+        self._frequency: int | None = None
+        self._frequency_at = float("-inf")
+
+    def _error(self, data: dict[str, Any]) -> float | None:
+        """Worst of the chip and VR temperature errors (positive is too hot)."""
+        errors = []
+        for key, target in (("temp", self.settings.target_temp), ("vrTemp", self.settings.target_vr_temp)):
+            value = data.get(key)
+            # The firmware reports 0 or -1 for a missing sensor
+            if isinstance(value, (int, float)) and value > 0:
+                errors.append(value - target)
+        return max(errors) if errors else None
+
+    def _handover(self, reason: str) -> dict[str, Any] | None:
+        """Command giving control back to the firmware, or None if it already has it."""
+        if not self.state["active"]:
+            return None
+        _LOGGER.warning("Handing fan control back to the firmware (%s)", reason)
+        command: dict[str, Any] = {"autofanspeed": True}
+        if self._frequency is not None and self._frequency != self._original_frequency:
+            command["frequency"] = self._original_frequency
+        self.state.update(active=False, output=None, handover=reason)
+        self._last_error = self._last_at = None
+        self._written = self._frequency = None
+        self._frequency_at = float("-inf")
+        return command
+
+    def _take_over(self, data: dict[str, Any], now: float) -> dict[str, Any]:
+        settings = self.settings
+        speed = data.get("fanspeed")
+        if not isinstance(speed, (int, float)):
+            speed = settings.max_speed
+        self._integral = min(max(speed, settings.min_speed), settings.max_speed)
+        frequency = data.get("frequency")
+        self._original_frequency = self._frequency = int(frequency) if isinstance(frequency, (int, float)) else None
+        self.state.update(active=True, handover=None)
+        self._written = int(self._integral)
+        self._written_at = now
+        return {"autofanspeed": False, "fanspeed": self._written}
+
+    def update(self, data: dict[str, Any], now: float | None = None) -> dict[str, Any] | None:
+        """Feed one snapshot; returns the command to send, if any."""
+        now = time.monotonic() if now is None else now
+        settings = self.settings
+        if (error := self._error(data)) is None:
+            return None
+        self.state["error"] = round(error, 2)
+        temp, vr_temp = data.get("temp") or 0, data.get("vrTemp") or 0
+        if temp >= settings.failsafe_temp or vr_temp >= settings.failsafe_vr_temp:
+            return self._handover(HANDOVER_OVERHEAT)
+
+        if not self.state["active"]:
+            # After an overheat, wait until the firmware brought it back to target
+            if self.state["handover"] == HANDOVER_OVERHEAT and error > 0:
+                return None
+            # and after a failed write, give the miner a moment before retrying
+            if now - self._written_at < settings.min_write_interval:
+                return None
+            command = self._take_over(data, now)
+            self._last_error, self._last_at = error, now
+            self.state["output"] = self._written
+            return command
+
+        dt = now - self._last_at
+        derivative = (error - self._last_error) / dt if dt > 0 else 0.0
+        self._last_error, self._last_at = error, now
+        unclamped = self._integral + settings.ki * error * dt + settings.kp * error + settings.kd * derivative
+        output = min(max(unclamped, settings.min_speed), settings.max_speed)
+        if output == unclamped:
+            self._integral += settings.ki * error * dt
+        output = round(output)
+        self.state["output"] = output
+
+        command: dict[str, Any] = {}
+        if abs(output - self._written) >= settings.hysteresis and now - self._written_at >= settings.min_write_interval:
+            command["fanspeed"] = self._written = output
+            self._written_at = now
+        if settings.throttle_frequency and self._frequency is not None:
+            if (frequency := self._throttle(output, error, now)) is not None:
+                command["frequency"] = frequency
+        return command or None
+
+    def _throttle(self, output: int, error: float, now: float) -> int | None:
+        """Frequency to set, stepping down at full fan and back up once cool."""
+        settings = self.settings
+        if now - self._frequency_at < settings.frequency_interval:
+            return None
+        frequency = self._frequency
+        if output >= settings.max_speed and error > 0:
+            frequency = max(frequency - settings.frequency_step, settings.min_frequency)
+        elif output < settings.max_speed and error < -settings.hysteresis:
+            frequency = min(frequency + settings.frequency_step, self._original_frequency)
+        if frequency == self._frequency:
+            return None
+        self._frequency = frequency
+        self._frequency_at = now
+        return frequency
+
+    def check_stale(self, last_update: float, now: float | None = None) -> dict[str, Any] | None:
+        """Handover command when the last snapshot (monotonic time) is too old."""
+        now = time.monotonic() if now is None else now
+        if now - last_update >= self.settings.stale_timeout:
+            return self._handover(HANDOVER_STALE)
+        return None
+
+    def release(self) -> dict[str, Any] | None:
+        """Handover command for shutdown or unload."""
+        return self._handover(HANDOVER_STOPPED)
+
+    async def async_release(self, api: AxeOSAPI) -> None:
+        """Hand control back to the firmware now, if this controller has it."""
+        if command := self.release():
+            await self.async_apply(api, command)
+
+    async def async_apply(self, api: AxeOSAPI, command: dict[str, Any]) -> bool:
+        """Send ``command``; a failed write while in control hands over to the firmware."""
+        ok = True
+        if "autofanspeed" in command:
+            ok = await api.set_setting("autofanspeed", command["autofanspeed"])
+        if ok and "fanspeed" in command:
+            ok = await api.set_fanspeed(command["fanspeed"])
+        if ok and command.get("frequency") is not None:
+            ok = await api.set_frequency(command["frequency"])
+        if not ok and (handover := self._handover(HANDOVER_WRITE_FAILED)):
+            await api.set_setting("autofanspeed", handover["autofanspeed"])
+            if handover.get("frequency") is not None:
+                await api.set_frequency(handover["frequency"])
+        return ok
@@ -0,0 +1,105 @@
+"""Fleet-wide helpers spanning all configured miners."""
+
+from __future__ import annotations
+
+from collections.abc import Collection, Sequence
+from typing import Any
+
+import aiohttp
+
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant
+
+from .api import create_session
+from .const import DATA_FLEET, DERIVED_DATA_KEYS, DOMAIN
+
+# Columns every fleet snapshot starts with, ahead of the selected fields
+SNAPSHOT_META_COLUMNS = ("entry_id", "name", "host", "available")
+
+
+def async_get_fleet(hass: HomeAssistant) -> dict[str, dict[str, Any]]:
+    """Return entry_id -> integration data for every set-up miner."""
+    return {
+        entry_id: entry_data
+        for entry_id, entry_data in hass.data.get(DOMAIN, {}).items()
+        if "coordinator" in entry_data
+    }
+
+
+def async_get_fleet_data(hass: HomeAssistant) -> dict[str, Any]:
+    """Return storage for state shared by all miners (controllers, views)."""
+    return hass.data.setdefault(DATA_FLEET, {})
+
+
+def async_get_fleet_session(hass: HomeAssistant) -> aiohttp.ClientSession:
+    """Return the connection pool shared by all miners, creating it on first use."""
+    fleet_data = async_get_fleet_data(hass)
+    if "session" not in fleet_data:
+        session = fleet_data["session"] = create_session()
+
+        async def _async_close_session(_event: Event) -> None:
+            await session.close()
+
+        fleet_data["session_unsub"] = hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_CLOSE, _async_close_session
+        )
+    return fleet_data["session"]
+
+
+async def async_close_fleet_session(hass: HomeAssistant) -> None:
+    """Close the shared connection pool after the last miner is unloaded."""
+    fleet_data = async_get_fleet_data(hass)
+    if (session := fleet_data.pop("session", None)) is not None:
+        fleet_data.pop("session_unsub")()
+        await session.close()
+
+
+def _snapshot_value(data: dict[str, Any], field: str) -> Any:
+    """Value of a top-level or dotted nested field (e.g. ``stratum.poolMode``)."""
+    value: Any = data
+    for key in field.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def async_get_fleet_snapshot(
+    hass: HomeAssistant,
+    entry_ids: Collection[str] | None = None,
+    fields: Sequence[str] | None = None,
+    available_only: bool = False,
+) -> dict[str, Any]:
+    """Latest coordinator snapshot of every (selected) miner in columnar form.
+
+    Served from the coordinators' cached data, so no request is sent. Without
+    ``fields`` all snapshot fields are returned; missing values are None.
+    """
+    miners = []
+    for entry_id, entry_data in async_get_fleet(hass).items():
+        if entry_ids is not None and entry_id not in entry_ids:
+            continue
+        coordinator = entry_data["coordinator"]
+        if available_only and not coordinator.last_update_success:
+            continue
+        miners.append((entry_id, entry_data, coordinator))
+
+    if fields is None:
+        seen: dict[str, None] = {}
+        for _entry_id, _entry_data, coordinator in miners:
+            seen.update(dict.fromkeys(coordinator.data or ()))
+        fields = [field for field in seen if field not in DERIVED_DATA_KEYS]
+    fields = [field for field in fields if field not in SNAPSHOT_META_COLUMNS]
+
+    columns: dict[str, list[Any]] = {
+        column: [] for column in (*SNAPSHOT_META_COLUMNS, *fields)
+    }
+    for entry_id, entry_data, coordinator in miners:
+        data = coordinator.data or {}
+        columns["entry_id"].append(entry_id)
+        columns["name"].append(entry_data["name"])
+        columns["host"].append(entry_data["host"])
+        columns["available"].append(coordinator.last_update_success)
+        for field in fields:
+            columns[field].append(_snapshot_value(data, field))
+    return {"count": len(miners), "columns": columns}
@@ -0,0 +1,224 @@
+"""Poll a fleet of AxeOS miners from the command line, without Home Assistant.
+
+Uses the same client (AxeOSAPI, create_session) as the integration, so the
+numbers reflect how the integration talks to the miners: retries, connection
+reuse, request scheduling and all. Targets are host names, addresses or CIDR
+ranges::
+
+    python -m custom_components.axeos_ha_integration.fleetpoll 192.168.1.0/24 bitaxe-2.local \\
+        --rounds 10 --interval 5 --ndjson snapshots.ndjson
+
+Prints latency percentiles, the outcome of every request attempt and the
+throughput. Point it at ``tests/simulator.py`` for a reproducible run.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import ipaddress
+import json
+import logging
+import math
+import sys
+import time
+from collections import Counter
+from collections.abc import Iterable
+from typing import IO, Any
+
+from .api import OUTCOME_OK, AxeOSAPI, create_session
+from .const import DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT
+
+DEFAULT_CONCURRENCY = 64
+MAX_HOSTS = 4096
+PERCENTILES = (50, 90, 95, 99)
+
+# Client counters summed over all miners
+_SUMMED_STATS = ("retries", "connections_opened", "connections_reused", "unchanged_payloads", "rediscoveries")
+
+
+def expand_targets(targets: Iterable[str], port: int | None = None, max_hosts: int = MAX_HOSTS) -> list[str]:
+    """Hosts to poll: CIDR ranges are expanded, ``port`` is added where none is given."""
+    hosts: list[str] = []
+    for target in targets:
+        try:
+            network = ipaddress.ip_network(target, strict=False)
+        except ValueError:
+            addresses = [target]
+        else:
+            if network.num_addresses > max_hosts:
+                raise ValueError(f"{target} has more than {max_hosts} addresses")
+            # hosts() is empty for a /32
+            addresses = [str(address) for address in (network.hosts() if network.num_addresses > 1 else network)]
+        for address in addresses:
+            if port is not None and ":" not in address:
+                address = f"{address}:{port}"
+            if address not in hosts:
+                hosts.append(address)
+        if len(hosts) > max_hosts:
+            raise ValueError(f"More than {max_hosts} hosts")
+    return hosts
+
+
+def percentile(values: list[float], percent: float) -> float | None:
+    """Nearest-rank percentile of sorted ``values``."""
+    if not values:
+        return None
+    return values[max(0, math.ceil(percent / 100 * len(values)) - 1)]
+
+
+async def async_poll_fleet(
+    hosts: list[str],
+    rounds: int = 1,
+    interval: float = 0,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+    read_timeout: float = DEFAULT_READ_TIMEOUT,
+    ndjson: IO[str] | None = None,
+) -> dict[str, Any]:
+    """Poll every host ``rounds`` times, a round starting every ``interval`` seconds.
+
+    Returns the summary; each poll is written to ``ndjson`` as one line with
+    the snapshot or the error.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    failed_hosts: Counter[str] = Counter()
+
+    async with create_session() as session:
+        apis = [
+            AxeOSAPI(
+                session,
+                host,
+                connect_timeout=connect_timeout,
+                read_timeout=read_timeout,
+                poll_budget=max(interval, connect_timeout + read_timeout),
+            )
+            for host in hosts
+        ]
+
+        async def poll(api: AxeOSAPI, number: int) -> None:
+            async with semaphore:
+                outcomes = dict(api.stats["outcomes"])
+                started = time.monotonic()
+                data = await api.get_system_info()
+                latency = time.monotonic() - started
+            record: dict[str, Any] = {
+                "time": round(time.time(), 3),
+                "round": number,
+                "host": api.host,
+                "latency_ms": round(latency * 1000, 2),
+            }
+            if data is None:
+                failed_hosts[api.host] += 1
+                # Most frequent outcome of the attempts of this poll
+                record["error"] = max(
+                    (outcome for outcome in outcomes if outcome != OUTCOME_OK),
+                    key=lambda outcome: api.stats["outcomes"][outcome] - outcomes[outcome],
+                )
+            else:
+                latencies.append(latency)
+                record["data"] = data
+            if ndjson is not None:
+                ndjson.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+        started = time.monotonic()
+        for number in range(rounds):
+            if number and (delay := started + number * interval - time.monotonic()) > 0:
+                await asyncio.sleep(delay)
+            await asyncio.gather(*(poll(api, number) for api in apis))
+        seconds = time.monotonic() - started
+        for api in apis:
+            api.cancel_rediscovery()
+
+    latencies.sort()
+    polls = len(hosts) * rounds
+    outcomes: Counter[str] = Counter()
+    for api in apis:
+        outcomes.update(api.stats["outcomes"])
+    return {
+        "hosts": len(hosts),
+        "rounds": rounds,
+        "polls": polls,
+        "succeeded": len(latencies),
+        "failed": polls - len(latencies),
+        "seconds": round(seconds, 3),
+        "polls_per_second": round(polls / seconds, 2) if seconds > 0 else None,
+        "latency_ms": {
+            **{f"p{percent}": _ms(percentile(latencies, percent)) for percent in PERCENTILES},
+            "mean": _ms(sum(latencies) / len(latencies)) if latencies else None,
+            "max": _ms(latencies[-1]) if latencies else None,
+        },
+        "attempts": dict(outcomes),
+        **{key: sum(api.stats[key] for api in apis) for key in _SUMMED_STATS},
+        "unreachable": sorted(host for host, count in failed_hosts.items() if count == rounds),
+    }
+
+
+def _ms(seconds: float | None) -> float | None:
+    return None if seconds is None else round(seconds * 1000, 2)
+
+
+def format_summary(summary: dict[str, Any]) -> str:
+    """Human-readable report of ``async_poll_fleet``'s summary."""
+    latency = summary["latency_ms"]
+    lines = [
+        f"Hosts: {summary['hosts']}, rounds: {summary['rounds']}, polls: {summary['polls']} "
+        f"({summary['succeeded']} ok, {summary['failed']} failed) in {summary['seconds']} s",
+        f"Throughput: {summary['polls_per_second']} polls/s",
+        "Latency (ms): " + ", ".join(f"{key} {value}" for key, value in latency.items()),
+        "Attempts: " + ", ".join(f"{key} {value}" for key, value in summary["attempts"].items()),
+        "Client: " + ", ".join(f"{key} {summary[key]}" for key in _SUMMED_STATS),
+    ]
+    if summary["unreachable"]:
+        lines.append(f"Unreachable ({len(summary['unreachable'])}): " + ", ".join(summary["unreachable"]))
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Poll AxeOS miners and report latency, errors and throughput")
+    parser.add_argument("targets", nargs="+", help="host names, addresses (host:port) or CIDR ranges")
+    parser.add_argument("--port", type=int, help="port for targets without one")
+    parser.add_argument("--rounds", type=int, default=1)
+    parser.add_argument("--interval", type=float, default=0, help="seconds between the starts of two rounds")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="polls in flight at once")
+    parser.add_argument("--connect-timeout", type=float, default=DEFAULT_CONNECT_TIMEOUT)
+    parser.add_argument("--read-timeout", type=float, default=DEFAULT_READ_TIMEOUT)
+    parser.add_argument("--ndjson", help="write every snapshot or error as one JSON line to this file ('-' for stdout)")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log client errors and retries")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.CRITICAL)
+
+    try:
+        hosts = expand_targets(args.targets, args.port)
+    except ValueError as err:
+        parser.error(str(err))
+
+    ndjson = None
+    if args.ndjson == "-":
+        ndjson = sys.stdout
+    elif args.ndjson:
+        ndjson = open(args.ndjson, "w", encoding="utf-8")
+    try:
+        summary = asyncio.run(
+            async_poll_fleet(
+                hosts,
+                rounds=args.rounds,
+                interval=args.interval,
+                concurrency=args.concurrency,
+                connect_timeout=args.connect_timeout,
+                read_timeout=args.read_timeout,
+                ndjson=ndjson,
+            )
+        )
+    finally:
+        if ndjson is not None and ndjson is not sys.stdout:
+            ndjson.close()
+    output = sys.stderr if ndjson is sys.stdout else sys.stdout
+    print(json.dumps(summary) if args.json else format_summary(summary), file=output)
+    return 0 if summary["succeeded"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
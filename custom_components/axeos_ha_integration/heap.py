@@ -0,0 +1,160 @@
+"""Free heap trend estimation and exhaustion forecasting.
+
+A firmware memory leak shows up as free heap shrinking at a steady rate until
+the miner crashes. A least-squares line over a sliding window of samples
+gives the leak rate and the time left until the heap reaches a floor, which
+allows a planned restart before the crash.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any
+
+# The ESP32 starts failing allocations well before the heap is empty
+DEFAULT_HEAP_FLOOR = 16 * 1024  # in bytes
+
+
+class SlidingRegression:
+    """Online least-squares line over the samples of the last ``window`` seconds.
+
+    Sums are updated incrementally as samples enter and leave the window.
+    Times are taken relative to an origin inside the window to keep the sums
+    well conditioned; once the oldest sample is more than a window past the
+    origin, the origin moves to it and the sums are recomputed, which also
+    drops the rounding error the incremental updates have accumulated.
+    """
+
+    def __init__(self, window: float) -> None:
+        self.window = window
+        self._samples: deque[tuple[float, float]] = deque()
+        self._origin: float | None = None
+        self._sx = self._sy = self._sxx = self._sxy = 0.0
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    @property
+    def span(self) -> float:
+        """Seconds covered by the samples in the window."""
+        if not self._samples:
+            return 0.0
+        return self._samples[-1][0] - self._samples[0][0]
+
+    def clear(self) -> None:
+        self._samples.clear()
+        self._origin = None
+        self._sx = self._sy = self._sxx = self._sxy = 0.0
+
+    def add(self, at: float, value: float) -> None:
+        if self._origin is None:
+            self._origin = at
+        x = at - self._origin
+        self._samples.append((x, value))
+        self._sx += x
+        self._sy += value
+        self._sxx += x * x
+        self._sxy += x * value
+        while self._samples and x - self._samples[0][0] > self.window:
+            old_x, old_value = self._samples.popleft()
+            self._sx -= old_x
+            self._sy -= old_value
+            self._sxx -= old_x * old_x
+            self._sxy -= old_x * old_value
+        if self._samples[0][0] > self.window:
+            self._rebase()
+
+    def _rebase(self) -> None:
+        shift = self._samples[0][0]
+        self._origin += shift
+        self._samples = deque((x - shift, value) for x, value in self._samples)
+        self._sx = sum(x for x, _ in self._samples)
+        self._sy = sum(value for _, value in self._samples)
+        self._sxx = sum(x * x for x, _ in self._samples)
+        self._sxy = sum(x * value for x, value in self._samples)
+
+    def fit(self) -> tuple[float, float] | None:
+        """Slope (per second) and the fitted value at the latest sample."""
+        n = len(self._samples)
+        if n < 2:
+            return None
+        denominator = n * self._sxx - self._sx * self._sx
+        if denominator <= 0:
+            return None
+        slope = (n * self._sxy - self._sx * self._sy) / denominator
+        intercept = (self._sy - slope * self._sx) / n
+        return slope, intercept + slope * self._samples[-1][0]
+
+
+class HeapForecaster:
+    """Per-miner forecast of when ``freeHeap`` reaches ``floor``.
+
+    A forecast is only made once the window holds ``min_samples`` samples
+    over at least ``min_span`` seconds; a reboot (uptime going down) starts
+    over, since it frees all leaked memory.
+    """
+
+    def __init__(
+        self,
+        window: float = 6 * 3600,
+        min_span: float = 3600,
+        min_samples: int = 20,
+        floor: float = DEFAULT_HEAP_FLOOR,
+    ) -> None:
+        self.regression = SlidingRegression(window)
+        self.min_span = min_span
+        self.min_samples = min_samples
+        self.floor = floor
+        self._uptime: float | None = None
+        self._restart_requested_at: datetime | None = None
+        self.state: dict[str, Any] = {"hours_to_exhaustion": None, "leak_rate": None}
+
+    def update(self, data: dict[str, Any], now: float | None = None) -> dict[str, Any]:
+        """Feed one snapshot; returns the forecast state."""
+        now = time.monotonic() if now is None else now
+        uptime = data.get("uptimeSeconds")
+        if isinstance(uptime, (int, float)):
+            if self._uptime is not None and uptime < self._uptime:
+                self.regression.clear()
+                self._restart_requested_at = None
+            self._uptime = uptime
+
+        heap = data.get("freeHeap")
+        if isinstance(heap, (int, float)) and not isinstance(heap, bool):
+            self.regression.add(now, heap)
+
+        hours = leak_rate = None
+        if len(self.regression) >= self.min_samples and self.regression.span >= self.min_span:
+            if (fit := self.regression.fit()) is not None:
+                slope, fitted = fit
+                leak_rate = round(max(0.0, -slope) * 3600, 1)
+                if slope < 0:
+                    hours = round(max(0.0, fitted - self.floor) / -slope / 3600, 1)
+        self.state = {"hours_to_exhaustion": hours, "leak_rate": leak_rate}
+        return self.state
+
+    def restart_due(self, local_now: datetime, threshold: float, window_start: int, window_hours: int = 2) -> bool:
+        """Whether to restart now.
+
+        True when exhaustion is forecast within ``threshold`` hours and
+        ``local_now`` falls in the low-impact window starting at
+        ``window_start`` o'clock, or right away when the heap would run out
+        before that window. Once per boot; a restart that did not happen
+        (uptime never went down) is retried from the next window on.
+        """
+        hours = self.state["hours_to_exhaustion"]
+        if hours is None or hours > threshold:
+            return False
+        if (requested_at := self._restart_requested_at) is not None:
+            next_window = requested_at.replace(hour=window_start, minute=0, second=0, microsecond=0)
+            if next_window <= requested_at:
+                next_window += timedelta(days=1)
+            if local_now < next_window:
+                return False
+        hours_into_window = (local_now.hour - window_start) % 24 + local_now.minute / 60
+        if hours_into_window >= window_hours and hours > 24 - hours_into_window:
+            return False
+        self._restart_requested_at = local_now
+        return True
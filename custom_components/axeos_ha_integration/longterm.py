@@ -0,0 +1,146 @@
+"""Hourly long-term statistics aggregated in memory.
+
+Instead of relying on the recorder to compile statistics from a state row per
+poll, the high-churn values are reduced to a running count/sum/min/max per
+clock hour and written as external statistics
+(``axeos_ha_integration:<host>_<key>``) once the hour is complete, in one
+batch per metric.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Callable, Iterable
+from datetime import datetime, timezone
+from typing import Any
+
+from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_utc_time_change
+from homeassistant.util import slugify
+
+from .backfill import HOUR, statistic_metadata
+from .const import DOMAIN, HOURLY_STATISTICS_KEYS
+
+_LOGGER = logging.getLogger(__name__)
+
+# Completed hours kept while they cannot be written (recorder down or failing)
+MAX_PENDING_HOURS = 48
+
+
+class HourlyStatistics:
+    """Per-miner hourly mean/min/max of the HOURLY_STATISTICS_KEYS values."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        host_id: str,
+        name: str,
+        labels: dict[str, tuple[str, str | None]],
+        keys: Iterable[str] = HOURLY_STATISTICS_KEYS,
+    ) -> None:
+        self.hass = hass
+        self.host_id = host_id
+        self.name = name
+        # Sensor key -> (sensor name, unit)
+        self.labels = labels
+        self.keys = tuple(keys)
+        # Hour start -> key -> [count, sum, min, max]
+        self._hours: dict[float, dict[str, list[float]]] = {}
+
+    def statistic_id(self, key: str) -> str:
+        # host_id may still hold "-" or ":" (host names, host:port), which
+        # the recorder does not accept in a statistic ID
+        return f"{DOMAIN}:{slugify(f'{self.host_id}_{key}')}"
+
+    def add(self, data: dict[str, Any], now: float | None = None) -> None:
+        """Fold one snapshot into the current hour."""
+        now = time.time() if now is None else now
+        hour = self._hours.setdefault(now - now % HOUR, {})
+        for key in self.keys:
+            value = data.get(key)
+            if not isinstance(value, (int, float)) or isinstance(value, bool):
+                continue
+            if (bucket := hour.get(key)) is None:
+                hour[key] = [1, value, value, value]
+            else:
+                bucket[0] += 1
+                bucket[1] += value
+                bucket[2] = min(bucket[2], value)
+                bucket[3] = max(bucket[3], value)
+
+    def _completed(self, now: float | None) -> list[float]:
+        """Start times of the hours before the current one, oldest first."""
+        now = time.time() if now is None else now
+        current = now - now % HOUR
+        return sorted(start for start in self._hours if start < current)
+
+    def _rows(self, hours: list[float]) -> dict[str, list[dict[str, Any]]]:
+        rows: dict[str, list[dict[str, Any]]] = {}
+        for hour in hours:
+            for key, (count, total, minimum, maximum) in self._hours[hour].items():
+                rows.setdefault(key, []).append(
+                    {
+                        "start": datetime.fromtimestamp(hour, timezone.utc),
+                        "mean": total / count,
+                        "min": minimum,
+                        "max": maximum,
+                    }
+                )
+        return rows
+
+    def pop_completed(self, now: float | None = None) -> dict[str, list[dict[str, Any]]]:
+        """Remove the hours before the current one; returns their rows per key."""
+        hours = self._completed(now)
+        rows = self._rows(hours)
+        for hour in hours:
+            del self._hours[hour]
+        return rows
+
+    def import_rows(self, key: str, rows: list[dict[str, Any]]) -> None:
+        """Write hourly rows of one metric in a single batch."""
+        sensor_name, unit = self.labels.get(key, (key, None))
+        metadata = statistic_metadata(
+            self.statistic_id(key), unit, source=DOMAIN, name=f"{self.name} {sensor_name}"
+        )
+        async_add_external_statistics(self.hass, metadata, rows)
+
+    @callback
+    def async_flush(self, now: float | None = None) -> int:
+        """Write all completed hours; returns the number of rows written.
+
+        An hour is only dropped once every metric of it was handed to the
+        recorder; hours that could not be written are tried again next time.
+        """
+        # Keep the hours until they are written, within limits
+        for hour in sorted(self._hours)[:-MAX_PENDING_HOURS]:
+            del self._hours[hour]
+        if "recorder" not in self.hass.config.components:
+            return 0
+        hours = self._completed(now)
+        written = 0
+        try:
+            for key, rows in self._rows(hours).items():
+                self.import_rows(key, rows)
+                written += len(rows)
+                for hour in hours:
+                    self._hours[hour].pop(key, None)
+        except Exception:
+            _LOGGER.exception("Writing hourly statistics for %s failed, keeping them for a retry", self.name)
+        for hour in hours:
+            if not self._hours[hour]:
+                del self._hours[hour]
+        if written:
+            _LOGGER.debug("Wrote %d hourly statistics rows for %s", written, self.name)
+        return written
+
+    @callback
+    def async_start(self) -> Callable[[], None]:
+        """Flush shortly after every full hour; returns the unsubscribe callback."""
+
+        @callback
+        def _flush(_now: datetime) -> None:
+            self.async_flush()
+
+        return async_track_utc_time_change(self.hass, _flush, minute=0, second=10)
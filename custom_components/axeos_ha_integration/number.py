@@ -11,6 +11,7 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
+from .profiles import entity_enabled
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -61,22 +62,24 @@ async def async_setup_entry(
 
     entities = []
     for key, (name, unit, data_path, min_val, max_val, step, mode, icon) in NUMBER_TYPES.items():
-        entities.append(
-            AxeOSNumberEntity(
-                coordinator,
-                api,
-                entry.entry_id,
-                key,
-                name,
-                unit,
-                data_path,
-                min_val,
-                max_val,
-                step,
-                mode,
-                icon,
-            )
+        if (enabled := entity_enabled(entry.options, "number", key)) is None:
+            continue
+        entity = AxeOSNumberEntity(
+            coordinator,
+            api,
+            entry.entry_id,
+            key,
+            name,
+            unit,
+            data_path,
+            min_val,
+            max_val,
+            step,
+            mode,
+            icon,
         )
+        entity._attr_entity_registry_enabled_default = enabled
+        entities.append(entity)
 
     async_add_entities(entities)
 
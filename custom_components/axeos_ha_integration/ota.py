@@ -0,0 +1,126 @@
+"""Rolling firmware updates across a fleet of AxeOS miners."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from .api import AxeOSAPI
+
+_LOGGER = logging.getLogger(__name__)
+
+STATUS_UPDATED = "updated"
+STATUS_SKIPPED = "skipped"
+STATUS_FAILED = "failed"
+STATUS_NOT_STARTED = "not_started"
+
+ROLLOUT_COMPLETED = "completed"
+ROLLOUT_HALTED = "halted"
+
+
+@dataclass
+class FirmwareRolloutSettings:
+    """Images, target version and pacing of a rollout."""
+
+    firmware: str
+    version: str
+    # Web UI image, uploaded before the firmware since only the latter reboots
+    www: str | None = None
+    concurrency: int = 1
+    # Miners updated (with the same concurrency) before the rest of the fleet
+    canary: int = 1
+    # Per miner, from the start of the upload until the new version answers
+    timeout: float = 600
+    poll_interval: float = 10
+
+    def __post_init__(self) -> None:
+        if self.concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        if self.canary < 0:
+            raise ValueError("canary must not be negative")
+
+
+async def async_update_miner(api: AxeOSAPI, settings: FirmwareRolloutSettings) -> dict[str, Any]:
+    """Upload the images to one miner and wait for it to come back with ``settings.version``."""
+    started = time.monotonic()
+    result: dict[str, Any] = {"host": api.host, "previous_version": None, "error": None}
+
+    def finish(status: str, error: str | None = None) -> dict[str, Any]:
+        result.update(status=status, error=error, seconds=round(time.monotonic() - started, 1))
+        return result
+
+    info = await api.get_system_info()
+    if info is None:
+        return finish(STATUS_FAILED, "unreachable before the update")
+    result["previous_version"] = info.get("version")
+    if info.get("version") == settings.version:
+        return finish(STATUS_SKIPPED)
+
+    if settings.www is not None and not await api.upload_firmware(settings.www, www=True):
+        return finish(STATUS_FAILED, "web UI upload failed")
+    if not await api.upload_firmware(settings.firmware):
+        return finish(STATUS_FAILED, "firmware upload failed")
+
+    deadline = started + settings.timeout
+    version = None
+    while time.monotonic() < deadline:
+        await asyncio.sleep(settings.poll_interval)
+        if (info := await api.get_system_info()) is None:
+            # Still rebooting
+            continue
+        if (version := info.get("version")) == settings.version:
+            _LOGGER.info("%s runs firmware %s", api.host, version)
+            return finish(STATUS_UPDATED)
+    return finish(
+        STATUS_FAILED,
+        f"still on {version} after {settings.timeout:.0f}s" if version else "did not come back",
+    )
+
+
+async def async_rollout(
+    miners: dict[str, AxeOSAPI], settings: FirmwareRolloutSettings, names: Mapping[str, str] | None = None
+) -> dict[str, Any]:
+    """Update ``miners`` (ID -> API) in order: first the canary batch, then the rest.
+
+    At most ``settings.concurrency`` miners are updated at a time. The first
+    failure halts the rollout; miners not yet started are left alone. Results
+    are keyed by the IDs and carry the display name from ``names``.
+    """
+    started = time.monotonic()
+    names = names or {}
+    keys = list(miners)
+    results: dict[str, dict[str, Any]] = {
+        key: {"name": names.get(key, key), "host": miners[key].host, "status": STATUS_NOT_STARTED}
+        for key in keys
+    }
+    batches = [keys[: settings.canary], keys[settings.canary :]]
+    halted = False
+
+    async def update(key: str, semaphore: asyncio.Semaphore) -> None:
+        nonlocal halted
+        async with semaphore:
+            if halted:
+                return
+            name = names.get(key, key)
+            _LOGGER.info("Updating %s to firmware %s", name, settings.version)
+            results[key] = result = {"name": name, **await async_update_miner(miners[key], settings)}
+            if result["status"] == STATUS_FAILED:
+                _LOGGER.error("Firmware update of %s failed (%s), halting rollout", name, result["error"])
+                halted = True
+
+    for batch in batches:
+        semaphore = asyncio.Semaphore(settings.concurrency)
+        await asyncio.gather(*(update(key, semaphore) for key in batch))
+        if halted:
+            break
+
+    return {
+        "status": ROLLOUT_HALTED if halted else ROLLOUT_COMPLETED,
+        "version": settings.version,
+        "seconds": round(time.monotonic() - started, 1),
+        "miners": results,
+    }
@@ -0,0 +1,274 @@
+"""Fleet power-budget allocator for AxeOS miners."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DOMAIN,
+    POWER_BUDGET_FREQUENCY_STEP,
+    POWER_BUDGET_INTERVAL,
+    POWER_BUDGET_STORAGE_VERSION,
+)
+from .fleet import async_get_fleet, async_get_fleet_data
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class BudgetMiner:
+    """Measured state and frequency bounds of one miner taking part in the budget."""
+
+    entry_id: str
+    asic_model: str
+    frequency: int
+    power: float
+    hashrate: float
+    voltage: int | None
+    min_frequency: int
+    max_frequency: int
+    # frequency -> (stable voltage, measured power) from the autotuner
+    profile: dict[int, tuple[int, float]] = field(default_factory=dict)
+
+    def power_at(self, frequency: int) -> float:
+        """Predict power draw at ``frequency``."""
+        if frequency in self.profile:
+            return self.profile[frequency][1]
+        return self.power * frequency / self.frequency
+
+    def frequencies(self, step: int) -> list[int]:
+        values = list(range(self.min_frequency, self.max_frequency + 1, step))
+        if values[-1] != self.max_frequency:
+            values.append(self.max_frequency)
+        return values
+
+
+def efficiency_by_model(miners: list[BudgetMiner]) -> dict[str, float]:
+    """Measured J/TH per ASIC model, aggregated over all miners of that model."""
+    totals: dict[str, list[float]] = {}
+    for miner in miners:
+        power, hashrate = totals.setdefault(miner.asic_model, [0.0, 0.0])
+        totals[miner.asic_model] = [power + miner.power, hashrate + miner.hashrate]
+    return {
+        model: power / hashrate * 1000 if hashrate else float("inf")
+        for model, (power, hashrate) in totals.items()
+    }
+
+
+def solve_power_budget(
+    miners: list[BudgetMiner], budget: float, step: int = POWER_BUDGET_FREQUENCY_STEP
+) -> tuple[dict[str, int], float]:
+    """Distribute ``budget`` watts across ``miners``.
+
+    Returns entry_id -> frequency and the watts by which the minimum
+    frequencies alone exceed the budget (0 when they fit); miners are never
+    throttled below their minimum, so such a budget cannot be met.
+
+    Every miner starts at its minimum frequency. The remaining budget is then
+    handed out to miners in order of efficiency (J/TH of their ASIC model
+    first, their own J/TH second), raising each as far as the budget allows.
+    With power roughly linear in frequency this greedy fill is optimal.
+    """
+    model_jth = efficiency_by_model(miners)
+
+    def jth(miner: BudgetMiner) -> float:
+        return miner.power / miner.hashrate * 1000 if miner.hashrate else float("inf")
+
+    targets = {m.entry_id: m.min_frequency for m in miners}
+    used = sum(m.power_at(m.min_frequency) for m in miners)
+    over_budget = max(0.0, used - budget)
+    for miner in sorted(miners, key=lambda m: (model_jth[m.asic_model], jth(m))):
+        for frequency in miner.frequencies(step):
+            extra = miner.power_at(frequency) - miner.power_at(targets[miner.entry_id])
+            if extra <= 0:
+                continue
+            if used + extra > budget:
+                break
+            targets[miner.entry_id] = frequency
+            used += extra
+    return targets, over_budget
+
+
+class AxeOSPowerBudgetController:
+    """Keeps the fleet within a total power budget by adjusting miner frequencies.
+
+    The budget is re-solved whenever it changes and every POWER_BUDGET_INTERVAL
+    seconds, so miners going offline or coming back are picked up. Only miners
+    whose target differs from their current frequency are written to.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._store = Store(hass, POWER_BUDGET_STORAGE_VERSION, f"{DOMAIN}.power_budget")
+        self._lock = asyncio.Lock()
+        self._unsub = None
+        self.config: dict[str, Any] | None = None
+        self.plan: dict[str, Any] = {}
+        self._over_budget = False
+
+    async def async_start(self) -> None:
+        """Resume a budget persisted before the last restart or unload."""
+        if self.config is None:
+            self.config = await self._store.async_load()
+        if self.config is not None:
+            self._async_start_timer()
+
+    def _async_start_timer(self) -> None:
+        if self._unsub is None:
+            self._unsub = async_track_time_interval(
+                self.hass, self._async_interval, timedelta(seconds=POWER_BUDGET_INTERVAL)
+            )
+
+    def async_stop(self) -> None:
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+    async def _async_interval(self, _now) -> None:
+        await self.async_solve()
+
+    async def async_set_budget(
+        self, budget: float, min_frequency: int, max_frequency: int | None
+    ) -> dict[str, Any]:
+        """Activate or change the budget and apply it immediately."""
+        original = self.config["original"] if self.config else {}
+        self.config = {
+            "budget": budget,
+            "min_frequency": min_frequency,
+            "max_frequency": max_frequency,
+            "original": original,
+        }
+        await self._store.async_save(self.config)
+        self._async_start_timer()
+        return await self.async_solve()
+
+    async def async_clear(self) -> None:
+        """Drop the budget and restore the frequencies miners had before it."""
+        async with self._lock:
+            if self.config is None:
+                return
+            self.async_stop()
+            original = self.config["original"]
+            self.config = None
+            self.plan = {}
+            await self._store.async_remove()
+            for entry_id, entry_data in async_get_fleet(self.hass).items():
+                frequency = original.get(entry_id)
+                current = (entry_data["coordinator"].data or {}).get("frequency")
+                if frequency is not None and frequency != current:
+                    await entry_data["api"].set_frequency(frequency)
+                    await entry_data["coordinator"].async_request_refresh()
+
+    async def async_solve(self) -> dict[str, Any]:
+        """Re-solve the allocation for the miners currently online."""
+        async with self._lock:
+            if self.config is None:
+                return {}
+            fleet = async_get_fleet(self.hass)
+            miners: list[BudgetMiner] = []
+            for entry_id, entry_data in fleet.items():
+                coordinator = entry_data["coordinator"]
+                info = coordinator.data
+                if not coordinator.last_update_success or not info or not info.get("frequency"):
+                    continue
+                original = self.config["original"].setdefault(entry_id, info["frequency"])
+                max_frequency = self.config["max_frequency"] or original
+                miners.append(
+                    BudgetMiner(
+                        entry_id=entry_id,
+                        asic_model=info.get("ASICModel") or "unknown",
+                        frequency=info["frequency"],
+                        power=info.get("power") or 0.0,
+                        hashrate=info.get("hashRate") or 0.0,
+                        voltage=info.get("coreVoltage"),
+                        min_frequency=min(self.config["min_frequency"], max_frequency),
+                        max_frequency=max_frequency,
+                        profile=_autotune_profile(entry_data.get("autotuner")),
+                    )
+                )
+            await self._store.async_save(self.config)
+
+            targets, over_budget = solve_power_budget(miners, self.config["budget"])
+            # Warn once per episode, not on every interval
+            if over_budget and not self._over_budget:
+                _LOGGER.warning(
+                    "Power budget of %s W cannot be met: the minimum frequency of %s miners alone draws %.1f W more",
+                    self.config["budget"],
+                    len(miners),
+                    over_budget,
+                )
+            self._over_budget = over_budget > 0
+            plan: dict[str, Any] = {}
+            writes = 0
+            for miner in miners:
+                target = targets[miner.entry_id]
+                entry_data = fleet[miner.entry_id]
+                if target != miner.frequency:
+                    writes += await _async_apply(entry_data["api"], miner, target)
+                    await entry_data["coordinator"].async_request_refresh()
+                # Keyed by entry ID, since names need not be unique
+                plan[miner.entry_id] = {
+                    "name": entry_data["name"],
+                    "frequency": target,
+                    "previous_frequency": miner.frequency,
+                    "predicted_power": round(miner.power_at(target), 2),
+                }
+            self.plan = {
+                "budget": self.config["budget"],
+                "predicted_power": round(
+                    sum(m.power_at(targets[m.entry_id]) for m in miners), 2
+                ),
+                "over_budget": round(over_budget, 2),
+                "writes": writes,
+                "miners": plan,
+            }
+            _LOGGER.debug("Power budget plan: %s", self.plan)
+            return self.plan
+
+
+def _autotune_profile(tuner) -> dict[int, tuple[int, float]]:
+    """Lowest stable voltage and its measured power per frequency from the last autotune."""
+    profile: dict[int, tuple[int, float]] = {}
+    if tuner is None or tuner.state is None:
+        return profile
+    for result in tuner.state["results"].values():
+        if not result["stable"]:
+            continue
+        known = profile.get(result["frequency"])
+        if known is None or result["voltage"] < known[0]:
+            profile[result["frequency"]] = (result["voltage"], result["power"])
+    return profile
+
+
+async def _async_apply(api, miner: BudgetMiner, frequency: int) -> int:
+    """Move a miner to ``frequency`` (and its autotuned voltage); returns the number of writes."""
+    voltage = miner.profile.get(frequency, (None, None))[0]
+    if voltage == miner.voltage:
+        voltage = None
+    writes = 0
+    if frequency < miner.frequency:
+        writes += await api.set_frequency(frequency)
+        if voltage is not None:
+            writes += await api.set_voltage(voltage)
+    else:
+        # Raise the voltage before clocking up
+        if voltage is not None:
+            writes += await api.set_voltage(voltage)
+        writes += await api.set_frequency(frequency)
+    return writes
+
+
+def async_get_power_budget_controller(hass: HomeAssistant) -> AxeOSPowerBudgetController:
+    """Return the fleet-wide controller, creating it on first use."""
+    fleet_data = async_get_fleet_data(hass)
+    if "power_budget" not in fleet_data:
+        fleet_data["power_budget"] = AxeOSPowerBudgetController(hass)
+    return fleet_data["power_budget"]
@@ -0,0 +1,175 @@
+"""Entity profiles: which entities a miner gets.
+
+A profile lists the entities created and enabled by default, per platform.
+Entities that are not created are never updated, so a small profile also
+cuts the per-poll fan-out on large fleets.
+
+- ``full`` creates every entity (the behaviour before profiles).
+- ``standard`` creates every entity but only enables its own set; the rest
+  can be enabled one by one in the entity settings.
+- ``minimal`` only creates its own set.
+- ``custom`` only creates the entities picked in the options flow.
+
+Entities registered under an earlier profile are brought in line on setup
+(see ``async_sync_entity_registry``). So are the sensors dropped by the
+exclude_churn_sensors option, which are removed from the registry.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Mapping
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+
+from .const import HOURLY_STATISTICS_KEYS
+
+PROFILE_MINIMAL = "minimal"
+PROFILE_STANDARD = "standard"
+PROFILE_FULL = "full"
+PROFILE_CUSTOM = "custom"
+PROFILES = (PROFILE_MINIMAL, PROFILE_STANDARD, PROFILE_FULL, PROFILE_CUSTOM)
+DEFAULT_PROFILE = PROFILE_FULL
+
+PLATFORM_KEYS = ("sensor", "binary_sensor", "number", "switch", "button")
+
+# Entities outside the *_TYPES tables: the energy sensor, the per-chip sensors
+# (one switch for all of them) and the restart button
+ENERGY_KEY = "energy"
+ASIC_KEY = "asic"
+RESTART_KEY = "restart"
+
+# Entry data key of the profile the entity registry was last synced with
+APPLIED_PROFILE = "applied_entity_profile"
+
+_ASIC_UNIQUE_ID = re.compile(r"asic\d+_\w+")
+
+_MINIMAL: dict[str, tuple[str, ...]] = {
+    "sensor": (
+        "hashRate",
+        "hashRate_1h",
+        "power",
+        ENERGY_KEY,
+        "temp",
+        "vrTemp",
+        "fanspeed",
+        "sharesAccepted",
+        "sharesRejected",
+        "bestDiff",
+        "uptimeSeconds",
+    ),
+    "binary_sensor": ("overheat_mode",),
+    "number": (),
+    "switch": (),
+    "button": (RESTART_KEY,),
+}
+
+PROFILE_ENTITIES: dict[str, dict[str, tuple[str, ...]]] = {
+    PROFILE_MINIMAL: _MINIMAL,
+    PROFILE_STANDARD: {
+        "sensor": _MINIMAL["sensor"]
+        + (
+            "voltage",
+            "current",
+            "hashRate_1m",
+            "hashRate_10m",
+            "hashRate_1d",
+            "expectedHashrate",
+            "bestSessionDiff",
+            "poolDifficulty",
+            "coreVoltageActual",
+            "frequency",
+            "fanrpm",
+            "wifiRSSI",
+            "freeHeap",
+            "heap_hours_to_exhaustion",
+            "stratumURL",
+            "version",
+            ASIC_KEY,
+        ),
+        "binary_sensor": _MINIMAL["binary_sensor"]
+        + (
+            "isUsingFallbackStratum",
+            "anomaly_hashrate",
+            "anomaly_vr_temp",
+            "anomaly_rejects",
+            "watchdog_stalled",
+            "fan_control_active",
+        ),
+        "number": ("fanspeed", "frequency", "coreVoltage"),
+        "switch": ("autofanspeed",),
+        "button": (RESTART_KEY,),
+    },
+}
+
+
+def entity_enabled(options: Mapping[str, Any], platform: str, key: str) -> bool | None:
+    """Whether an entity is created enabled (True), created disabled (False) or not created (None)."""
+    profile = options.get("entity_profile", DEFAULT_PROFILE)
+    if profile == PROFILE_CUSTOM:
+        selected = options.get("custom_entities", {}).get(platform)
+        # Nothing picked for this platform yet: keep everything
+        if selected is None or key in selected:
+            return True
+        return None
+    if profile not in PROFILE_ENTITIES:
+        return True
+    if key in PROFILE_ENTITIES[profile][platform]:
+        return True
+    return False if profile == PROFILE_STANDARD else None
+
+
+def churn_sensors_excluded(options: Mapping[str, Any]) -> bool:
+    """Whether the hourly statistics replace the HOURLY_STATISTICS_KEYS sensors."""
+    return bool(options.get("hourly_statistics", False) and options.get("exclude_churn_sensors", False))
+
+
+def entity_key(platform: str, unique_id: str, entry_id: str, host_id: str) -> str | None:
+    """Profile key of a registered entity, from its unique ID (None if unknown)."""
+    prefix = f"{entry_id if platform == 'number' else host_id}_"
+    if not unique_id.startswith(prefix):
+        return None
+    key = unique_id[len(prefix):]
+    if platform == "button":
+        return RESTART_KEY if key == "restart_button" else None
+    if platform == "sensor" and _ASIC_UNIQUE_ID.fullmatch(key):
+        return ASIC_KEY
+    return key
+
+
+@callback
+def async_sync_entity_registry(hass: HomeAssistant, entry: ConfigEntry, host_id: str) -> None:
+    """Enable and disable registered entities to match the current profile.
+
+    Entities the profile leaves out are disabled by the integration instead of
+    removed, so their names and settings are back when a later profile
+    includes them again. Entities the profile creates disabled are only
+    disabled when the profile changed; the ones enabled by hand stay enabled.
+    Entities disabled by the user are never touched.
+
+    Sensors replaced by the hourly statistics (``churn_sensors_excluded``)
+    are removed instead: their history lives on in the external statistics.
+    """
+    registry = er.async_get(hass)
+    profile = entry.options.get("entity_profile", DEFAULT_PROFILE)
+    changed = entry.data.get(APPLIED_PROFILE, DEFAULT_PROFILE) != profile
+    exclude_churn = churn_sensors_excluded(entry.options)
+    for entity in er.async_entries_for_config_entry(registry, entry.entry_id):
+        if entity.domain not in PLATFORM_KEYS:
+            continue
+        if (key := entity_key(entity.domain, entity.unique_id, entry.entry_id, host_id)) is None:
+            continue
+        if exclude_churn and entity.domain == "sensor" and key in HOURLY_STATISTICS_KEYS:
+            registry.async_remove(entity.entity_id)
+            continue
+        enabled = entity_enabled(entry.options, entity.domain, key)
+        if enabled:
+            if entity.disabled_by is er.RegistryEntryDisabler.INTEGRATION:
+                registry.async_update_entity(entity.entity_id, disabled_by=None)
+        elif entity.disabled_by is None and (enabled is None or changed):
+            registry.async_update_entity(entity.entity_id, disabled_by=er.RegistryEntryDisabler.INTEGRATION)
+    if changed:
+        hass.config_entries.async_update_entry(entry, data={**entry.data, APPLIED_PROFILE: profile})
@@ -0,0 +1,138 @@
+"""Staggered restarts of many miners, wave by wave.
+
+Restarting a whole rack at once draws an inrush current and makes every miner
+reconnect to the pool at the same moment. A rolling restart restarts a few
+miners at a time and only moves on once they hash again.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from .api import AxeOSAPI
+from .ota import ROLLOUT_COMPLETED, ROLLOUT_HALTED, STATUS_FAILED, STATUS_NOT_STARTED
+
+_LOGGER = logging.getLogger(__name__)
+
+STATUS_RECOVERED = "recovered"
+
+
+@dataclass
+class RollingRestartSettings:
+    """Wave layout and recovery criteria of a rolling restart."""
+
+    wave_size: int = 1
+    # Pause after a wave has recovered, before the next one is restarted
+    wave_spacing: float = 30
+    # Fraction of the pre-restart hashrate that counts as recovered
+    recovery_ratio: float = 0.9
+    # Per miner, from the restart until the hashrate has recovered
+    timeout: float = 600
+    poll_interval: float = 10
+
+    def __post_init__(self) -> None:
+        if self.wave_size < 1:
+            raise ValueError("wave_size must be at least 1")
+        if not 0 <= self.recovery_ratio <= 1:
+            raise ValueError("recovery_ratio must be between 0 and 1")
+
+
+async def async_restart_and_recover(api: AxeOSAPI, settings: RollingRestartSettings) -> dict[str, Any]:
+    """Restart one miner and wait until it rebooted and its hashrate recovered.
+
+    The reboot is detected by ``uptimeSeconds`` dropping below its value
+    before the restart; recovery by ``hashRate`` reaching ``recovery_ratio``
+    of its value before the restart.
+    """
+    result: dict[str, Any] = {
+        "host": api.host,
+        "reboot_seconds": None,
+        "recovery_seconds": None,
+        "error": None,
+    }
+    started = time.monotonic()
+
+    def finish(status: str, error: str | None = None) -> dict[str, Any]:
+        result.update(status=status, error=error, seconds=round(time.monotonic() - started, 1))
+        return result
+
+    info = await api.get_system_info()
+    if info is None:
+        return finish(STATUS_FAILED, "unreachable before the restart")
+    uptime_before = info.get("uptimeSeconds") or 0
+    target = (info.get("hashRate") or 0) * settings.recovery_ratio
+    result["hashrate_before"] = info.get("hashRate")
+
+    restarted = time.monotonic()
+    if not await api.restart_system():
+        return finish(STATUS_FAILED, "restart request failed")
+
+    deadline = restarted + settings.timeout
+    while time.monotonic() < deadline:
+        await asyncio.sleep(settings.poll_interval)
+        if (info := await api.get_system_info()) is None:
+            continue
+        if result["reboot_seconds"] is None:
+            if (info.get("uptimeSeconds") or 0) >= uptime_before:
+                continue
+            result["reboot_seconds"] = round(time.monotonic() - restarted, 1)
+        if (info.get("hashRate") or 0) >= target:
+            result["recovery_seconds"] = round(time.monotonic() - restarted, 1)
+            return finish(STATUS_RECOVERED)
+    return finish(
+        STATUS_FAILED,
+        "hashrate did not recover" if result["reboot_seconds"] is not None else "did not reboot",
+    )
+
+
+async def async_rolling_restart(
+    miners: dict[str, AxeOSAPI], settings: RollingRestartSettings, names: Mapping[str, str] | None = None
+) -> dict[str, Any]:
+    """Restart ``miners`` (ID -> API) in waves of ``wave_size``.
+
+    A wave starts ``wave_spacing`` seconds after the previous one recovered.
+    A miner that fails to reboot or recover halts the restart after its wave.
+    Results are keyed by the IDs and carry the display name from ``names``.
+    """
+    started = time.monotonic()
+    names = names or {}
+    keys = list(miners)
+    results: dict[str, dict[str, Any]] = {
+        key: {"name": names.get(key, key), "host": miners[key].host, "status": STATUS_NOT_STARTED}
+        for key in keys
+    }
+    waves = [keys[index : index + settings.wave_size] for index in range(0, len(keys), settings.wave_size)]
+    halted = False
+
+    for number, wave in enumerate(waves):
+        if number:
+            await asyncio.sleep(settings.wave_spacing)
+        wave_names = [names.get(key, key) for key in wave]
+        _LOGGER.info("Restarting wave %d/%d: %s", number + 1, len(waves), ", ".join(wave_names))
+        wave_results = await asyncio.gather(
+            *(async_restart_and_recover(miners[key], settings) for key in wave)
+        )
+        results.update(
+            (key, {"name": name, **result}) for key, name, result in zip(wave, wave_names, wave_results)
+        )
+        failed = [name for name, result in zip(wave_names, wave_results) if result["status"] == STATUS_FAILED]
+        if failed:
+            _LOGGER.error("Rolling restart halted, %s did not recover", ", ".join(failed))
+            halted = True
+            break
+
+    recovery = [
+        result["recovery_seconds"] for result in results.values() if result.get("recovery_seconds") is not None
+    ]
+    return {
+        "status": ROLLOUT_HALTED if halted else ROLLOUT_COMPLETED,
+        "seconds": round(time.monotonic() - started, 1),
+        "waves": len(waves),
+        "max_recovery_seconds": max(recovery, default=None),
+        "miners": results,
+    }
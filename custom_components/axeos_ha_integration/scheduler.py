@@ -0,0 +1,84 @@
+"""Per-miner request scheduling.
+
+The ESP32 web server in a BitAxe only handles a handful of sockets, so all
+requests to one miner go through a RequestScheduler that limits how many are
+in flight and hands free slots to control writes before polls.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+PRIORITY_WRITE = 0
+PRIORITY_POLL = 1
+
+
+class RequestScheduler:
+    """Priority queue in front of a miner's HTTP server.
+
+    Waiting requests are granted a slot by priority (lower first) and then in
+    arrival order. Queue depth and waiting time are recorded in ``stats``.
+    """
+
+    def __init__(self, max_in_flight: int = 1, stats: dict[str, Any] | None = None) -> None:
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+        self._queue: list[tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self.stats = stats if stats is not None else {}
+        self.stats.update(
+            {
+                "queue_depth": 0,
+                "queue_wait_seconds_total": 0.0,
+                "last_queue_wait_seconds": None,
+                "max_queue_wait_seconds": 0.0,
+            }
+        )
+
+    @asynccontextmanager
+    async def slot(self, priority: int) -> AsyncIterator[None]:
+        """Hold one in-flight slot for the duration of the block."""
+        queued = time.monotonic()
+        if self.in_flight < self.max_in_flight and not self._queue:
+            self.in_flight += 1
+        else:
+            waiter = asyncio.get_running_loop().create_future()
+            heapq.heappush(self._queue, (priority, next(self._sequence), waiter))
+            self.stats["queue_depth"] += 1
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    # The slot was handed over just before the cancellation
+                    self._release()
+                else:
+                    self.stats["queue_depth"] -= 1
+                raise
+        self._record_wait(time.monotonic() - queued)
+        try:
+            yield
+        finally:
+            self._release()
+
+    def _record_wait(self, wait: float) -> None:
+        stats = self.stats
+        stats["queue_wait_seconds_total"] += wait
+        stats["last_queue_wait_seconds"] = wait
+        stats["max_queue_wait_seconds"] = max(stats["max_queue_wait_seconds"], wait)
+
+    def _release(self) -> None:
+        # Hand the slot straight to the next live waiter instead of freeing it,
+        # so a request arriving meanwhile cannot jump the queue
+        while self._queue:
+            _priority, _sequence, waiter = heapq.heappop(self._queue)
+            if not waiter.done():
+                self.stats["queue_depth"] -= 1
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
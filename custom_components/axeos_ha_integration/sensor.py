@@ -4,20 +4,28 @@
 from __future__ import annotations
 
 import logging
+import time
 from typing import Any
 
 from homeassistant.components.sensor import (
+    RestoreSensor,
     SensorEntity,
     SensorDeviceClass,
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import EntityCategory
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EntityCategory, UnitOfEnergy
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
+from .const import (
+    DOMAIN,
+    DEFAULT_MAX_PUBLISH_INTERVAL,
+    DEFAULT_MIN_PUBLISH_INTERVAL,
+    HOURLY_STATISTICS_KEYS,
+)
+from .profiles import ASIC_KEY, ENERGY_KEY, churn_sensors_excluded, entity_enabled
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -97,6 +105,9 @@ SENSOR_TYPES: dict[str, tuple[str, str | None, list[str], SensorDeviceClass | No
     "runningPartition": ("Running Partition", None, ["runningPartition"], None, None, EntityCategory.DIAGNOSTIC),
     "defaultTheme": ("Default Theme", None, ["defaultTheme"], None, None, EntityCategory.DIAGNOSTIC),
     "freeHeapInt": ("Free Heap (Internal)", "B", ["freeHeapInt"], SensorDeviceClass.DATA_SIZE, SensorStateClass.MEASUREMENT, EntityCategory.DIAGNOSTIC),
+    # Free heap trend (computed by the integration, see heap.py)
+    "heap_hours_to_exhaustion": ("Heap Exhaustion Forecast", "h", ["heap", "hours_to_exhaustion"], SensorDeviceClass.DURATION, SensorStateClass.MEASUREMENT, EntityCategory.DIAGNOSTIC),
+    "heap_leak_rate": ("Heap Leak Rate", "B/h", ["heap", "leak_rate"], None, SensorStateClass.MEASUREMENT, EntityCategory.DIAGNOSTIC),
     # PID Controller values
     "pidP": ("PID P Value", None, ["pidP"], None, None, EntityCategory.DIAGNOSTIC),
     "pidI": ("PID I Value", None, ["pidI"], None, None, EntityCategory.DIAGNOSTIC),
@@ -109,6 +120,80 @@ SENSOR_TYPES: dict[str, tuple[str, str | None, list[str], SensorDeviceClass | No
     "stratum_poolDifficulty": ("Stratum Pool Difficulty", None, ["stratum", "poolDifficulty"], None, None, EntityCategory.DIAGNOSTIC),
 }
 
+# -------------------------------------------------------------------------
+# ASIC_SENSOR_TYPES: per-chip sensors of multi-ASIC boards (see asic.py),
+# created for every chip and metric the firmware reports
+# key: normalized metric
+# value: Tuple (name suffix, unit, device_class, state_class, entity_category)
+# -------------------------------------------------------------------------
+ASIC_SENSOR_TYPES: dict[str, tuple] = {
+    "hashrate": ("Hashrate", "GH/s", None, SensorStateClass.MEASUREMENT, None),
+    "temp": ("Temperature", "°C", SensorDeviceClass.TEMPERATURE, SensorStateClass.MEASUREMENT, None),
+    "frequency": ("Frequency", "MHz", SensorDeviceClass.FREQUENCY, SensorStateClass.MEASUREMENT, EntityCategory.DIAGNOSTIC),
+    "errors": ("Errors", None, None, SensorStateClass.TOTAL_INCREASING, EntityCategory.DIAGNOSTIC),
+}
+
+# -------------------------------------------------------------------------
+# DEADBAND_TYPES: default significant-change thresholds for jittery sensors
+# key: SENSOR_TYPES key
+# value: Tuple (absolute deadband in the sensor's unit, relative deadband as a fraction)
+# Overridable per sensor in the options flow; sensors not listed publish every change.
+# -------------------------------------------------------------------------
+DEADBAND_TYPES: dict[str, tuple[float, float]] = {
+    "power": (0.1, 0.01),
+    "voltage": (10.0, 0.0),
+    "current": (10.0, 0.01),
+    "temp": (0.5, 0.0),
+    "vrTemp": (0.5, 0.0),
+    "coreVoltageActual": (5.0, 0.0),
+}
+
+
+class SignificantChangeFilter:
+    """Decides whether a new sensor value is worth a state write.
+
+    A value is published when it moves more than ``max(absolute, relative * |last|)``
+    away from the last published value, but not more often than every
+    ``min_interval`` seconds. A heartbeat publishes sub-deadband movement at
+    least every ``max_interval`` seconds so the state never goes stale.
+    """
+
+    __slots__ = ("absolute", "relative", "min_interval", "max_interval", "_last_value", "_last_time")
+
+    def __init__(
+        self,
+        absolute: float = 0.0,
+        relative: float = 0.0,
+        min_interval: float = DEFAULT_MIN_PUBLISH_INTERVAL,
+        max_interval: float = DEFAULT_MAX_PUBLISH_INTERVAL,
+    ) -> None:
+        self.absolute = absolute
+        self.relative = relative
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self._last_value: Any = None
+        self._last_time: float | None = None
+
+    def should_publish(self, value: Any, now: float) -> bool:
+        if self._last_time is None or (value is None) != (self._last_value is None):
+            return True
+        if value == self._last_value:
+            return False
+        elapsed = now - self._last_time
+        if elapsed < self.min_interval:
+            return False
+        if self.max_interval and elapsed >= self.max_interval:
+            return True
+        if isinstance(value, (int, float)) and isinstance(self._last_value, (int, float)):
+            threshold = max(self.absolute, self.relative * abs(self._last_value))
+            return abs(value - self._last_value) > threshold
+        return True
+
+    def published(self, value: Any, now: float) -> None:
+        self._last_value = value
+        self._last_time = now
+
+
 def get_value(data: dict, keys: list[str]) -> Any:
     """Get value from data dict, supporting nested keys.
     
@@ -147,29 +232,77 @@ async def async_setup_entry(
     
     # Get options
     hide_temp_sensors = entry.options.get("hide_temperature_sensors", False)
+    # Hourly external statistics replace the state history of these sensors
+    exclude_churn_sensors = churn_sensors_excluded(entry.options)
+    change_filter = entry.options.get("significant_change_filter", False)
+    min_interval = entry.options.get("min_publish_interval", DEFAULT_MIN_PUBLISH_INTERVAL)
+    max_interval = entry.options.get("max_publish_interval", DEFAULT_MAX_PUBLISH_INTERVAL)
+    deadbands = {**DEADBAND_TYPES, **entry.options.get("deadbands", {})}
 
     entities: list[SensorEntity] = []
     for key, (suffix, unit, path, device_class, state_class, entity_category) in SENSOR_TYPES.items():
         # Skip temperature sensors if option is enabled
         if hide_temp_sensors and key in ["temp", "vrTemp", "temptarget"]:
             continue
-            
+        if exclude_churn_sensors and key in HOURLY_STATISTICS_KEYS:
+            continue
+        if (enabled := entity_enabled(entry.options, "sensor", key)) is None:
+            continue
+
         name = suffix
         unique_id = f"{host_id}_{key}"
-        entities.append(
-            AxeOSHASensor(
-                coordinator, entry.entry_id, name, unique_id, unit, path, key,
-                device_class, state_class, entity_category
-            )
+        publish_filter = None
+        if change_filter:
+            absolute, relative = deadbands.get(key, (0.0, 0.0))
+            publish_filter = SignificantChangeFilter(absolute, relative, min_interval, max_interval)
+        sensor = AxeOSHASensor(
+            coordinator, entry.entry_id, name, unique_id, unit, path, key,
+            device_class, state_class, entity_category, publish_filter
         )
+        sensor._attr_entity_registry_enabled_default = enabled
+        entities.append(sensor)
+
+    # Energy integrated from the power readings (see energy.py)
+    energy_meter = hass.data[DOMAIN][entry.entry_id].get("energy_meter")
+    enabled = entity_enabled(entry.options, "sensor", ENERGY_KEY)
+    if energy_meter is not None and enabled is not None and "power" in (coordinator.data or {}):
+        sensor = AxeOSEnergySensor(coordinator, entry.entry_id, host_id, energy_meter)
+        sensor._attr_entity_registry_enabled_default = enabled
+        entities.append(sensor)
 
     async_add_entities(entities)
 
+    # Per-chip sensors appear as the slower ASIC reader reports the chips
+    asic_coordinator = hass.data[DOMAIN][entry.entry_id].get("asic_coordinator")
+    asic_enabled = entity_enabled(entry.options, "sensor", ASIC_KEY)
+    if asic_coordinator is None or asic_enabled is None:
+        return
+    added: set[tuple[int, str]] = set()
+
+    @callback
+    def _async_add_asic_sensors() -> None:
+        new_entities = []
+        for index, chip in enumerate(asic_coordinator.data or []):
+            for metric in chip:
+                if metric not in ASIC_SENSOR_TYPES or (index, metric) in added:
+                    continue
+                if hide_temp_sensors and metric == "temp":
+                    continue
+                added.add((index, metric))
+                sensor = AxeOSAsicSensor(asic_coordinator, entry.entry_id, host_id, index, metric)
+                sensor._attr_entity_registry_enabled_default = asic_enabled
+                new_entities.append(sensor)
+        if new_entities:
+            async_add_entities(new_entities)
+
+    _async_add_asic_sensors()
+    entry.async_on_unload(asic_coordinator.async_add_listener(_async_add_asic_sensors))
+
 class AxeOSHASensor(CoordinatorEntity, SensorEntity):
     """Generic sensor entity for an AxeOS-HA value."""
 
     _attr_has_entity_name = True
-    entity_registry_enabled_default = True  # jetzt ab Werk aktiviert
+    _attr_entity_registry_enabled_default = True  # jetzt ab Werk aktiviert
 
     def __init__(
         self,
@@ -183,6 +316,7 @@ class AxeOSHASensor(CoordinatorEntity, SensorEntity):
         device_class: SensorDeviceClass | None = None,
         state_class: SensorStateClass | None = None,
         entity_category: EntityCategory | None = None,
+        publish_filter: SignificantChangeFilter | None = None,
     ) -> None:
         super().__init__(coordinator)
         self.entry_id = entry_id
@@ -195,6 +329,8 @@ class AxeOSHASensor(CoordinatorEntity, SensorEntity):
         self.data_keys = data_keys
         self.sensor_key = sensor_key or (unique_id.split("_")[-1] if "_" in unique_id else unique_id)
         self._state = None
+        self._publish_filter = publish_filter
+        self._last_available: bool | None = None
         
         # Set suggested display precision for specific sensors
         if sensor_key in ["hashRate", "expectedHashrate"]:
@@ -219,7 +355,15 @@ class AxeOSHASensor(CoordinatorEntity, SensorEntity):
         return get_value(self.coordinator.data, self.data_keys)
 
     def _handle_coordinator_update(self) -> None:
-        self._state = self._get_value_from_data()
+        value = self._get_value_from_data()
+        if self._publish_filter is not None:
+            now = time.monotonic()
+            available = self.coordinator.last_update_success
+            if available == self._last_available and not self._publish_filter.should_publish(value, now):
+                return
+            self._last_available = available
+            self._publish_filter.published(value, now)
+        self._state = value
         self.async_write_ha_state()
 
     async def async_added_to_hass(self) -> None:
@@ -279,3 +423,78 @@ class AxeOSHASensor(CoordinatorEntity, SensorEntity):
             "model": self.coordinator.data.get("boardVersion", "BitAxe Miner"),
             "sw_version": self.coordinator.data.get("version", ""),
         }
+
+
+class AxeOSEnergySensor(CoordinatorEntity, RestoreSensor):
+    """Energy consumed by the miner, for the Energy dashboard."""
+
+    _attr_has_entity_name = True
+    _attr_name = "Energy"
+    _attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
+    _attr_device_class = SensorDeviceClass.ENERGY
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_suggested_display_precision = 3
+    _attr_icon = "mdi:lightning-bolt"
+
+    def __init__(self, coordinator, entry_id: str, host_id: str, meter) -> None:
+        super().__init__(coordinator)
+        self.entry_id = entry_id
+        self.meter = meter
+        self._attr_unique_id = f"{host_id}_energy"
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        if (last := await self.async_get_last_sensor_data()) is not None and last.native_value is not None:
+            try:
+                self.meter.restore(float(last.native_value))
+            except (TypeError, ValueError):
+                _LOGGER.warning("Ignoring invalid stored energy total %s", last.native_value)
+        self.async_write_ha_state()
+
+    @property
+    def native_value(self):
+        return round(self.meter.kwh, 4)
+
+    @property
+    def available(self) -> bool:
+        # The total stays valid while the miner is offline
+        return True
+
+    @property
+    def device_info(self):
+        return {"identifiers": {(DOMAIN, self.entry_id)}}
+
+
+class AxeOSAsicSensor(CoordinatorEntity, SensorEntity):
+    """One metric of one ASIC chip, read from the per-chip coordinator."""
+
+    _attr_has_entity_name = True
+
+    def __init__(self, coordinator, entry_id: str, host_id: str, index: int, metric: str) -> None:
+        super().__init__(coordinator)
+        name, unit, device_class, state_class, entity_category = ASIC_SENSOR_TYPES[metric]
+        self.entry_id = entry_id
+        self.index = index
+        self.metric = metric
+        self._attr_name = f"ASIC {index + 1} {name}"
+        self._attr_unique_id = f"{host_id}_asic{index}_{metric}"
+        self._attr_native_unit_of_measurement = unit
+        self._attr_device_class = device_class
+        self._attr_state_class = state_class
+        self._attr_entity_category = entity_category
+        self._attr_icon = "mdi:chip"
+
+    @property
+    def native_value(self):
+        chips = self.coordinator.data or []
+        if self.index >= len(chips):
+            return None
+        return chips[self.index].get(self.metric)
+
+    @property
+    def available(self) -> bool:
+        return super().available and self.native_value is not None
+
+    @property
+    def device_info(self):
+        return {"identifiers": {(DOMAIN, self.entry_id)}}
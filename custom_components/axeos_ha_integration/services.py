@@ -5,13 +5,18 @@ from __future__ import annotations
 import logging
 
 import voluptuous as vol
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers import entity_registry as er
 
 from .api import AxeOSAPI
-from .const import DOMAIN
+from .autotune import AutotuneSettings
+from .const import DEFAULT_POWER_BUDGET_MIN_FREQUENCY, DOMAIN
+from .fleet import async_get_fleet, async_get_fleet_data, async_get_fleet_snapshot
+from .ota import FirmwareRolloutSettings, async_rollout
+from .rolling_restart import RollingRestartSettings, async_rolling_restart
+from .power_budget import async_get_power_budget_controller
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -19,6 +24,14 @@ SERVICE_RESTART = "restart_miner"
 SERVICE_SET_FREQUENCY = "set_frequency"
 SERVICE_SET_VOLTAGE = "set_voltage"
 SERVICE_SET_FANSPEED = "set_fanspeed"
+SERVICE_START_AUTOTUNE = "start_autotune"
+SERVICE_STOP_AUTOTUNE = "stop_autotune"
+SERVICE_GET_AUTOTUNE_REPORT = "get_autotune_report"
+SERVICE_SET_POWER_BUDGET = "set_power_budget"
+SERVICE_CLEAR_POWER_BUDGET = "clear_power_budget"
+SERVICE_GET_FLEET_SNAPSHOT = "get_fleet_snapshot"
+SERVICE_UPDATE_FIRMWARE = "update_firmware"
+SERVICE_ROLLING_RESTART = "rolling_restart"
 
 SERVICE_RESTART_SCHEMA = vol.Schema(
     {
@@ -47,9 +60,72 @@ SERVICE_SET_FANSPEED_SCHEMA = vol.Schema(
     }
 )
 
+SERVICE_START_AUTOTUNE_SCHEMA = vol.Schema(
+    {
+        vol.Required("entity_id"): cv.entity_id,
+        vol.Optional("min_frequency"): vol.All(vol.Coerce(int), vol.Range(min=200, max=600)),
+        vol.Optional("max_frequency"): vol.All(vol.Coerce(int), vol.Range(min=200, max=600)),
+        vol.Optional("frequency_step"): vol.All(vol.Coerce(int), vol.Range(min=5, max=100)),
+        vol.Optional("min_voltage"): vol.All(vol.Coerce(int), vol.Range(min=1000, max=1400)),
+        vol.Optional("max_voltage"): vol.All(vol.Coerce(int), vol.Range(min=1000, max=1400)),
+        vol.Optional("voltage_step"): vol.All(vol.Coerce(int), vol.Range(min=5, max=100)),
+        vol.Optional("settle_time"): vol.All(vol.Coerce(float), vol.Range(min=0, max=3600)),
+        vol.Optional("measure_time"): vol.All(vol.Coerce(float), vol.Range(min=0, max=3600)),
+        vol.Optional("max_temp"): vol.All(vol.Coerce(float), vol.Range(min=30, max=90)),
+        vol.Optional("max_vr_temp"): vol.All(vol.Coerce(float), vol.Range(min=30, max=110)),
+        vol.Optional("resume", default=True): cv.boolean,
+    }
+)
 
-def _resolve_api_for_entity(hass: HomeAssistant, entity_id: str) -> tuple[str, AxeOSAPI]:
-    """Resolve config entry + API client for a given entity_id."""
+SERVICE_AUTOTUNE_ENTITY_SCHEMA = vol.Schema(
+    {
+        vol.Required("entity_id"): cv.entity_id,
+    }
+)
+
+SERVICE_SET_POWER_BUDGET_SCHEMA = vol.Schema(
+    {
+        vol.Required("budget"): vol.All(vol.Coerce(float), vol.Range(min=1)),
+        vol.Optional(
+            "min_frequency", default=DEFAULT_POWER_BUDGET_MIN_FREQUENCY
+        ): vol.All(vol.Coerce(int), vol.Range(min=200, max=600)),
+        vol.Optional("max_frequency"): vol.All(vol.Coerce(int), vol.Range(min=200, max=600)),
+    }
+)
+
+SERVICE_GET_FLEET_SNAPSHOT_SCHEMA = vol.Schema(
+    {
+        vol.Optional("entity_id"): cv.entity_ids,
+        vol.Optional("fields"): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional("available_only", default=False): cv.boolean,
+    }
+)
+
+SERVICE_UPDATE_FIRMWARE_SCHEMA = vol.Schema(
+    {
+        vol.Optional("entity_id"): cv.entity_ids,
+        vol.Required("firmware"): cv.string,
+        vol.Optional("www"): cv.string,
+        vol.Required("version"): cv.string,
+        vol.Optional("concurrency", default=1): vol.All(vol.Coerce(int), vol.Range(min=1, max=50)),
+        vol.Optional("canary", default=1): vol.All(vol.Coerce(int), vol.Range(min=0, max=50)),
+        vol.Optional("timeout", default=600): vol.All(vol.Coerce(float), vol.Range(min=30, max=3600)),
+    }
+)
+
+SERVICE_ROLLING_RESTART_SCHEMA = vol.Schema(
+    {
+        vol.Optional("entity_id"): cv.entity_ids,
+        vol.Optional("wave_size", default=1): vol.All(vol.Coerce(int), vol.Range(min=1, max=50)),
+        vol.Optional("wave_spacing", default=30): vol.All(vol.Coerce(float), vol.Range(min=0, max=3600)),
+        vol.Optional("recovery_ratio", default=0.9): vol.All(vol.Coerce(float), vol.Range(min=0, max=1)),
+        vol.Optional("timeout", default=600): vol.All(vol.Coerce(float), vol.Range(min=30, max=3600)),
+    }
+)
+
+
+def _resolve_entry_data_for_entity(hass: HomeAssistant, entity_id: str) -> tuple[str, dict]:
+    """Resolve config entry id + integration data for a given entity_id."""
     entity_registry = er.async_get(hass)
     entity_entry = entity_registry.async_get(entity_id)
 
@@ -66,6 +142,13 @@ def _resolve_api_for_entity(hass: HomeAssistant, entity_id: str) -> tuple[str, A
             f"No integration data found for entity '{entity_id}' (entry: {entry_id})"
         )
 
+    return entry_id, entry_data
+
+
+def _resolve_api_for_entity(hass: HomeAssistant, entity_id: str) -> tuple[str, AxeOSAPI]:
+    """Resolve config entry + API client for a given entity_id."""
+    entry_id, entry_data = _resolve_entry_data_for_entity(hass, entity_id)
+
     api = entry_data.get("api")
     if not api:
         raise HomeAssistantError(f"No API client available for entity '{entity_id}'")
@@ -73,6 +156,26 @@ def _resolve_api_for_entity(hass: HomeAssistant, entity_id: str) -> tuple[str, A
     return entry_id, api
 
 
+def _resolve_fleet_apis(
+    hass: HomeAssistant, entity_ids: list[str] | None
+) -> tuple[dict[str, AxeOSAPI], dict[str, str]]:
+    """Entry ID -> API client and entry ID -> name for the miners of ``entity_ids`` (in order), or all miners.
+
+    Keyed by entry ID, since names need not be unique.
+    """
+    fleet = async_get_fleet(hass)
+    if entity_ids is None:
+        entry_ids = list(fleet)
+    else:
+        entry_ids = list(
+            dict.fromkeys(_resolve_entry_data_for_entity(hass, entity_id)[0] for entity_id in entity_ids)
+        )
+    return (
+        {entry_id: fleet[entry_id]["api"] for entry_id in entry_ids},
+        {entry_id: fleet[entry_id]["name"] for entry_id in entry_ids},
+    )
+
+
 async def async_setup_services(hass: HomeAssistant) -> None:
     """Set up services for AxeOS integration."""
     if hass.services.has_service(DOMAIN, SERVICE_RESTART):
@@ -142,6 +245,120 @@ async def async_setup_services(hass: HomeAssistant) -> None:
                 f"Setting fan speed to {fanspeed}% failed for '{entity_id}'"
             )
 
+    async def handle_start_autotune(call: ServiceCall) -> None:
+        """Handle the start_autotune service call."""
+        entity_id = call.data["entity_id"]
+        entry_id, entry_data = _resolve_entry_data_for_entity(hass, entity_id)
+        tuner = entry_data["autotuner"]
+
+        if tuner.running:
+            raise HomeAssistantError(f"Autotune is already running for '{entity_id}'")
+        try:
+            settings = AutotuneSettings(
+                **{
+                    key: value
+                    for key, value in call.data.items()
+                    if key not in ("entity_id", "resume")
+                }
+            )
+        except ValueError as err:
+            raise HomeAssistantError(f"Invalid autotune settings: {err}") from err
+
+        _LOGGER.info("Starting autotune for %s (entry: %s)", entity_id, entry_id)
+        entry = hass.config_entries.async_get_entry(entry_id)
+        tuner.task = entry.async_create_background_task(
+            hass,
+            tuner.async_run(settings, resume=call.data["resume"]),
+            f"{DOMAIN}_autotune_{entry_id}",
+        )
+
+    async def handle_stop_autotune(call: ServiceCall) -> None:
+        """Handle the stop_autotune service call."""
+        entity_id = call.data["entity_id"]
+        entry_id, entry_data = _resolve_entry_data_for_entity(hass, entity_id)
+        tuner = entry_data["autotuner"]
+
+        if not tuner.running:
+            raise HomeAssistantError(f"No autotune is running for '{entity_id}'")
+        _LOGGER.info("Stopping autotune for %s (entry: %s)", entity_id, entry_id)
+        await tuner.async_stop()
+
+    async def handle_get_autotune_report(call: ServiceCall) -> ServiceResponse:
+        """Handle the get_autotune_report service call."""
+        entity_id = call.data["entity_id"]
+        _, entry_data = _resolve_entry_data_for_entity(hass, entity_id)
+        tuner = entry_data["autotuner"]
+
+        await tuner.async_load()
+        return tuner.report()
+
+    async def handle_set_power_budget(call: ServiceCall) -> ServiceResponse:
+        """Handle the set_power_budget service call."""
+        budget = call.data["budget"]
+        min_frequency = call.data["min_frequency"]
+        max_frequency = call.data.get("max_frequency")
+        if max_frequency is not None and max_frequency < min_frequency:
+            raise HomeAssistantError("max_frequency must not be below min_frequency")
+
+        _LOGGER.info("Setting fleet power budget to %s W", budget)
+        controller = async_get_power_budget_controller(hass)
+        return await controller.async_set_budget(budget, min_frequency, max_frequency)
+
+    async def handle_clear_power_budget(call: ServiceCall) -> None:
+        """Handle the clear_power_budget service call."""
+        _LOGGER.info("Clearing fleet power budget")
+        await async_get_power_budget_controller(hass).async_clear()
+
+    async def handle_get_fleet_snapshot(call: ServiceCall) -> ServiceResponse:
+        """Handle the get_fleet_snapshot service call."""
+        entry_ids = None
+        if "entity_id" in call.data:
+            entry_ids = {
+                _resolve_entry_data_for_entity(hass, entity_id)[0]
+                for entity_id in call.data["entity_id"]
+            }
+        return async_get_fleet_snapshot(
+            hass, entry_ids, call.data.get("fields"), call.data["available_only"]
+        )
+
+    async def handle_update_firmware(call: ServiceCall) -> ServiceResponse:
+        """Handle the update_firmware service call."""
+        fleet_data = async_get_fleet_data(hass)
+        if fleet_data.get("firmware_rollout"):
+            raise HomeAssistantError("A firmware update is already running")
+        for key in ("firmware", "www"):
+            if key in call.data and not hass.config.is_allowed_path(call.data[key]):
+                raise HomeAssistantError(f"Access to '{call.data[key]}' is not allowed")
+
+        miners, names = _resolve_fleet_apis(hass, call.data.get("entity_id"))
+        settings = FirmwareRolloutSettings(
+            **{key: value for key, value in call.data.items() if key != "entity_id"}
+        )
+
+        _LOGGER.info("Updating %d miner(s) to firmware %s", len(miners), settings.version)
+        fleet_data["firmware_rollout"] = True
+        try:
+            return await async_rollout(miners, settings, names)
+        finally:
+            fleet_data["firmware_rollout"] = False
+
+    async def handle_rolling_restart(call: ServiceCall) -> ServiceResponse:
+        """Handle the rolling_restart service call."""
+        fleet_data = async_get_fleet_data(hass)
+        if fleet_data.get("rolling_restart"):
+            raise HomeAssistantError("A rolling restart is already running")
+        miners, names = _resolve_fleet_apis(hass, call.data.get("entity_id"))
+        settings = RollingRestartSettings(
+            **{key: value for key, value in call.data.items() if key != "entity_id"}
+        )
+
+        _LOGGER.info("Restarting %d miner(s) in waves of %d", len(miners), settings.wave_size)
+        fleet_data["rolling_restart"] = True
+        try:
+            return await async_rolling_restart(miners, settings, names)
+        finally:
+            fleet_data["rolling_restart"] = False
+
     hass.services.async_register(
         DOMAIN,
         SERVICE_RESTART,
@@ -170,6 +387,66 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         schema=SERVICE_SET_FANSPEED_SCHEMA,
     )
 
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_START_AUTOTUNE,
+        handle_start_autotune,
+        schema=SERVICE_START_AUTOTUNE_SCHEMA,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_STOP_AUTOTUNE,
+        handle_stop_autotune,
+        schema=SERVICE_AUTOTUNE_ENTITY_SCHEMA,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_AUTOTUNE_REPORT,
+        handle_get_autotune_report,
+        schema=SERVICE_AUTOTUNE_ENTITY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_POWER_BUDGET,
+        handle_set_power_budget,
+        schema=SERVICE_SET_POWER_BUDGET_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_CLEAR_POWER_BUDGET,
+        handle_clear_power_budget,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_FLEET_SNAPSHOT,
+        handle_get_fleet_snapshot,
+        schema=SERVICE_GET_FLEET_SNAPSHOT_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_UPDATE_FIRMWARE,
+        handle_update_firmware,
+        schema=SERVICE_UPDATE_FIRMWARE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_ROLLING_RESTART,
+        handle_rolling_restart,
+        schema=SERVICE_ROLLING_RESTART_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
     _LOGGER.info("AxeOS services registered")
 
 
@@ -179,4 +456,12 @@ async def async_unload_services(hass: HomeAssistant) -> None:
     hass.services.async_remove(DOMAIN, SERVICE_SET_FREQUENCY)
     hass.services.async_remove(DOMAIN, SERVICE_SET_VOLTAGE)
     hass.services.async_remove(DOMAIN, SERVICE_SET_FANSPEED)
+    hass.services.async_remove(DOMAIN, SERVICE_START_AUTOTUNE)
+    hass.services.async_remove(DOMAIN, SERVICE_STOP_AUTOTUNE)
+    hass.services.async_remove(DOMAIN, SERVICE_GET_AUTOTUNE_REPORT)
+    hass.services.async_remove(DOMAIN, SERVICE_SET_POWER_BUDGET)
+    hass.services.async_remove(DOMAIN, SERVICE_CLEAR_POWER_BUDGET)
+    hass.services.async_remove(DOMAIN, SERVICE_GET_FLEET_SNAPSHOT)
+    hass.services.async_remove(DOMAIN, SERVICE_UPDATE_FIRMWARE)
+    hass.services.async_remove(DOMAIN, SERVICE_ROLLING_RESTART)
     _LOGGER.info("AxeOS services unloaded")
@@ -12,6 +12,7 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
+from .profiles import entity_enabled
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -39,10 +40,13 @@ async def async_setup_entry(
     host = entry.data.get("host") or entry.entry_id
     host_id = str(host).replace(" ", "_").replace(".", "_").lower()
 
-    entities = [
-        AxeOSSwitchEntity(coordinator, api, entry.entry_id, host_id, key, name, icon)
-        for key, (name, icon) in SWITCH_TYPES.items()
-    ]
+    entities = []
+    for key, (name, icon) in SWITCH_TYPES.items():
+        if (enabled := entity_enabled(entry.options, "switch", key)) is None:
+            continue
+        entity = AxeOSSwitchEntity(coordinator, api, entry.entry_id, host_id, key, name, icon)
+        entity._attr_entity_registry_enabled_default = enabled
+        entities.append(entity)
     async_add_entities(entities)
 
 
@@ -0,0 +1,151 @@
+"""Watchdog for miners that answer the API but stopped hashing.
+
+A hung ASIC chain or stratum task leaves the web server running, so the
+miner looks online while it earns nothing. The watchdog looks for three
+symptoms over time windows and restarts the miner, backing off between
+restarts and giving up after repeated failures.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any
+
+from .api import AxeOSAPI
+
+_LOGGER = logging.getLogger(__name__)
+
+REASON_SHARES_FLAT = "shares_flat"
+REASON_ZERO_HASHRATE = "zero_hashrate"
+REASON_DUPLICATE_NONCES = "duplicate_nonces"
+
+ACTION_RESTART = "restart"
+ACTION_GIVE_UP = "give_up"
+
+INCIDENT_LOG_SIZE = 20
+
+
+@dataclass
+class WatchdogSettings:
+    """Detection windows and restart policy."""
+
+    # No new accepted share for this long
+    shares_window: float = 1800  # in seconds
+    # hashRate at zero for this long
+    hashrate_window: float = 300  # in seconds
+    # duplicateHWNonces rising by nonce_threshold within nonce_window
+    nonce_window: float = 600  # in seconds
+    nonce_threshold: int = 5
+    # Wait after a restart before acting again; doubled with every further
+    # restart inside escalation_window
+    cooldown: float = 1800  # in seconds
+    escalation_window: float = 6 * 3600  # in seconds
+    max_restarts: int = 3
+
+
+class AxeOSWatchdog:
+    """Per-miner stall detection with restart escalation and an incident log.
+
+    ``update`` is fed every poll and returns an incident when action is due:
+    a restart, or giving up once ``max_restarts`` restarts within the
+    escalation window did not help. After giving up, the watchdog stays
+    quiet until the miner is healthy again.
+    """
+
+    def __init__(self, settings: WatchdogSettings | None = None) -> None:
+        self.settings = settings or WatchdogSettings()
+        self.incidents: deque[dict[str, Any]] = deque(maxlen=INCIDENT_LOG_SIZE)
+        self.state: dict[str, Any] = {"stalled": False, "reasons": [], "restarts": 0, "gave_up": False}
+        self._shares: float | None = None
+        self._shares_since: float | None = None
+        self._zero_since: float | None = None
+        self._nonces: deque[tuple[float, float]] = deque()
+        self._uptime: float | None = None
+        self._restarts: deque[float] = deque()
+        self._cooldown_until = 0.0
+
+    def _reset_tracking(self, now: float) -> None:
+        self._shares = None
+        self._shares_since = now
+        self._zero_since = None
+        self._nonces.clear()
+
+    def _reasons(self, data: dict[str, Any], now: float) -> list[str]:
+        settings = self.settings
+        uptime = data.get("uptimeSeconds")
+        if isinstance(uptime, (int, float)):
+            # Counters start over after a reboot
+            if self._uptime is not None and uptime < self._uptime:
+                self._reset_tracking(now)
+            self._uptime = uptime
+
+        reasons = []
+        shares = data.get("sharesAccepted")
+        if isinstance(shares, (int, float)):
+            if shares != self._shares or self._shares_since is None:
+                self._shares = shares
+                self._shares_since = now
+            elif now - self._shares_since >= settings.shares_window:
+                reasons.append(REASON_SHARES_FLAT)
+
+        hashrate = data.get("hashRate")
+        if isinstance(hashrate, (int, float)):
+            if hashrate > 0:
+                self._zero_since = None
+            elif self._zero_since is None:
+                self._zero_since = now
+            elif now - self._zero_since >= settings.hashrate_window:
+                reasons.append(REASON_ZERO_HASHRATE)
+
+        nonces = data.get("duplicateHWNonces")
+        if isinstance(nonces, (int, float)):
+            self._nonces.append((now, nonces))
+            while self._nonces and now - self._nonces[0][0] > settings.nonce_window:
+                self._nonces.popleft()
+            if nonces - min(value for _at, value in self._nonces) >= settings.nonce_threshold:
+                reasons.append(REASON_DUPLICATE_NONCES)
+        return reasons
+
+    def update(self, data: dict[str, Any], now: float | None = None) -> dict[str, Any] | None:
+        """Feed one snapshot; returns the incident to act on, if any."""
+        now = time.monotonic() if now is None else now
+        settings = self.settings
+        reasons = self._reasons(data, now)
+        while self._restarts and now - self._restarts[0] > settings.escalation_window:
+            self._restarts.popleft()
+        self.state.update(stalled=bool(reasons), reasons=reasons, restarts=len(self._restarts))
+
+        if not reasons:
+            self.state["gave_up"] = False
+            return None
+        if self.state["gave_up"] or now < self._cooldown_until:
+            return None
+
+        incident: dict[str, Any] = {
+            "time": time.time(),
+            "reasons": reasons,
+            "restarts": len(self._restarts),
+            "hashrate": data.get("hashRate"),
+            "shares_accepted": data.get("sharesAccepted"),
+            "duplicate_nonces": data.get("duplicateHWNonces"),
+        }
+        if len(self._restarts) >= settings.max_restarts:
+            incident["action"] = ACTION_GIVE_UP
+            self.state["gave_up"] = True
+        else:
+            incident["action"] = ACTION_RESTART
+            self._cooldown_until = now + settings.cooldown * 2 ** len(self._restarts)
+            self._restarts.append(now)
+            self.state["restarts"] = len(self._restarts)
+            self._reset_tracking(now)
+        self.incidents.append(incident)
+        return incident
+
+    async def async_restart(self, api: AxeOSAPI, incident: dict[str, Any]) -> bool:
+        """Carry out a restart incident and record whether the command was accepted."""
+        _LOGGER.warning("Miner %s stalled (%s), restarting", api.host, ", ".join(incident["reasons"]))
+        incident["restarted"] = await api.restart_system()
+        return incident["restarted"]
@@ -2,5 +2,44 @@
 import sys
 from pathlib import Path
 
+import pytest_asyncio
+from aiohttp import ClientSession
+from aiohttp.test_utils import TestServer
+
 # Add the custom_components directory to the path
 sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from simulator import SimulatedMiner, create_app  # noqa: E402
+
+
+@pytest_asyncio.fixture
+async def miner():
+    """Start a simulated miner; yields (miner, host) for use with AxeOSAPI."""
+    sim = SimulatedMiner()
+    server = TestServer(create_app(sim))
+    await server.start_server()
+    yield sim, f"{server.host}:{server.port}"
+    await server.close()
+
+
+@pytest_asyncio.fixture
+async def fleet():
+    """Start three simulated miners; yields [(miner, host)]."""
+    servers = []
+    miners = []
+    for index in range(3):
+        sim = SimulatedMiner(mac_addr=f"AA:BB:CC:DD:EE:0{index}")
+        server = TestServer(create_app(sim))
+        await server.start_server()
+        servers.append(server)
+        miners.append((sim, f"{server.host}:{server.port}"))
+    yield miners
+    for server in servers:
+        await server.close()
+
+
+@pytest_asyncio.fixture
+async def session():
+    """Create a real aiohttp ClientSession."""
+    async with ClientSession() as client:
+        yield client
@@ -0,0 +1,306 @@
+"""Simulated AxeOS miner for end-to-end tests.
+
+Serves the subset of the AxeOS HTTP API used by the integration from a small
+physical model: hashrate scales with frequency, power with frequency and the
+square of the core voltage, and temperatures with power. Undervolting a
+frequency makes the chip drop hashrate, and the chip enters overheat mode
+above ``overheat_temp``.
+
+Run standalone to point the integration (or any HTTP client) at it:
+
+    python -m tests.simulator --port 8080
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from aiohttp import web
+
+
+class SimulatedMiner:
+    """State and physics model of a single simulated miner."""
+
+    def __init__(
+        self,
+        *,
+        asic_model: str = "BM1370",
+        small_core_count: int = 2040,
+        asic_count: int = 1,
+        frequency: int = 525,
+        core_voltage: int = 1150,
+        fanspeed: int = 100,
+        ambient: float = 25.0,
+        thermal_resistance: float = 2.2,
+        vr_thermal_resistance: float = 3.0,
+        overheat_temp: float = 70.0,
+        mac_addr: str = "AA:BB:CC:DD:EE:01",
+        hostname: str = "bitaxe",
+        version: str = "v2.4.0",
+    ) -> None:
+        self.asic_model = asic_model
+        self.small_core_count = small_core_count
+        self.asic_count = asic_count
+        self.frequency = frequency
+        self.core_voltage = core_voltage
+        self.fanspeed = fanspeed
+        self.ambient = ambient
+        self.thermal_resistance = thermal_resistance
+        self.vr_thermal_resistance = vr_thermal_resistance
+        self.overheat_temp = overheat_temp
+        self.mac_addr = mac_addr
+        self.hostname = hostname
+        self.version = version
+        self.settings: dict[str, bool] = {"autofanspeed": True, "flipscreen": False}
+        self.shares_accepted = 0
+        self.shares_rejected = 0
+        self.boot_time = time.monotonic()
+        self.requests: list[tuple[str, str]] = []
+        # Faults applied to the next requests, one per request: "error" answers
+        # 500, "hang" never answers, "disconnect" drops the connection and "ok"
+        # handles the request normally
+        self.faults: list[str] = []
+        # Version installed by the next firmware upload (default: keep the current one)
+        self.ota_version: str | None = None
+        # A restart keeps the API down for reboot_seconds; hashrate then ramps
+        # up linearly over warmup_seconds
+        self.reboot_seconds = 0.0
+        self.warmup_seconds = 0.0
+        self.offline_until = 0.0
+        # (path, Content-Length, bytes received) per OTA upload
+        self.ota_uploads: list[tuple[str, int | None, int]] = []
+        # Where per-chip telemetry is reported: "asic" lists the chips in
+        # /api/system/asic, "info" adds hashrateMonitor to /api/system/info,
+        # None reports none. chip_health scales each chip's share of the hashrate.
+        self.chip_telemetry: str | None = None
+        self.chip_health: list[float] = [1.0] * asic_count
+        # Rows of the statistics ring buffer: ms since boot -> values by column
+        self.statistics: list[tuple[int, dict[str, float]]] = []
+
+    @staticmethod
+    def required_voltage(frequency: float) -> float:
+        """Lowest core voltage (mV) at which ``frequency`` hashes cleanly."""
+        return 1000 + (frequency - 400) * 0.9
+
+    def stability(self) -> float:
+        """Fraction of the nominal hashrate delivered at the current setpoint."""
+        deficit = self.required_voltage(self.frequency) - self.core_voltage
+        if deficit <= 0:
+            return 1.0
+        return max(0.0, 1.0 - deficit / 50)
+
+    def power(self) -> float:
+        volts = self.core_voltage / 1000
+        return 3.0 + 0.019 * self.frequency * volts * volts * self.asic_count
+
+    def hashrate(self) -> float:
+        expected = self.frequency * self.small_core_count * self.asic_count / 1000
+        if self.warmup_seconds:
+            uptime = time.monotonic() - self.boot_time - self.reboot_seconds
+            expected *= min(1.0, max(0.0, uptime / self.warmup_seconds))
+        return expected * self.stability()
+
+    def temp(self) -> float:
+        cooling = 1.4 - 0.6 * self.fanspeed / 100
+        return self.ambient + self.power() * self.thermal_resistance * cooling
+
+    def vr_temp(self) -> float:
+        return self.ambient + self.power() * self.vr_thermal_resistance
+
+    def restart(self) -> None:
+        self.boot_time = time.monotonic()
+        self.offline_until = self.boot_time + self.reboot_seconds
+
+    def system_info(self) -> dict:
+        """Render the current state as an /api/system/info payload."""
+        hashrate = round(self.hashrate(), 2)
+        temp = round(self.temp(), 1)
+        info = {
+            "power": round(self.power(), 2),
+            "voltage": 5000,
+            "current": round(self.power() / 5 * 1000, 1),
+            "temp": temp,
+            "vrTemp": round(self.vr_temp(), 1),
+            "hashRate": hashrate,
+            "hashRate_1m": hashrate,
+            "hashRate_10m": hashrate,
+            "expectedHashrate": self.frequency * self.small_core_count * self.asic_count / 1000,
+            "frequency": self.frequency,
+            "coreVoltage": self.core_voltage,
+            "coreVoltageActual": self.core_voltage - 5,
+            "fanspeed": self.fanspeed,
+            "overheat_mode": 1 if temp > self.overheat_temp else 0,
+            "overheat_temp": self.overheat_temp,
+            "sharesAccepted": self.shares_accepted,
+            "sharesRejected": self.shares_rejected,
+            "uptimeSeconds": int(time.monotonic() - self.boot_time),
+            "ASICModel": self.asic_model,
+            "asicCount": self.asic_count,
+            "smallCoreCount": self.small_core_count,
+            "macAddr": self.mac_addr,
+            "hostname": self.hostname,
+            "version": self.version,
+            "boardVersion": "601",
+            **self.settings,
+        }
+        if self.chip_telemetry == "info":
+            info["hashrateMonitor"] = {
+                "asics": [
+                    {"total": chip["hashrate"], "errorCount": chip["errorCount"]} for chip in self.chips()
+                ]
+            }
+        return info
+
+    def chips(self) -> list[dict]:
+        """Per-chip hashrate, temperature and frequency."""
+        per_chip = self.hashrate() / self.asic_count
+        return [
+            {
+                "hashrate": round(per_chip * health, 2),
+                "temp": round(self.temp() + index * 0.5, 1),
+                "frequency": self.frequency,
+                "errorCount": 0 if health >= 1 else 10,
+            }
+            for index, health in enumerate(self.chip_health)
+        ]
+
+    def asic_info(self) -> dict:
+        """Render the ASIC settings as an /api/system/asic payload."""
+        info = {
+            "ASICModel": self.asic_model,
+            "asicCount": self.asic_count,
+            "defaultFrequency": 525,
+            "frequencyOptions": [400, 490, 525, 550, 600],
+            "defaultVoltage": 1150,
+            "voltageOptions": [1100, 1150, 1200, 1250, 1300],
+        }
+        if self.chip_telemetry == "asic":
+            info["asics"] = self.chips()
+        return info
+
+    def uptime_ms(self) -> int:
+        return int((time.monotonic() - self.boot_time) * 1000)
+
+    def record_statistics(self, timestamp: int | None = None) -> None:
+        """Append the current state to the statistics buffer."""
+        self.statistics.append(
+            (
+                self.uptime_ms() if timestamp is None else timestamp,
+                {
+                    "hashrate": round(self.hashrate(), 2),
+                    "asicTemp": round(self.temp(), 1),
+                    "vrTemp": round(self.vr_temp(), 1),
+                    "power": round(self.power(), 2),
+                    "fanSpeed": self.fanspeed,
+                },
+            )
+        )
+
+    def statistics_payload(self, columns: list[str] | None = None) -> dict:
+        """Render the buffer as an /api/system/statistics payload."""
+        available = ["hashrate", "asicTemp", "vrTemp", "power", "fanSpeed"]
+        labels = [column for column in available if not columns or column in columns]
+        return {
+            "currentTimestamp": self.uptime_ms(),
+            "labels": [*labels, "timestamp"],
+            "statistics": [[values[label] for label in labels] + [ts] for ts, values in self.statistics],
+        }
+
+
+def create_app(miner: SimulatedMiner) -> web.Application:
+    """Build an aiohttp application serving ``miner``."""
+
+    async def _read_json(request: web.Request) -> dict:
+        miner.requests.append((request.method, request.path))
+        return await request.json()
+
+    async def system_info(request: web.Request) -> web.Response:
+        miner.requests.append((request.method, request.path))
+        if time.monotonic() < miner.offline_until:
+            return web.Response(status=503, text="rebooting")
+        return web.json_response(miner.system_info())
+
+    async def ota(request: web.Request) -> web.Response:
+        miner.requests.append((request.method, request.path))
+        received = 0
+        async for chunk in request.content.iter_any():
+            received += len(chunk)
+        miner.ota_uploads.append((request.path, request.content_length, received))
+        if request.path == "/api/system/OTA":
+            if miner.ota_version is not None:
+                miner.version = miner.ota_version
+            miner.restart()
+        return web.Response(text="Firmware update complete, rebooting now!")
+
+    async def asic(request: web.Request) -> web.Response:
+        miner.requests.append((request.method, request.path))
+        return web.json_response(miner.asic_info())
+
+    async def statistics(request: web.Request) -> web.Response:
+        miner.requests.append((request.method, request.path))
+        columns = request.query.get("columns")
+        return web.json_response(miner.statistics_payload(columns.split(",") if columns else None))
+
+    async def restart(request: web.Request) -> web.Response:
+        miner.requests.append((request.method, request.path))
+        miner.restart()
+        return web.Response(text="restarting")
+
+    async def frequency(request: web.Request) -> web.Response:
+        miner.frequency = int((await _read_json(request))["frequency"])
+        return web.Response()
+
+    async def voltage(request: web.Request) -> web.Response:
+        miner.core_voltage = int((await _read_json(request))["voltage"])
+        return web.Response()
+
+    async def fanspeed(request: web.Request) -> web.Response:
+        miner.fanspeed = int((await _read_json(request))["fanspeed"])
+        return web.Response()
+
+    async def patch_system(request: web.Request) -> web.Response:
+        miner.settings.update(await _read_json(request))
+        return web.Response()
+
+    @web.middleware
+    async def inject_faults(request: web.Request, handler):
+        if not miner.faults:
+            return await handler(request)
+        fault = miner.faults.pop(0)
+        if fault == "ok":
+            return await handler(request)
+        miner.requests.append((request.method, request.path))
+        if fault == "error":
+            return web.Response(status=500, text="injected error")
+        if fault == "hang":
+            await asyncio.sleep(3600)
+        if fault == "disconnect":
+            request.transport.close()
+            await asyncio.sleep(3600)
+        raise ValueError(f"Unknown fault {fault}")
+
+    app = web.Application(middlewares=[inject_faults])
+    app.router.add_get("/api/system/info", system_info)
+    app.router.add_get("/api/system/asic", asic)
+    app.router.add_get("/api/system/statistics", statistics)
+    app.router.add_post("/api/system/restart", restart)
+    app.router.add_post("/api/system/OTA", ota)
+    app.router.add_post("/api/system/OTAWWW", ota)
+    app.router.add_post("/api/system/frequency", frequency)
+    app.router.add_post("/api/system/voltage", voltage)
+    app.router.add_post("/api/system/fanspeed", fanspeed)
+    app.router.add_patch("/api/system", patch_system)
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a simulated AxeOS miner")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args()
+    web.run_app(create_app(SimulatedMiner()), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
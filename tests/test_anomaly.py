@@ -0,0 +1,94 @@
+"""Tests for the AxeOS HA Integration anomaly detection."""
+import random
+
+from custom_components.axeos_ha_integration.anomaly import (
+    DIRECTION_HIGH,
+    DIRECTION_LOW,
+    AxeOSAnomalyDetector,
+    StreamingDetector,
+)
+
+
+def test_detector_ignores_noise():
+    """Test that stationary noise does not raise an anomaly."""
+    rng = random.Random(1)
+    detector = StreamingDetector(DIRECTION_LOW, rel_std=0.02)
+
+    assert not any(detector.update(1000 + rng.gauss(0, 10)) for _ in range(500))
+
+
+def test_detector_flags_sag_and_recovers():
+    """Test that a hashrate sag is flagged and clears after recovery."""
+    rng = random.Random(2)
+    detector = StreamingDetector(DIRECTION_LOW, rel_std=0.02)
+    for _ in range(50):
+        detector.update(1000 + rng.gauss(0, 10))
+
+    assert detector.update(700) is True
+
+    results = [detector.update(1000 + rng.gauss(0, 10)) for _ in range(100)]
+    assert results[-1] is False
+
+
+def test_detector_ignores_opposite_direction():
+    """Test that a hashrate increase is not anomalous."""
+    detector = StreamingDetector(DIRECTION_LOW, rel_std=0.02)
+    for _ in range(50):
+        detector.update(1000)
+
+    assert detector.update(1300) is False
+
+
+def test_detector_cusum_catches_slow_drift():
+    """Test that a slow creep is caught by CUSUM without a large z-score."""
+    detector = StreamingDetector(DIRECTION_HIGH, min_std=0.5)
+    for _ in range(50):
+        detector.update(60.0)
+
+    flagged = False
+    value = 60.0
+    for _ in range(60):
+        value += 0.1
+        flagged = detector.update(value) or flagged
+        assert detector.z < detector.z_threshold
+    assert flagged
+
+
+def test_detector_warmup():
+    """Test that nothing is flagged during warmup."""
+    detector = StreamingDetector(DIRECTION_LOW, warmup=10)
+
+    assert not any(detector.update(value) for value in (1000, 10, 1000, 10, 1000))
+
+
+def test_miner_detector_reports_transitions():
+    """Test that only state changes are reported, with the offending metric."""
+    detector = AxeOSAnomalyDetector()
+    data = {"hashRate_1m": 1000.0, "vrTemp": 55.0, "sharesRejected": 0}
+    for _ in range(30):
+        assert detector.update(data) == []
+
+    changes = detector.update({**data, "hashRate_1m": 500.0})
+
+    assert [c["metric"] for c in changes] == ["hashrate"]
+    assert changes[0]["active"] is True
+    assert changes[0]["value"] == 500.0
+    assert detector.state == {"hashrate": True, "vr_temp": False, "rejects": False}
+
+
+def test_miner_detector_reject_spike_and_counter_reset():
+    """Test reject spikes per poll and that a counter reset is not a spike."""
+    detector = AxeOSAnomalyDetector()
+    rejected = 0
+    for _ in range(30):
+        detector.update({"sharesRejected": rejected})
+
+    rejected += 20
+    changes = detector.update({"sharesRejected": rejected})
+    assert changes[0]["metric"] == "rejects"
+    assert changes[0]["value"] == 20
+
+    # Restarted miner: the counter dropping back to zero is not a sample
+    samples = detector._detectors["rejects"].count
+    detector.update({"sharesRejected": 0})
+    assert detector._detectors["rejects"].count == samples
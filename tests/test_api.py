@@ -1,9 +1,31 @@
 """Tests for the AxeOS HA Integration API."""
+import json
+import sys
+
 import pytest
+import aiohttp
 from aiohttp import ClientSession
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import ANY, AsyncMock, MagicMock, patch
 
+from custom_components.axeos_ha_integration import system_info_fields
 from custom_components.axeos_ha_integration.api import AxeOSAPI
+from custom_components.axeos_ha_integration.const import MAX_SYSTEM_INFO_BYTES
+
+
+def _response(status: int, body: bytes = b"", content_length: int | None = None):
+    """Create a mock response streaming ``body`` in small chunks."""
+    async def iter_any():
+        for start in range(0, len(body), 1024):
+            yield body[start:start + 1024]
+
+    response = MagicMock()
+    response.status = status
+    response.content_length = content_length
+    response.content.iter_any = iter_any
+    response.read = AsyncMock(return_value=body)
+    # Used as "async with session.get(...) as response"
+    response.__aenter__.return_value = response
+    return response
 
 
 @pytest.fixture
@@ -21,17 +43,15 @@ def api(mock_session):
 @pytest.mark.asyncio
 async def test_get_system_info_success(api, mock_session):
     """Test successful system info retrieval."""
-    mock_response = AsyncMock()
-    mock_response.status = 200
-    mock_response.json = AsyncMock(return_value={
+    mock_response = _response(200, json.dumps({
         "power": 12.5,
         "voltage": 5000,
         "current": 2500,
         "temp": 45.5,
         "hashRate": 500.0,
-    })
-    
-    mock_session.get = AsyncMock(return_value=mock_response)
+    }).encode())
+
+    mock_session.get = MagicMock(return_value=mock_response)
     
     result = await api.get_system_info()
     
@@ -39,16 +59,120 @@ async def test_get_system_info_success(api, mock_session):
     assert result["power"] == 12.5
     assert result["temp"] == 45.5
     assert result["hashRate"] == 500.0
-    mock_session.get.assert_called_once_with("http://192.168.1.100/api/system/info")
+    mock_session.get.assert_called_once_with("http://192.168.1.100/api/system/info", timeout=ANY, trace_request_ctx=api.stats)
+
+
+@pytest.mark.asyncio
+async def test_get_system_info_unchanged_body(api, mock_session):
+    """Test that a byte-identical body reuses the previous snapshot."""
+    mock_session.get = MagicMock(
+        return_value=_response(200, b'{"power": 12.5, "hashRate": 500.0}')
+    )
+
+    first = await api.get_system_info()
+    assert api.payload_unchanged is False
+
+    with patch("custom_components.axeos_ha_integration.api.json_loads") as loads:
+        second = await api.get_system_info()
+    loads.assert_not_called()
+    assert second is first
+    assert api.payload_unchanged is True
+    assert api.stats["unchanged_payloads"] == 1
+
+    mock_session.get = MagicMock(
+        return_value=_response(200, b'{"power": 13.0, "hashRate": 500.0}')
+    )
+    third = await api.get_system_info()
+    assert third is not first
+    assert third["power"] == 13.0
+    assert api.payload_unchanged is False
+
+
+@pytest.mark.asyncio
+async def test_adopted_snapshot_is_returned_for_identical_body(api, mock_session):
+    """Test that a snapshot the coordinator replaced stays the one identical bodies return."""
+    mock_session.get = MagicMock(return_value=_response(200, b'{"power": 12.5}'))
+    first = await api.get_system_info()
+
+    replaced = {**first, "watchdog": {"stalled": True}}
+    api.adopt_snapshot(replaced)
+
+    mock_session.get = MagicMock(return_value=_response(200, b'{"power": 12.5}'))
+    assert await api.get_system_info() is replaced
+    assert api.payload_unchanged is True
+
+
+@pytest.mark.asyncio
+async def test_get_system_info_projects_fields(mock_session):
+    """Test that only the requested top-level fields are kept."""
+    api = AxeOSAPI(mock_session, "192.168.1.100", fields={"power", "stratum"})
+    mock_session.get = MagicMock(return_value=_response(200, json.dumps({
+        "power": 12.5,
+        "sharesRejectedReasons": [{"message": "Above target", "count": 3}],
+        "stratum": {"poolMode": 0},
+    }).encode()))
+
+    result = await api.get_system_info()
+
+    assert result == {"power": 12.5, "stratum": {"poolMode": 0}}
+
+
+@pytest.mark.asyncio
+async def test_get_system_info_raw_keeps_everything(mock_session):
+    """Test that without fields (the raw_system_info option) the response is kept as is."""
+    api = AxeOSAPI(mock_session, "192.168.1.100", fields=None)
+    payload = {"power": 12.5, "hashrateMonitor": {"asics": [{"total": 400.0}]}, "display": "SSD1306"}
+    mock_session.get = MagicMock(return_value=_response(200, json.dumps(payload).encode()))
+
+    assert await api.get_system_info() == payload
+
+
+def _deep_size(value) -> int:
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(_deep_size(key) + _deep_size(item) for key, item in value.items())
+    elif isinstance(value, list):
+        size += sum(_deep_size(item) for item in value)
+    return size
+
+
+@pytest.mark.asyncio
+async def test_projection_shrinks_retained_snapshot(mock_session):
+    """Test that a payload full of unread fields is retained at a fraction of its size."""
+    payload = {key: 1.0 for key in system_info_fields()}
+    payload["stratum"] = {"poolMode": 0, "pools": [{"url": "pool.example", "port": 3333}]}
+    # Fields no entity reads, like the per-chip hashrate monitor of newer firmware
+    payload["hashrateMonitor"] = {
+        "asics": [{"total": 400.0, "domains": [100.0] * 4, "errorCount": 0} for _ in range(4)]
+    }
+    payload.update({f"unused{index}": f"value {index}" for index in range(60)})
+    api = AxeOSAPI(mock_session, "192.168.1.100", fields=system_info_fields())
+    mock_session.get = MagicMock(return_value=_response(200, json.dumps(payload).encode()))
+
+    result = await api.get_system_info()
+
+    assert set(result) == system_info_fields()
+    assert _deep_size(result) < 0.6 * _deep_size(payload)
+
+
+@pytest.mark.asyncio
+async def test_get_system_info_size_cap(api, mock_session):
+    """Test that oversized bodies are rejected, with or without Content-Length."""
+    body = b'{"pad": "' + b"x" * MAX_SYSTEM_INFO_BYTES + b'"}'
+    mock_session.get = MagicMock(return_value=_response(200, body))
+    assert await api.get_system_info() is None
+
+    mock_session.get = MagicMock(return_value=_response(200, b"{}", content_length=len(body)))
+    assert await api.get_system_info() is None
+    assert api.stats["poll_failures"] == 2
 
 
 @pytest.mark.asyncio
 async def test_get_system_info_failure(api, mock_session):
     """Test system info retrieval failure."""
-    mock_response = AsyncMock()
-    mock_response.status = 404
+    mock_response = _response(404)
     
-    mock_session.get = AsyncMock(return_value=mock_response)
+    mock_session.get = MagicMock(return_value=mock_response)
     
     result = await api.get_system_info()
     
@@ -58,24 +182,22 @@ async def test_get_system_info_failure(api, mock_session):
 @pytest.mark.asyncio
 async def test_restart_system_success(api, mock_session):
     """Test successful system restart."""
-    mock_response = AsyncMock()
-    mock_response.status = 200
+    mock_response = _response(200)
     
-    mock_session.post = AsyncMock(return_value=mock_response)
+    mock_session.post = MagicMock(return_value=mock_response)
     
     result = await api.restart_system()
     
     assert result is True
-    mock_session.post.assert_called_once_with("http://192.168.1.100/api/system/restart")
+    mock_session.post.assert_called_once_with("http://192.168.1.100/api/system/restart", timeout=ANY, trace_request_ctx=api.stats)
 
 
 @pytest.mark.asyncio
 async def test_restart_system_failure(api, mock_session):
     """Test system restart failure."""
-    mock_response = AsyncMock()
-    mock_response.status = 500
+    mock_response = _response(500)
     
-    mock_session.post = AsyncMock(return_value=mock_response)
+    mock_session.post = MagicMock(return_value=mock_response)
     
     result = await api.restart_system()
     
@@ -85,51 +207,54 @@ async def test_restart_system_failure(api, mock_session):
 @pytest.mark.asyncio
 async def test_set_frequency_success(api, mock_session):
     """Test setting frequency successfully."""
-    mock_response = AsyncMock()
-    mock_response.status = 200
+    mock_response = _response(200)
     
-    mock_session.post = AsyncMock(return_value=mock_response)
+    mock_session.post = MagicMock(return_value=mock_response)
     
     result = await api.set_frequency(500)
     
     assert result is True
     mock_session.post.assert_called_once_with(
         "http://192.168.1.100/api/system/frequency",
-        json={"frequency": 500}
+        json={"frequency": 500},
+        timeout=ANY,
+        trace_request_ctx=api.stats,
     )
 
 
 @pytest.mark.asyncio
 async def test_set_voltage_success(api, mock_session):
     """Test setting voltage successfully."""
-    mock_response = AsyncMock()
-    mock_response.status = 200
+    mock_response = _response(200)
     
-    mock_session.post = AsyncMock(return_value=mock_response)
+    mock_session.post = MagicMock(return_value=mock_response)
     
     result = await api.set_voltage(1200)
     
     assert result is True
     mock_session.post.assert_called_once_with(
         "http://192.168.1.100/api/system/voltage",
-        json={"voltage": 1200}
+        json={"voltage": 1200},
+        timeout=ANY,
+        trace_request_ctx=api.stats,
     )
 
 
 @pytest.mark.asyncio
 async def test_set_fanspeed_success(api, mock_session):
     """Test setting fan speed successfully."""
-    mock_response = AsyncMock()
-    mock_response.status = 200
+    mock_response = _response(200)
     
-    mock_session.post = AsyncMock(return_value=mock_response)
+    mock_session.post = MagicMock(return_value=mock_response)
     
     result = await api.set_fanspeed(75)
     
     assert result is True
     mock_session.post.assert_called_once_with(
         "http://192.168.1.100/api/system/fanspeed",
-        json={"fanspeed": 75}
+        json={"fanspeed": 75},
+        timeout=ANY,
+        trace_request_ctx=api.stats,
     )
 
 
@@ -139,3 +264,65 @@ async def test_host_with_protocol(mock_session):
     api = AxeOSAPI(mock_session, "http://192.168.1.100")
     
     assert api.host == "192.168.1.100"
+
+
+@pytest.mark.asyncio
+async def test_get_system_info_retries_transient_errors(api, mock_session):
+    """Test that timeouts and 5xx answers are retried within the poll budget."""
+    mock_session.get = MagicMock(side_effect=[
+        TimeoutError(),
+        _response(503),
+        _response(200, b'{"power": 12.5}'),
+    ])
+
+    with patch("custom_components.axeos_ha_integration.api.asyncio.sleep", AsyncMock()) as sleep:
+        result = await api.get_system_info()
+
+    assert result == {"power": 12.5}
+    assert mock_session.get.call_count == 3
+    assert sleep.await_count == 2
+    assert api.stats["retries"] == 2
+    assert api.stats["outcomes"] == {
+        "ok": 1,
+        "timeout": 1,
+        "connection_error": 0,
+        "http_error": 1,
+        "invalid_response": 0,
+    }
+    assert api.stats["poll_failures"] == 0
+
+
+@pytest.mark.asyncio
+async def test_get_system_info_no_retry_on_client_errors(api, mock_session):
+    """Test that 4xx answers and undecodable bodies are not retried."""
+    mock_session.get = MagicMock(return_value=_response(404))
+    assert await api.get_system_info() is None
+
+    mock_session.get = MagicMock(return_value=_response(200, b"not json"))
+    assert await api.get_system_info() is None
+
+    assert api.stats["retries"] == 0
+    assert api.stats["outcomes"]["http_error"] == 1
+    assert api.stats["outcomes"]["invalid_response"] == 1
+
+
+@pytest.mark.asyncio
+async def test_get_system_info_retry_respects_budget(mock_session):
+    """Test that no retry is started when it cannot finish within the poll budget."""
+    api = AxeOSAPI(mock_session, "192.168.1.100", connect_timeout=2, read_timeout=3, poll_budget=4)
+    mock_session.get = MagicMock(side_effect=TimeoutError())
+
+    assert await api.get_system_info() is None
+    assert mock_session.get.call_count == 1
+    assert api.stats["poll_failures"] == 1
+
+
+@pytest.mark.asyncio
+async def test_writes_are_never_retried(api, mock_session):
+    """Test that a failed POST is sent exactly once."""
+    mock_session.post = MagicMock(side_effect=aiohttp.ClientConnectionError())
+
+    assert await api.set_frequency(500) is False
+    assert mock_session.post.call_count == 1
+    assert api.stats["write_failures"] == 1
+    assert api.stats["outcomes"]["connection_error"] == 1
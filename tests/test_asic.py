@@ -0,0 +1,56 @@
+"""Tests for per-ASIC telemetry."""
+import pytest
+
+from custom_components.axeos_ha_integration.api import AxeOSAPI
+from custom_components.axeos_ha_integration.asic import AxeOSAsicReader, parse_asic_chips
+
+
+def test_parse_asic_chips_variants():
+    """Test the chip list of /api/system/asic and the hashrateMonitor block."""
+    assert parse_asic_chips({"asics": [{"hashRate": 500.5, "temperature": 60, "freq": 525}, "bad"]}) == [
+        {"hashrate": 500.5, "temp": 60, "frequency": 525},
+        {},
+    ]
+    assert parse_asic_chips({"hashrateMonitor": {"asics": [{"total": 480.0, "errorCount": 3}]}}) == [
+        {"hashrate": 480.0, "errors": 3}
+    ]
+    assert parse_asic_chips({"ASICModel": "BM1370", "asicCount": 4}) == []
+    assert parse_asic_chips(None) == []
+
+
+@pytest.mark.asyncio
+async def test_reader_uses_asic_endpoint(miner, session):
+    """Test per-chip data listed by /api/system/asic."""
+    sim, host = miner
+    sim.asic_count = 2
+    sim.chip_health = [1.0, 0.5]
+    sim.chip_telemetry = "asic"
+    reader = AxeOSAsicReader(AxeOSAPI(session, host))
+
+    chips = await reader.async_read()
+
+    assert len(chips) == 2
+    assert chips[1]["hashrate"] == pytest.approx(chips[0]["hashrate"] / 2, abs=0.01)
+    assert chips[1]["errors"] == 10
+    assert set(chips[0]) == {"hashrate", "temp", "frequency", "errors"}
+    assert ("GET", "/api/system/info") not in sim.requests
+
+
+@pytest.mark.asyncio
+async def test_reader_falls_back_to_system_info(miner, session):
+    """Test the hashrateMonitor fallback, which does not disturb the main poll."""
+    sim, host = miner
+    sim.asic_count = 2
+    sim.chip_health = [1.0, 0.0]
+    sim.chip_telemetry = "info"
+    api = AxeOSAPI(session, host, fields={"hashRate"})
+    reader = AxeOSAsicReader(api)
+
+    chips = await reader.async_read()
+    assert chips == [{"hashrate": pytest.approx(sim.hashrate() / 2, abs=0.01), "errors": 0}, {"hashrate": 0.0, "errors": 10}]
+    # The next read goes straight to system info
+    await reader.async_read()
+    assert sim.requests.count(("GET", "/api/system/asic")) == 1
+
+    # The projected main poll does not carry the per-chip block
+    assert "hashrateMonitor" not in await api.get_system_info()
@@ -0,0 +1,156 @@
+"""Tests for the AxeOS HA Integration autotuner."""
+import pytest
+
+from custom_components.axeos_ha_integration.api import AxeOSAPI
+from custom_components.axeos_ha_integration.autotune import (
+    STATUS_COMPLETED,
+    STATUS_FAILED,
+    STATUS_INTERRUPTED,
+    STATUS_RUNNING,
+    STATUS_STOPPED,
+    AutotuneSettings,
+    AxeOSAutotuner,
+)
+
+
+class MemoryStore:
+    """In-memory stand-in for homeassistant.helpers.storage.Store."""
+
+    def __init__(self, data=None):
+        self.data = data
+
+    async def async_load(self):
+        return self.data
+
+    async def async_save(self, data):
+        self.data = data
+
+
+def fast_settings(**overrides) -> AutotuneSettings:
+    """Sweep settings with zero hold times for the simulator."""
+    settings = {
+        "min_frequency": 350,
+        "max_frequency": 550,
+        "frequency_step": 50,
+        "min_voltage": 1000,
+        "max_voltage": 1200,
+        "voltage_step": 50,
+        "settle_time": 0,
+        "measure_time": 0,
+        "sample_interval": 0,
+        "max_temp": 70,
+        "max_vr_temp": 90,
+    }
+    settings.update(overrides)
+    return AutotuneSettings(**settings)
+
+
+def test_settings_validation():
+    """Test that inverted bounds are rejected."""
+    with pytest.raises(ValueError):
+        AutotuneSettings(min_frequency=600, max_frequency=400)
+    with pytest.raises(ValueError):
+        AutotuneSettings(min_voltage=1300, max_voltage=1100)
+
+
+@pytest.mark.asyncio
+async def test_autotune_converges_to_most_efficient_point(miner, session):
+    """Test a full sweep against the simulated miner."""
+    sim, host = miner
+    tuner = AxeOSAutotuner(AxeOSAPI(session, host), MemoryStore())
+
+    report = await tuner.async_run(fast_settings())
+
+    # The simulator is most efficient at 400 MHz, the lowest voltage it allows
+    assert report["status"] == STATUS_COMPLETED
+    assert (report["best"]["frequency"], report["best"]["voltage"]) == (400, 1000)
+    assert (sim.frequency, sim.core_voltage) == (400, 1000)
+    assert report["efficiency_gain_percent"] > 0
+    # 450 MHz needs more than 1000 mV and must have been rejected first
+    unstable = [r for r in report["results"] if not r["stable"]]
+    assert {"frequency": 450, "voltage": 1000} in [
+        {"frequency": r["frequency"], "voltage": r["voltage"]} for r in unstable
+    ]
+
+
+@pytest.mark.asyncio
+async def test_autotune_stops_sweep_at_thermal_limit(miner, session):
+    """Test that a thermal violation ends the sweep below the limit."""
+    sim, host = miner
+    tuner = AxeOSAutotuner(AxeOSAPI(session, host), MemoryStore())
+
+    report = await tuner.async_run(fast_settings(max_temp=54))
+
+    thermal = [r for r in report["results"] if r["reason"] == "thermal"]
+    assert len(thermal) == 1
+    assert all(r["frequency"] <= thermal[0]["frequency"] for r in report["results"])
+    assert thermal[0]["frequency"] == 550
+    assert sim.temp() <= 54
+
+
+@pytest.mark.asyncio
+async def test_autotune_resumes_from_stored_state(miner, session):
+    """Test that a resumed run reuses measured steps."""
+    sim, host = miner
+    store = MemoryStore()
+    settings = fast_settings()
+    await AxeOSAutotuner(AxeOSAPI(session, host), store).async_run(settings)
+    store.data["status"] = STATUS_STOPPED
+    sim.requests.clear()
+
+    tuner = AxeOSAutotuner(AxeOSAPI(session, host), store)
+    report = await tuner.async_run(settings)
+
+    assert report["status"] == STATUS_COMPLETED
+    # Cached steps are not measured again; only convergence re-verifies the best point
+    info_reads = [r for r in sim.requests if r == ("GET", "/api/system/info")]
+    assert len(info_reads) < report["steps"]
+
+
+@pytest.mark.asyncio
+async def test_autotune_retries_rejected_write(miner, session):
+    """Test that a write the miner rejects once is retried."""
+    sim, host = miner
+    tuner = AxeOSAutotuner(AxeOSAPI(session, host), MemoryStore())
+    tuner.retry_delay = 0
+    # Setpoint read, then the first voltage write fails
+    sim.faults = ["ok", "error"]
+
+    report = await tuner.async_run(fast_settings())
+
+    assert report["status"] == STATUS_COMPLETED
+    assert (sim.frequency, sim.core_voltage) == (400, 1000)
+
+
+@pytest.mark.asyncio
+async def test_autotune_aborts_when_writes_keep_failing(miner, session):
+    """Test that the run is aborted instead of measuring a setpoint that was never applied."""
+    sim, host = miner
+    original = (sim.frequency, sim.core_voltage)
+    tuner = AxeOSAutotuner(AxeOSAPI(session, host), MemoryStore())
+    tuner.retry_delay = 0
+    sim.faults = ["ok", "error", "error", "error"]
+
+    report = await tuner.async_run(fast_settings())
+
+    assert report["status"] == STATUS_FAILED
+    assert "voltage" in report["error"]
+    assert report["steps"] == 0
+    assert (sim.frequency, sim.core_voltage) == original
+
+
+@pytest.mark.asyncio
+async def test_running_state_is_loaded_as_interrupted(miner, session):
+    """Test that a run still marked running after a restart reports as interrupted."""
+    sim, host = miner
+    store = MemoryStore()
+    settings = fast_settings()
+    await AxeOSAutotuner(AxeOSAPI(session, host), store).async_run(settings)
+    store.data["status"] = STATUS_RUNNING
+
+    tuner = AxeOSAutotuner(AxeOSAPI(session, host), store)
+    await tuner.async_load()
+    assert tuner.status == STATUS_INTERRUPTED
+
+    report = await tuner.async_run(settings)
+    assert report["status"] == STATUS_COMPLETED
@@ -0,0 +1,111 @@
+"""Tests for the long-term statistics backfill."""
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+import pytest
+
+from custom_components.axeos_ha_integration.api import AxeOSAPI
+from custom_components.axeos_ha_integration.backfill import (
+    AxeOSStatisticsBackfill,
+    aggregate_hourly,
+    gap_hours,
+    parse_statistics,
+)
+from custom_components.axeos_ha_integration.const import STATISTICS_COLUMNS
+
+HOUR = 3600
+# 2026-01-01 10:00 UTC
+T0 = 1767261600
+
+
+def test_parse_statistics_converts_uptime_to_wall_time():
+    """Test that samples are placed relative to the response's device clock."""
+    payload = {
+        "currentTimestamp": 100_000,
+        "labels": ["hashrate", "asicTemp", "unknown", "timestamp"],
+        "statistics": [[1000.0, 55.5, 1, 40_000], [1010.0, None, 2, 70_000], ["bad"]],
+    }
+
+    samples = parse_statistics(payload, received=T0)
+
+    assert samples == [
+        (T0 - 60, {"hashRate": 1000.0, "temp": 55.5}),
+        (T0 - 30, {"hashRate": 1010.0}),
+    ]
+
+
+def test_parse_statistics_rejects_unexpected_payload():
+    """Test that payloads without labels or timestamps are refused."""
+    with pytest.raises(ValueError):
+        parse_statistics({"statistics": []}, received=T0)
+    with pytest.raises(ValueError):
+        parse_statistics({"currentTimestamp": 1, "labels": ["hashrate"], "statistics": []}, received=T0)
+
+
+def test_gap_hours_covers_only_whole_missed_hours():
+    """Test that partly recorded hours are left to the recorder."""
+    assert gap_hours(T0 + 10, T0 + HOUR + 20) is None
+    assert gap_hours(T0 + 10, T0 + 3 * HOUR + 20) == (T0 + HOUR, T0 + 3 * HOUR)
+    assert gap_hours(T0, T0 + HOUR) == (T0, T0 + HOUR)
+
+
+def test_aggregate_hourly_mean_min_max():
+    """Test hourly aggregation within the gap."""
+    samples = [
+        (T0 - 10, {"power": 99.0}),
+        (T0 + 10, {"power": 10.0}),
+        (T0 + 20, {"power": 20.0, "temp": 50.0}),
+        (T0 + HOUR + 5, {"power": 30.0}),
+        (T0 + 2 * HOUR, {"power": 99.0}),
+    ]
+
+    stats = aggregate_hourly(samples, T0, T0 + 2 * HOUR)
+
+    start = datetime.fromtimestamp(T0, timezone.utc)
+    assert stats["power"][0] == {"start": start, "mean": 15.0, "min": 10.0, "max": 20.0}
+    assert stats["power"][1]["mean"] == 30.0
+    assert len(stats["power"]) == 2
+    assert stats["temp"] == [{"start": start, "mean": 50.0, "min": 50.0, "max": 50.0}]
+
+
+def test_poll_succeeded_reports_gaps_and_saves():
+    """Test that last_seen advances and gaps of whole hours are reported."""
+    store = MagicMock()
+    backfill = AxeOSStatisticsBackfill(MagicMock(), MagicMock(), "miner", {}, store)
+
+    assert backfill.poll_succeeded(T0 + 10) is None
+    assert backfill.poll_succeeded(T0 + 40) is None
+    assert backfill.poll_succeeded(T0 + 2 * HOUR + 5) == (T0 + HOUR, T0 + 2 * HOUR)
+    assert backfill.last_seen == T0 + 2 * HOUR + 5
+    assert store.async_delay_save.call_count == 3
+
+    backfill.unsupported = True
+    assert backfill.poll_succeeded(T0 + 5 * HOUR) is None
+
+
+@pytest.mark.asyncio
+async def test_get_statistics_from_simulator(miner, session):
+    """Test fetching the statistics buffer with column selection."""
+    sim, host = miner
+    sim.record_statistics(timestamp=1000)
+    sim.record_statistics(timestamp=6000)
+    api = AxeOSAPI(session, host)
+
+    payload = await api.get_statistics(STATISTICS_COLUMNS)
+
+    assert payload["labels"] == ["hashrate", "asicTemp", "vrTemp", "power", "fanSpeed", "timestamp"]
+    assert [row[-1] for row in payload["statistics"]] == [1000, 6000]
+    samples = parse_statistics(payload, received=T0)
+    assert samples[0][1]["hashRate"] == round(sim.hashrate(), 2)
+    assert samples[1][0] - samples[0][0] == pytest.approx(5)
+
+
+@pytest.mark.asyncio
+async def test_get_statistics_returns_none_when_unsupported(miner, session):
+    """Test that a failing statistics request is not raised."""
+    sim, host = miner
+    sim.faults.append("error")
+    api = AxeOSAPI(session, host)
+
+    assert await api.get_statistics() is None
+    assert api.stats["outcomes"]["http_error"] == 1
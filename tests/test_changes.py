@@ -0,0 +1,49 @@
+"""Tests for the AxeOS HA Integration snapshot diffs."""
+from custom_components.axeos_ha_integration.changes import diff_snapshots
+
+
+def test_diff_unchanged():
+    """Test that identical snapshots produce no changes."""
+    data = {"foundBlocks": 0, "stratum": {"usingFallback": False}}
+
+    assert diff_snapshots(data, dict(data)) == {}
+
+
+def test_diff_changed_fields():
+    """Test that only changed fields are reported with old and new values."""
+    old = {"foundBlocks": 0, "version": "v2.4.0", "power": 15.0}
+    new = {"foundBlocks": 1, "version": "v2.5.0", "power": 15.0}
+
+    assert diff_snapshots(old, new) == {
+        "foundBlocks": {"old": 0, "new": 1},
+        "version": {"old": "v2.4.0", "new": "v2.5.0"},
+    }
+
+
+def test_diff_nested_paths():
+    """Test that nested objects are reported with dotted paths."""
+    old = {"stratum": {"usingFallback": False, "poolMode": "solo"}}
+    new = {"stratum": {"usingFallback": True, "poolMode": "solo"}}
+
+    assert diff_snapshots(old, new) == {
+        "stratum.usingFallback": {"old": False, "new": True},
+    }
+
+
+def test_diff_added_and_removed_fields():
+    """Test fields that appear or disappear between polls."""
+    old = {"isUsingFallbackStratum": 0, "lastResetReason": "Power on"}
+    new = {"isUsingFallbackStratum": 0, "foundBlocks": 1}
+
+    assert diff_snapshots(old, new) == {
+        "foundBlocks": {"old": None, "new": 1},
+        "lastResetReason": {"old": "Power on", "new": None},
+    }
+
+
+def test_diff_ignores_derived_keys():
+    """Test that ignored top-level keys are skipped."""
+    old = {"hashRate": 500.0, "hashrate_history": [500.0]}
+    new = {"hashRate": 500.0}
+
+    assert diff_snapshots(old, new, ignore=("hashrate_history",)) == {}
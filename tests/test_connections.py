@@ -0,0 +1,59 @@
+"""Connection reuse and release tests against the simulated miner."""
+import pytest
+import pytest_asyncio
+
+from custom_components.axeos_ha_integration.api import AxeOSAPI, create_session
+
+
+@pytest_asyncio.fixture
+async def pooled_session():
+    """Create the integration's dedicated session."""
+    session = create_session()
+    yield session
+    await session.close()
+
+
+def _acquired(session) -> int:
+    """Connections currently checked out of the pool."""
+    return len(session.connector._acquired)
+
+
+@pytest.mark.asyncio
+async def test_connections_are_reused(miner, pooled_session):
+    """Test that polls and writes share one kept-alive connection."""
+    _sim, host = miner
+    api = AxeOSAPI(pooled_session, host)
+
+    for _ in range(3):
+        assert await api.get_system_info() is not None
+    assert await api.set_frequency(500) is True
+    assert await api.get_system_info() is not None
+
+    assert api.stats["connections_opened"] == 1
+    assert api.stats["connections_reused"] == 4
+    assert _acquired(pooled_session) == 0
+
+
+@pytest.mark.asyncio
+async def test_connections_released_under_faults(miner, pooled_session):
+    """Test that error, hang and disconnect faults never leak a connection."""
+    sim, host = miner
+    api = AxeOSAPI(pooled_session, host, connect_timeout=0.2, read_timeout=0.2, poll_budget=0)
+
+    # aiohttp transparently resends a GET once when a kept-alive connection
+    # turns out to be closed, so the disconnect has to happen twice
+    sim.faults = ["error", "hang", "disconnect", "disconnect"]
+    for _ in range(3):
+        assert await api.get_system_info() is None
+        assert _acquired(pooled_session) == 0
+
+    sim.faults = ["error", "hang", "disconnect"]
+    for _ in range(3):
+        assert await api.set_fanspeed(50) is False
+        assert _acquired(pooled_session) == 0
+
+    assert await api.get_system_info() is not None
+    assert api.stats["outcomes"]["http_error"] == 2
+    assert api.stats["outcomes"]["timeout"] == 2
+    assert api.stats["outcomes"]["connection_error"] == 2
+    assert api.stats["write_failures"] == 3
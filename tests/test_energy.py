@@ -0,0 +1,93 @@
+"""Tests for the energy accumulation."""
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from custom_components.axeos_ha_integration.energy import EnergyMeter
+from custom_components.axeos_ha_integration.sensor import AxeOSEnergySensor
+
+
+def test_constant_power():
+    """Test one hour at 15 W."""
+    meter = EnergyMeter(max_gap=300)
+    for step in range(361):
+        meter.add({"power": 15.0}, now=step * 10)
+    assert meter.total == pytest.approx(15.0)
+    assert meter.kwh == pytest.approx(0.015)
+
+
+def test_trapezoid_between_samples():
+    """Test that a ramp is integrated with the trapezoid rule."""
+    meter = EnergyMeter(max_gap=3600)
+    meter.add({"power": 10.0}, now=0)
+    meter.add({"power": 20.0}, now=3600)
+    assert meter.total == pytest.approx(15.0)
+
+
+def test_missed_polls_are_bridged():
+    """Test that a short gap of failed polls is still integrated."""
+    meter = EnergyMeter(max_gap=300)
+    meter.add({"power": 12.0}, now=0)
+    meter.add({"power": 12.0}, now=120)
+    assert meter.total == pytest.approx(12.0 * 120 / 3600)
+    assert meter.skipped == 0
+
+
+def test_offline_gap_is_skipped():
+    """Test that nothing is added across a gap longer than max_gap."""
+    meter = EnergyMeter(max_gap=300)
+    meter.add({"power": 12.0}, now=0)
+    meter.add({"power": 12.0}, now=3600)
+    assert meter.total == 0
+    assert meter.skipped == 3600
+    meter.add({"power": 12.0}, now=3610)
+    assert meter.total == pytest.approx(12.0 * 10 / 3600)
+
+
+def test_reboot_inside_gap_counts_uptime_only():
+    """Test that only the time since a reboot is counted."""
+    meter = EnergyMeter(max_gap=300)
+    meter.add({"power": 12.0, "uptimeSeconds": 5000}, now=0)
+    meter.add({"power": 6.0, "uptimeSeconds": 60}, now=200)
+    assert meter.total == pytest.approx(6.0 * 60 / 3600)
+    assert meter.skipped == 140
+
+
+def test_invalid_power_is_ignored():
+    """Test that missing and negative readings leave the total alone."""
+    meter = EnergyMeter(max_gap=300)
+    meter.add({"power": 10.0}, now=0)
+    meter.add({"power": None}, now=10)
+    meter.add({"power": -1}, now=20)
+    meter.add({}, now=30)
+    meter.add({"power": 10.0}, now=40)
+    assert meter.total == pytest.approx(10.0 * 40 / 3600)
+
+
+def test_restore_continues_total():
+    """Test that the meter continues from a restored total."""
+    meter = EnergyMeter(max_gap=300)
+    meter.add({"power": 36.0}, now=0)
+    meter.restore(2.5)
+    meter.restore(2.5)
+    assert meter.kwh == pytest.approx(2.5)
+    meter.add({"power": 36.0}, now=100)
+    assert meter.kwh == pytest.approx(2.501)
+
+
+@pytest.mark.asyncio
+async def test_energy_sensor_restores_state():
+    """Test that the sensor seeds the meter from the last stored value."""
+    coordinator = MagicMock()
+    meter = EnergyMeter(max_gap=300)
+    sensor = AxeOSEnergySensor(coordinator, "entry", "miner", meter)
+    sensor.hass = MagicMock()
+    sensor.async_write_ha_state = MagicMock()
+    sensor.async_get_last_sensor_data = AsyncMock(return_value=SimpleNamespace(native_value="12.3456"))
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr("homeassistant.helpers.update_coordinator.CoordinatorEntity.async_added_to_hass", AsyncMock())
+        await sensor.async_added_to_hass()
+    assert sensor.native_value == 12.3456
+    assert sensor.unique_id == "miner_energy"
+    assert sensor.available
@@ -0,0 +1,118 @@
+"""Tests for the AxeOS HA Integration OpenMetrics exporter."""
+import time
+from unittest.mock import MagicMock
+
+from custom_components.axeos_ha_integration.exporter import _LabelCache, render_metrics
+
+
+def make_entry(name: str, host: str, data: dict, success: bool = True) -> dict:
+    """Create integration data for one miner."""
+    coordinator = MagicMock()
+    coordinator.data = data
+    coordinator.last_update_success = success
+    api = MagicMock()
+    api.stats = {
+        "polls": 10,
+        "poll_failures": 1,
+        "consecutive_failures": 0,
+        "poll_seconds_total": 0.5,
+        "last_poll_seconds": 0.04,
+        "retries": 2,
+        "outcomes": {"ok": 9, "timeout": 3},
+    }
+    return {"coordinator": coordinator, "api": api, "name": name, "host": host}
+
+
+def test_render_metrics_format():
+    """Test families, labels, counter suffixes and the EOF marker."""
+    fleet = {
+        "e1": make_entry(
+            "Gamma",
+            "192.168.1.100",
+            {
+                "hashRate": 1100.5,
+                "hashRate_1m": 1090,
+                "temp": 55.5,
+                "vrTemp": 61.0,
+                "sharesAccepted": 42,
+                "overheat_mode": 0,
+                "anomaly": {"hashrate": True},
+                "version": "v2.4.0",
+            },
+        ),
+    }
+
+    body = render_metrics(fleet, _LabelCache())
+    lines = body.splitlines()
+    labels = 'miner="Gamma",host="192.168.1.100"'
+
+    assert lines[-1] == "# EOF"
+    assert f"axeos_up{{{labels}}} 1" in lines
+    assert f'axeos_hashrate_ghs{{{labels},window="current"}} 1100.5' in lines
+    assert f'axeos_hashrate_ghs{{{labels},window="1m"}} 1090' in lines
+    assert f'axeos_temperature_celsius{{{labels},sensor="vr"}} 61.0' in lines
+    assert "# TYPE axeos_shares_accepted counter" in lines
+    assert f"axeos_shares_accepted_total{{{labels}}} 42" in lines
+    assert f'axeos_anomaly{{{labels},metric="hashrate"}} 1' in lines
+    assert f"axeos_poll_duration_seconds_count{{{labels}}} 10" in lines
+    assert f"axeos_poll_failures_total{{{labels}}} 1" in lines
+    assert f"axeos_poll_retries_total{{{labels}}} 2" in lines
+    assert f'axeos_requests_total{{{labels},outcome="timeout"}} 3' in lines
+    # Missing and non-numeric fields produce no sample
+    assert "window=\"1d\"" not in body
+    assert "v2.4.0" not in body
+
+
+def test_render_metrics_groups_families():
+    """Test that all samples of a family are contiguous across miners."""
+    fleet = {
+        f"e{i}": make_entry(f"m{i}", f"10.0.0.{i}", {"power": 15.0, "temp": 50.0})
+        for i in range(3)
+    }
+
+    lines = render_metrics(fleet, _LabelCache()).splitlines()
+
+    power = [i for i, line in enumerate(lines) if line.startswith("axeos_power_watts{")]
+    assert power == list(range(power[0], power[0] + 3))
+
+
+def test_render_metrics_offline_miner_and_escaping():
+    """Test an offline miner without data and label escaping."""
+    fleet = {"e1": make_entry('Rack "A"', "10.0.0.1", None, success=False)}
+
+    body = render_metrics(fleet, _LabelCache())
+
+    assert 'axeos_up{miner="Rack \\"A\\"",host="10.0.0.1"} 0' in body
+
+
+def test_render_metrics_non_finite_values():
+    """Test that NaN and infinities use the OpenMetrics spelling."""
+    fleet = {
+        "e1": make_entry(
+            "m", "10.0.0.1", {"power": float("nan"), "temp": float("inf"), "vrTemp": float("-inf")}
+        )
+    }
+
+    lines = render_metrics(fleet, _LabelCache()).splitlines()
+    labels = 'miner="m",host="10.0.0.1"'
+
+    assert f"axeos_power_watts{{{labels}}} NaN" in lines
+    assert f'axeos_temperature_celsius{{{labels},sensor="chip"}} +Inf' in lines
+    assert f'axeos_temperature_celsius{{{labels},sensor="vr"}} -Inf' in lines
+
+
+def test_render_metrics_large_fleet_is_fast():
+    """Test that a 500-miner scrape renders quickly."""
+    data = {
+        "hashRate": 1100.5, "hashRate_1m": 1090.0, "hashRate_10m": 1095.0, "hashRate_1h": 1099.0,
+        "hashRate_1d": 1101.0, "power": 15.2, "voltage": 5000, "current": 3000.0, "temp": 55.5,
+        "vrTemp": 61.0, "fanspeed": 80, "fanrpm": 4200, "sharesAccepted": 4242,
+        "sharesRejected": 3, "uptimeSeconds": 86400, "frequency": 525, "coreVoltage": 1150,
+    }
+    fleet = {f"e{i}": make_entry(f"m{i}", f"10.0.{i // 250}.{i % 250}", data) for i in range(500)}
+    cache = _LabelCache()
+    render_metrics(fleet, cache)
+
+    started = time.perf_counter()
+    render_metrics(fleet, cache)
+    assert time.perf_counter() - started < 0.5
@@ -0,0 +1,133 @@
+"""Tests for the integration-side fan control loop."""
+import pytest
+
+from custom_components.axeos_ha_integration.api import AxeOSAPI
+from custom_components.axeos_ha_integration.fan_control import (
+    HANDOVER_OVERHEAT,
+    HANDOVER_STALE,
+    HANDOVER_STOPPED,
+    HANDOVER_WRITE_FAILED,
+    AxeOSFanController,
+    FanControlSettings,
+)
+
+
+def snapshot(temp=60.0, vr_temp=60.0, fanspeed=50, frequency=525):
+    return {"temp": temp, "vrTemp": vr_temp, "fanspeed": fanspeed, "frequency": frequency}
+
+
+def test_takes_over_from_current_speed():
+    """Test that the first snapshot disables auto fan without changing the speed."""
+    controller = AxeOSFanController()
+    assert controller.update(snapshot(fanspeed=47), now=0) == {"autofanspeed": False, "fanspeed": 47}
+    assert controller.state["active"] is True
+
+
+def test_hot_miner_speeds_fan_up():
+    """Test that a temperature above target raises the output."""
+    controller = AxeOSFanController(FanControlSettings(min_write_interval=0))
+    controller.update(snapshot(temp=60), now=0)
+    command = controller.update(snapshot(temp=64), now=30)
+    assert command["fanspeed"] > 50
+
+
+def test_vr_temperature_counts_too():
+    """Test that the worse of chip and VR error drives the loop."""
+    controller = AxeOSFanController(FanControlSettings(min_write_interval=0))
+    controller.update(snapshot(temp=50), now=0)
+    command = controller.update(snapshot(temp=50, vr_temp=80), now=30)
+    assert command["fanspeed"] > 50
+
+
+def test_hysteresis_and_rate_limit():
+    """Test that small changes and writes in quick succession are suppressed."""
+    controller = AxeOSFanController(FanControlSettings(hysteresis=3, min_write_interval=60))
+    controller.update(snapshot(temp=60), now=0)
+    # About +2 %
+    assert controller.update(snapshot(temp=60.25), now=60) is None
+    assert controller.update(snapshot(temp=65), now=90)["fanspeed"] >= 53
+    # Large change, but too soon after the last write
+    assert controller.update(snapshot(temp=68), now=120) is None
+    assert "fanspeed" in controller.update(snapshot(temp=68), now=150)
+
+
+def test_output_is_clamped_without_windup():
+    """Test that a long saturation does not delay the way back down."""
+    settings = FanControlSettings(min_write_interval=0, hysteresis=1)
+    controller = AxeOSFanController(settings)
+    controller.update(snapshot(temp=60, fanspeed=100), now=0)
+    for step in range(1, 100):
+        controller.update(snapshot(temp=69), now=step * 30)
+    assert controller.state["output"] == settings.max_speed
+    command = controller.update(snapshot(temp=55), now=100 * 30)
+    assert command["fanspeed"] < settings.max_speed
+
+
+def test_overheat_hands_over_until_back_at_target():
+    """Test the failsafe handover and the conditions to take over again."""
+    controller = AxeOSFanController(FanControlSettings(min_write_interval=0))
+    controller.update(snapshot(), now=0)
+    assert controller.update(snapshot(temp=71), now=30) == {"autofanspeed": True}
+    assert controller.state == {"active": False, "output": None, "error": 11.0, "handover": HANDOVER_OVERHEAT}
+    assert controller.update(snapshot(temp=65), now=60) is None
+    assert controller.update(snapshot(temp=59), now=90)["autofanspeed"] is False
+
+
+def test_stale_data_hands_over_once():
+    """Test the handover when polls stopped arriving."""
+    controller = AxeOSFanController(FanControlSettings(stale_timeout=180))
+    controller.update(snapshot(), now=0)
+    assert controller.check_stale(last_update=0, now=100) is None
+    assert controller.check_stale(last_update=0, now=200) == {"autofanspeed": True}
+    assert controller.state["handover"] == HANDOVER_STALE
+    assert controller.check_stale(last_update=0, now=300) is None
+
+
+def test_frequency_throttle_and_restore():
+    """Test stepping the frequency down at full fan and restoring it on handover."""
+    settings = FanControlSettings(
+        throttle_frequency=True, min_write_interval=0, frequency_interval=300, frequency_step=25
+    )
+    controller = AxeOSFanController(settings)
+    controller.update(snapshot(temp=60, fanspeed=100), now=0)
+    assert controller.update(snapshot(temp=66), now=300)["frequency"] == 500
+    assert "frequency" not in (controller.update(snapshot(temp=66), now=400) or {})
+    assert controller.update(snapshot(temp=66), now=600)["frequency"] == 475
+    assert controller.release() == {"autofanspeed": True, "frequency": 525}
+    assert controller.state["handover"] == HANDOVER_STOPPED
+
+
+def test_invalid_settings():
+    """Test the settings validation."""
+    with pytest.raises(ValueError):
+        FanControlSettings(min_speed=80, max_speed=50)
+    with pytest.raises(ValueError):
+        FanControlSettings(target_temp=70, failsafe_temp=65)
+
+
+@pytest.mark.asyncio
+async def test_closed_loop_holds_target(miner, session):
+    """Test that the loop settles the simulated miner at the target temperature."""
+    sim, host = miner
+    api = AxeOSAPI(session, host)
+    controller = AxeOSFanController(FanControlSettings(target_temp=60, min_write_interval=0, hysteresis=1))
+    for step in range(200):
+        data = await api.get_system_info()
+        if command := controller.update(data, now=step * 30):
+            assert await controller.async_apply(api, command)
+    assert sim.settings["autofanspeed"] is False
+    assert sim.temp() == pytest.approx(60, abs=1)
+    assert 25 < sim.fanspeed < 100
+
+
+@pytest.mark.asyncio
+async def test_failed_write_hands_over(miner, session):
+    """Test that a rejected fan speed gives control back to the firmware."""
+    sim, host = miner
+    api = AxeOSAPI(session, host)
+    controller = AxeOSFanController()
+    command = controller.update(snapshot(), now=0)
+    sim.faults.extend(["ok", "error"])
+    assert not await controller.async_apply(api, command)
+    assert controller.state["handover"] == HANDOVER_WRITE_FAILED
+    assert sim.settings["autofanspeed"] is True
@@ -0,0 +1,67 @@
+"""Tests for the fleet snapshot query."""
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from custom_components.axeos_ha_integration.const import DOMAIN
+from custom_components.axeos_ha_integration.fleet import async_get_fleet_snapshot
+
+
+def make_hass():
+    hass = MagicMock()
+    hass.data = {
+        DOMAIN: {
+            "a": {
+                "coordinator": SimpleNamespace(
+                    data={
+                        "hashRate": 1000.0,
+                        "power": 15.0,
+                        "stratum": {"usingFallback": False},
+                        "hashrate_history": [1000.0],
+                    },
+                    last_update_success=True,
+                ),
+                "name": "Alpha",
+                "host": "10.0.0.1",
+            },
+            "b": {
+                "coordinator": SimpleNamespace(data={"hashRate": 900.0, "temp": 60.0}, last_update_success=False),
+                "name": "Beta",
+                "host": "10.0.0.2",
+            },
+            # Entry still setting up
+            "c": {},
+        }
+    }
+    return hass
+
+
+def test_snapshot_is_columnar_over_all_fields():
+    """Test that every miner is a row and every known field a column."""
+    snapshot = async_get_fleet_snapshot(make_hass())
+
+    columns = snapshot["columns"]
+    assert snapshot["count"] == 2
+    assert list(columns) == ["entry_id", "name", "host", "available", "hashRate", "power", "stratum", "temp"]
+    assert columns["name"] == ["Alpha", "Beta"]
+    assert columns["available"] == [True, False]
+    assert columns["power"] == [15.0, None]
+    assert columns["temp"] == [None, 60.0]
+
+
+def test_snapshot_filters_and_selects_fields():
+    """Test entry filters, availability filter and dotted field selection."""
+    hass = make_hass()
+
+    snapshot = async_get_fleet_snapshot(hass, fields=["hashRate", "stratum.usingFallback"], available_only=True)
+    assert snapshot["columns"] == {
+        "entry_id": ["a"],
+        "name": ["Alpha"],
+        "host": ["10.0.0.1"],
+        "available": [True],
+        "hashRate": [1000.0],
+        "stratum.usingFallback": [False],
+    }
+
+    snapshot = async_get_fleet_snapshot(hass, entry_ids={"b"}, fields=["hashRate"])
+    assert snapshot["count"] == 1
+    assert snapshot["columns"]["hashRate"] == [900.0]
@@ -0,0 +1,69 @@
+"""Tests for the fleet polling command line tool."""
+import io
+import json
+
+import pytest
+
+from custom_components.axeos_ha_integration.fleetpoll import (
+    async_poll_fleet,
+    expand_targets,
+    format_summary,
+    percentile,
+)
+
+
+def test_expand_targets():
+    """Test CIDR expansion, ports and de-duplication."""
+    assert expand_targets(["10.0.0.0/30", "10.0.0.1", "miner.local"]) == ["10.0.0.1", "10.0.0.2", "miner.local"]
+    assert expand_targets(["127.0.0.1/32", "127.0.0.1:81"], port=80) == ["127.0.0.1:80", "127.0.0.1:81"]
+
+
+def test_expand_targets_limit():
+    """Test that an oversized range is refused."""
+    with pytest.raises(ValueError):
+        expand_targets(["10.0.0.0/16"], max_hosts=1024)
+
+
+def test_percentile():
+    """Test the nearest-rank percentile."""
+    values = [float(value) for value in range(1, 101)]
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile(values, 100) == 100
+    assert percentile([], 50) is None
+
+
+@pytest.mark.asyncio
+async def test_poll_fleet_against_simulators(fleet):
+    """Test a benchmark run over three simulated miners, one of them failing."""
+    hosts = [host for _sim, host in fleet]
+    fleet[2][0].faults.extend(["error"] * 20)
+    ndjson = io.StringIO()
+    summary = await async_poll_fleet(hosts, rounds=2, read_timeout=1, ndjson=ndjson)
+
+    assert summary["polls"] == 6
+    assert summary["succeeded"] == 4
+    assert summary["failed"] == 2
+    assert summary["attempts"]["ok"] == 4
+    assert summary["attempts"]["http_error"] >= 2
+    assert summary["latency_ms"]["p50"] is not None
+    assert summary["unreachable"] == [hosts[2]]
+
+    records = [json.loads(line) for line in ndjson.getvalue().splitlines()]
+    assert len(records) == 6
+    assert {record["host"] for record in records} == set(hosts)
+    for record in records:
+        if record["host"] == hosts[2]:
+            assert record["error"] == "http_error"
+        else:
+            assert record["data"]["macAddr"]
+    assert "Throughput" in format_summary(summary)
+
+
+@pytest.mark.asyncio
+async def test_poll_fleet_unreachable_host():
+    """Test that a closed port ends up in the unreachable list."""
+    summary = await async_poll_fleet(["127.0.0.1:9"], connect_timeout=0.5, read_timeout=0.5)
+    assert summary["failed"] == 1
+    assert summary["unreachable"] == ["127.0.0.1:9"]
+    assert summary["attempts"]["connection_error"] >= 1
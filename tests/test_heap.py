@@ -0,0 +1,131 @@
+"""Tests for the free heap forecast."""
+from datetime import datetime
+
+import pytest
+
+from custom_components.axeos_ha_integration.heap import HeapForecaster, SlidingRegression
+
+
+def leaking(forecaster, start=0, steps=120, heap=200_000, rate=1000, interval=60, uptime=1000):
+    """Feed a heap shrinking by ``rate`` bytes per hour; returns the last state."""
+    state = None
+    for step in range(steps):
+        at = start + step * interval
+        state = forecaster.update(
+            {"freeHeap": heap - rate * at / 3600, "uptimeSeconds": uptime + at}, now=at
+        )
+    return state
+
+
+def test_regression_recovers_line():
+    """Test the fitted slope and value of an exact line."""
+    regression = SlidingRegression(window=3600)
+    for step in range(10):
+        regression.add(1000 + step * 10, 50 - 2 * step * 10)
+    slope, fitted = regression.fit()
+    assert slope == pytest.approx(-2)
+    assert fitted == pytest.approx(50 - 2 * 90)
+
+
+def test_regression_rebases_origin():
+    """Test that the origin follows the window over a long uptime."""
+    regression = SlidingRegression(window=3600)
+    start = 1_000_000_000
+    for step in range(10 * 24 * 60):
+        at = start + step * 60
+        regression.add(at, 5e6 - 0.25 * (at - start))
+    assert regression._samples[0][0] <= 3600
+    assert regression._samples[-1][0] <= 2 * 3600
+    slope, fitted = regression.fit()
+    assert slope == pytest.approx(-0.25)
+    assert fitted == pytest.approx(5e6 - 0.25 * (10 * 24 * 60 - 1) * 60)
+
+
+def test_regression_drops_samples_outside_window():
+    """Test that only the last window is fitted after a change of trend."""
+    regression = SlidingRegression(window=100)
+    for at in range(0, 200, 10):
+        regression.add(at, at)
+    for at in range(200, 400, 10):
+        regression.add(at, 200 - (at - 200))
+    assert regression.span == 100
+    assert regression.fit()[0] == pytest.approx(-1)
+
+
+def test_forecast_of_steady_leak():
+    """Test leak rate and hours left for a constant leak."""
+    forecaster = HeapForecaster(floor=16_000)
+    state = leaking(forecaster)
+    assert state["leak_rate"] == pytest.approx(1000)
+    # 200000 - 1000 * 119 / 60 bytes left at the last sample
+    remaining = 200_000 - 1000 * 119 / 60 - 16_000
+    assert state["hours_to_exhaustion"] == pytest.approx(remaining / 1000, abs=0.1)
+
+
+def test_no_forecast_until_enough_history():
+    """Test that a short window gives no forecast."""
+    forecaster = HeapForecaster()
+    state = leaking(forecaster, steps=30)
+    assert state == {"hours_to_exhaustion": None, "leak_rate": None}
+
+
+def test_stable_heap_has_no_exhaustion():
+    """Test a flat heap: no leak, no forecast."""
+    forecaster = HeapForecaster()
+    state = leaking(forecaster, rate=0)
+    assert state == {"hours_to_exhaustion": None, "leak_rate": 0.0}
+
+
+def test_reboot_starts_over():
+    """Test that an uptime reset clears the fit."""
+    forecaster = HeapForecaster()
+    leaking(forecaster)
+    state = forecaster.update({"freeHeap": 200_000, "uptimeSeconds": 5}, now=10_000)
+    assert state["hours_to_exhaustion"] is None
+    assert len(forecaster.regression) == 1
+
+
+def test_restart_waits_for_window():
+    """Test that a distant exhaustion waits for the low-impact window, once per boot."""
+    forecaster = HeapForecaster()
+    forecaster.state = {"hours_to_exhaustion": 20.0, "leak_rate": 1000.0}
+    assert not forecaster.restart_due(datetime(2024, 1, 1, 12, 0), threshold=24, window_start=3)
+    assert forecaster.restart_due(datetime(2024, 1, 2, 3, 30), threshold=24, window_start=3)
+    assert not forecaster.restart_due(datetime(2024, 1, 2, 4, 0), threshold=24, window_start=3)
+
+
+def test_restart_above_threshold_never_due():
+    """Test that a forecast beyond the threshold is ignored."""
+    forecaster = HeapForecaster()
+    forecaster.state = {"hours_to_exhaustion": 48.0, "leak_rate": 100.0}
+    assert not forecaster.restart_due(datetime(2024, 1, 2, 3, 30), threshold=24, window_start=3)
+
+
+def test_restart_right_away_before_window():
+    """Test that exhaustion before the next window restarts immediately."""
+    forecaster = HeapForecaster()
+    forecaster.state = {"hours_to_exhaustion": 5.0, "leak_rate": 5000.0}
+    assert forecaster.restart_due(datetime(2024, 1, 1, 12, 0), threshold=24, window_start=3)
+
+
+def test_restart_allowed_again_after_reboot():
+    """Test that a reboot re-arms the preemptive restart."""
+    forecaster = HeapForecaster()
+    forecaster.update({"freeHeap": 100_000, "uptimeSeconds": 1000}, now=0)
+    forecaster.state = {"hours_to_exhaustion": 5.0, "leak_rate": 5000.0}
+    assert forecaster.restart_due(datetime(2024, 1, 1, 12, 0), threshold=24, window_start=3)
+    forecaster.update({"freeHeap": 200_000, "uptimeSeconds": 10}, now=60)
+    forecaster.state = {"hours_to_exhaustion": 5.0, "leak_rate": 5000.0}
+    assert forecaster.restart_due(datetime(2024, 1, 1, 12, 1), threshold=24, window_start=3)
+
+
+def test_failed_restart_retried_in_next_window():
+    """Test that a restart that did not reboot the miner is requested again in the next window."""
+    forecaster = HeapForecaster()
+    forecaster.update({"freeHeap": 100_000, "uptimeSeconds": 1000}, now=0)
+    forecaster.state = {"hours_to_exhaustion": 20.0, "leak_rate": 1000.0}
+    assert forecaster.restart_due(datetime(2024, 1, 2, 3, 30), threshold=24, window_start=3)
+    forecaster.update({"freeHeap": 99_000, "uptimeSeconds": 2000}, now=1000)
+    forecaster.state = {"hours_to_exhaustion": 19.0, "leak_rate": 1000.0}
+    assert not forecaster.restart_due(datetime(2024, 1, 2, 3, 45), threshold=24, window_start=3)
+    assert forecaster.restart_due(datetime(2024, 1, 3, 3, 15), threshold=24, window_start=3)
@@ -0,0 +1,92 @@
+"""Tests for setting up and unloading config entries."""
+import asyncio
+from dataclasses import asdict
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from custom_components.axeos_ha_integration import async_unload_entry, system_info_fields
+from custom_components.axeos_ha_integration.api import AxeOSAPI
+from custom_components.axeos_ha_integration.autotune import STATUS_STOPPED, AutotuneSettings, AxeOSAutotuner
+from custom_components.axeos_ha_integration.const import DATA_FLEET, DERIVED_DATA_KEYS, DOMAIN
+from custom_components.axeos_ha_integration.fan_control import HANDOVER_STOPPED, AxeOSFanController
+
+
+@pytest.mark.asyncio
+async def test_unload_last_entry_releases_fan_before_closing_session(miner, session):
+    """Test that the fan goes back to the firmware while the shared session is still open."""
+    sim, host = miner
+    api = AxeOSAPI(session, host)
+    controller = AxeOSFanController()
+    assert await controller.async_apply(api, controller.update(await api.get_system_info(), now=0))
+    assert sim.settings["autofanspeed"] is False
+
+    hass = MagicMock()
+    hass.config_entries.async_unload_platforms = AsyncMock(return_value=True)
+    hass.data = {
+        DOMAIN: {"entry": {"api": api, "fan_controller": controller}},
+        DATA_FLEET: {"session": session, "session_unsub": MagicMock()},
+    }
+    entry = MagicMock(entry_id="entry")
+
+    assert await async_unload_entry(hass, entry)
+
+    assert sim.settings["autofanspeed"] is True
+    assert controller.state["handover"] == HANDOVER_STOPPED
+    assert session.closed
+
+
+
+@pytest.mark.asyncio
+async def test_unload_last_entry_stops_autotune_before_closing_session(miner, session):
+    """Test that a running autotune restores the original setpoint while the session is open."""
+    sim, host = miner
+    original = (sim.frequency, sim.core_voltage)
+    api = AxeOSAPI(session, host)
+    settings = AutotuneSettings(
+        min_frequency=400, max_frequency=450, min_voltage=1100, max_voltage=1150, settle_time=60, sample_interval=0.05
+    )
+    # A resumed run whose baseline is already measured goes straight to the sweep
+    tuner = AxeOSAutotuner(api)
+    tuner.state = {
+        "status": STATUS_STOPPED,
+        "settings": asdict(settings),
+        "original": {"frequency": original[0], "voltage": original[1]},
+        "results": {
+            f"{original[0]}:{original[1]}": {
+                "frequency": original[0], "voltage": original[1], "stable": True, "reason": "stable"
+            }
+        },
+        "best": None,
+        "started": 0,
+        "finished": None,
+    }
+    tuner.task = asyncio.create_task(tuner.async_run(settings))
+    while (sim.frequency, sim.core_voltage) == original:
+        await asyncio.sleep(0.05)
+    assert (sim.frequency, sim.core_voltage) != original
+
+    hass = MagicMock()
+    hass.config_entries.async_unload_platforms = AsyncMock(return_value=True)
+    hass.data = {
+        DOMAIN: {"entry": {"api": api, "autotuner": tuner}},
+        DATA_FLEET: {"session": session, "session_unsub": MagicMock()},
+    }
+
+    assert await async_unload_entry(hass, MagicMock(entry_id="entry"))
+
+    assert tuner.status == STATUS_STOPPED
+    assert (sim.frequency, sim.core_voltage) == original
+    assert session.closed
+
+def test_system_info_fields_are_top_level():
+    """Test that the projection keeps top-level keys only."""
+    fields = system_info_fields()
+
+    assert {"power", "hashRate", "stratum", "autofanspeed", "frequency", "isUsingFallbackStratum"} <= fields
+    # Alternatives of one sensor are all kept
+    assert {"ip", "hostip"} <= fields
+    # Children of nested objects and keys the integration adds are not
+    assert not fields & {"poolMode", "activePoolMode", "usingFallback", "hours_to_exhaustion", "leak_rate"}
+    assert not fields & set(DERIVED_DATA_KEYS)
+    assert not any("." in field for field in fields)
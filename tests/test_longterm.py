@@ -0,0 +1,115 @@
+"""Tests for the in-memory hourly statistics."""
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from homeassistant.components.recorder.statistics import valid_statistic_id
+
+from custom_components.axeos_ha_integration.longterm import MAX_PENDING_HOURS, HourlyStatistics
+
+HOUR = 3600
+# 2026-01-01 10:00 UTC
+T0 = 1767261600
+
+LABELS = {"hashRate": ("Current Hashrate", "GH/s"), "power": ("Power Consumption", "W")}
+
+
+def make_hourly(components=("recorder",), host_id="192_168_1_100"):
+    hass = MagicMock()
+    hass.config.components = set(components)
+    return HourlyStatistics(hass, host_id, "Bitaxe", LABELS, keys=("hashRate", "power"))
+
+
+def test_completed_hours_are_aggregated():
+    """Test running mean/min/max per hour; the current hour stays open."""
+    hourly = make_hourly()
+    hourly.add({"hashRate": 1000.0, "power": 15.0, "temp": 60}, now=T0 + 10)
+    hourly.add({"hashRate": 1100.0, "power": None}, now=T0 + 40)
+    hourly.add({"hashRate": 900.0, "power": 17.0}, now=T0 + 70)
+    hourly.add({"hashRate": 500.0}, now=T0 + HOUR + 5)
+
+    rows = hourly.pop_completed(now=T0 + HOUR + 30)
+
+    start = datetime.fromtimestamp(T0, timezone.utc)
+    assert rows == {
+        "hashRate": [{"start": start, "mean": 1000.0, "min": 900.0, "max": 1100.0}],
+        "power": [{"start": start, "mean": 16.0, "min": 15.0, "max": 17.0}],
+    }
+    assert hourly.pop_completed(now=T0 + HOUR + 60) == {}
+    assert hourly.pop_completed(now=T0 + 2 * HOUR)["hashRate"][0]["mean"] == 500.0
+
+
+def test_flush_writes_one_batch_per_metric():
+    """Test that all completed hours of a metric go into one external statistics call."""
+    hourly = make_hourly()
+    for hour in range(3):
+        hourly.add({"hashRate": 1000.0 + hour, "power": 15.0}, now=T0 + hour * HOUR)
+
+    with patch(
+        "custom_components.axeos_ha_integration.longterm.async_add_external_statistics"
+    ) as add_statistics:
+        assert hourly.async_flush(now=T0 + 3 * HOUR) == 6
+
+    assert add_statistics.call_count == 2
+    metadata, rows = add_statistics.call_args_list[0].args[1:]
+    assert metadata["statistic_id"] == "axeos_ha_integration:192_168_1_100_hashrate"
+    assert metadata["source"] == "axeos_ha_integration"
+    assert metadata["name"] == "Bitaxe Current Hashrate"
+    assert metadata["unit_of_measurement"] == "GH/s"
+    assert [row["mean"] for row in rows] == [1000.0, 1001.0, 1002.0]
+
+
+def test_flush_keeps_hours_while_recorder_is_down():
+    """Test that completed hours wait for the recorder, up to a limit."""
+    hourly = make_hourly(components=())
+    for hour in range(MAX_PENDING_HOURS + 5):
+        hourly.add({"power": 15.0}, now=T0 + hour * HOUR)
+
+    with patch(
+        "custom_components.axeos_ha_integration.longterm.async_add_external_statistics"
+    ) as add_statistics:
+        assert hourly.async_flush(now=T0 + 100 * HOUR) == 0
+        add_statistics.assert_not_called()
+
+        hourly.hass.config.components.add("recorder")
+        assert hourly.async_flush(now=T0 + 100 * HOUR) == MAX_PENDING_HOURS
+
+
+@pytest.mark.parametrize(
+    ("host_id", "statistic_id"),
+    [
+        ("192_168_1_100", "axeos_ha_integration:192_168_1_100_hashrate"),
+        ("bitaxe-12_local", "axeos_ha_integration:bitaxe_12_local_hashrate"),
+        ("192_168_1_50:8080", "axeos_ha_integration:192_168_1_50_8080_hashrate"),
+    ],
+)
+def test_statistic_id_is_valid(host_id, statistic_id):
+    """Test that host names and host:port hosts give IDs the recorder accepts."""
+    hourly = make_hourly(host_id=host_id)
+    assert hourly.statistic_id("hashRate") == statistic_id
+    assert valid_statistic_id(statistic_id)
+
+
+def test_failed_import_keeps_hours():
+    """Test that hours are kept for a retry when the import raises."""
+    hourly = make_hourly()
+    for hour in range(2):
+        hourly.add({"hashRate": 1000.0, "power": 15.0}, now=T0 + hour * HOUR)
+
+    with patch(
+        "custom_components.axeos_ha_integration.longterm.async_add_external_statistics",
+        side_effect=[None, ValueError("recorder rejected the rows")],
+    ) as add_statistics:
+        # hashRate is written, power fails
+        assert hourly.async_flush(now=T0 + 2 * HOUR) == 2
+        assert add_statistics.call_count == 2
+
+    with patch(
+        "custom_components.axeos_ha_integration.longterm.async_add_external_statistics"
+    ) as add_statistics:
+        # Only the metric that failed is written again
+        assert hourly.async_flush(now=T0 + 2 * HOUR) == 2
+        assert add_statistics.call_count == 1
+        assert add_statistics.call_args.args[1]["statistic_id"].endswith("_power")
+        assert hourly.async_flush(now=T0 + 2 * HOUR) == 0
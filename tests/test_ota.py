@@ -0,0 +1,109 @@
+"""Tests for rolling firmware updates against simulated miners."""
+import pytest
+
+from custom_components.axeos_ha_integration.api import AxeOSAPI
+from custom_components.axeos_ha_integration.ota import (
+    ROLLOUT_COMPLETED,
+    ROLLOUT_HALTED,
+    STATUS_FAILED,
+    STATUS_NOT_STARTED,
+    STATUS_SKIPPED,
+    STATUS_UPDATED,
+    FirmwareRolloutSettings,
+    async_rollout,
+)
+
+
+@pytest.fixture
+def images(tmp_path):
+    firmware = tmp_path / "esp-miner.bin"
+    firmware.write_bytes(bytes(range(256)) * 1000)
+    www = tmp_path / "www.bin"
+    www.write_bytes(b"w" * 70_000)
+    return str(firmware), str(www)
+
+
+def settings(images, **kwargs):
+    firmware, www = images
+    values = {"firmware": firmware, "www": www, "version": "v2.5.0", "poll_interval": 0.01, "timeout": 2}
+    values.update(kwargs)
+    return FirmwareRolloutSettings(**values)
+
+
+@pytest.mark.asyncio
+async def test_upload_streams_image_with_content_length(miner, session, images):
+    """Test that the image arrives complete with its Content-Length."""
+    sim, host = miner
+    api = AxeOSAPI(session, host)
+
+    assert await api.upload_firmware(images[0])
+    assert await api.upload_firmware(images[1], www=True)
+
+    assert sim.ota_uploads == [
+        ("/api/system/OTA", 256_000, 256_000),
+        ("/api/system/OTAWWW", 70_000, 70_000),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_rollout_updates_canary_then_fleet(fleet, session, images):
+    """Test a full rollout including a miner already on the target version."""
+    for sim, _host in fleet:
+        sim.ota_version = "v2.5.0"
+    fleet[1][0].version = "v2.5.0"
+    fleet[2][0].reboot_seconds = 0.05
+    miners = {f"miner{index}": AxeOSAPI(session, host) for index, (_sim, host) in enumerate(fleet)}
+
+    report = await async_rollout(miners, settings(images, concurrency=2))
+
+    assert report["status"] == ROLLOUT_COMPLETED
+    statuses = {name: result["status"] for name, result in report["miners"].items()}
+    assert statuses == {"miner0": STATUS_UPDATED, "miner1": STATUS_SKIPPED, "miner2": STATUS_UPDATED}
+    assert report["miners"]["miner0"]["previous_version"] == "v2.4.0"
+    # www first, then the firmware that reboots
+    assert [path for path, *_ in fleet[0][0].ota_uploads] == ["/api/system/OTAWWW", "/api/system/OTA"]
+    assert fleet[1][0].ota_uploads == []
+
+
+@pytest.mark.asyncio
+async def test_rollout_keeps_miners_with_the_same_name(fleet, session, images):
+    """Test that miners sharing a display name are all updated and reported."""
+    for sim, _host in fleet:
+        sim.ota_version = "v2.5.0"
+    miners = {f"entry{index}": AxeOSAPI(session, host) for index, (_sim, host) in enumerate(fleet)}
+
+    report = await async_rollout(miners, settings(images, www=None), dict.fromkeys(miners, "BitAxe"))
+
+    assert report["status"] == ROLLOUT_COMPLETED
+    assert list(report["miners"]) == ["entry0", "entry1", "entry2"]
+    for result in report["miners"].values():
+        assert result["name"] == "BitAxe"
+        assert result["status"] == STATUS_UPDATED
+    assert all(sim.ota_uploads for sim, _host in fleet)
+
+
+@pytest.mark.asyncio
+async def test_failed_canary_halts_rollout(fleet, session, images):
+    """Test that a canary coming back with the wrong version stops the rollout."""
+    miners = {f"miner{index}": AxeOSAPI(session, host) for index, (_sim, host) in enumerate(fleet)}
+
+    report = await async_rollout(miners, settings(images, timeout=0.1))
+
+    assert report["status"] == ROLLOUT_HALTED
+    assert report["miners"]["miner0"]["status"] == STATUS_FAILED
+    assert "v2.4.0" in report["miners"]["miner0"]["error"]
+    assert report["miners"]["miner1"]["status"] == STATUS_NOT_STARTED
+    assert fleet[1][0].ota_uploads == fleet[2][0].ota_uploads == []
+
+
+@pytest.mark.asyncio
+async def test_failed_upload_halts_rollout(fleet, session, images):
+    """Test that an upload error fails the miner without waiting for it."""
+    fleet[0][0].faults.extend(["ok", "error"])
+    miners = {f"miner{index}": AxeOSAPI(session, host) for index, (_sim, host) in enumerate(fleet)}
+
+    report = await async_rollout(miners, settings(images, www=None))
+
+    assert report["status"] == ROLLOUT_HALTED
+    assert report["miners"]["miner0"]["error"] == "firmware upload failed"
+    assert report["miners"]["miner1"]["status"] == STATUS_NOT_STARTED
@@ -0,0 +1,113 @@
+"""Tests for the AxeOS HA Integration power budget allocator."""
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from custom_components.axeos_ha_integration.api import AxeOSAPI
+from custom_components.axeos_ha_integration.const import DOMAIN
+from custom_components.axeos_ha_integration.power_budget import (
+    AxeOSPowerBudgetController,
+    BudgetMiner,
+    efficiency_by_model,
+    solve_power_budget,
+)
+
+
+def make_miner(entry_id: str, model: str, power: float, hashrate: float, **kwargs) -> BudgetMiner:
+    """Create a miner running at 500 MHz."""
+    values = {
+        "entry_id": entry_id,
+        "asic_model": model,
+        "frequency": 500,
+        "power": power,
+        "hashrate": hashrate,
+        "voltage": 1200,
+        "min_frequency": 400,
+        "max_frequency": 500,
+    }
+    values.update(kwargs)
+    return BudgetMiner(**values)
+
+
+def test_efficiency_by_model():
+    """Test J/TH aggregation per ASIC model."""
+    miners = [
+        make_miner("a", "BM1370", 15.0, 1000.0),
+        make_miner("b", "BM1370", 17.0, 1000.0),
+        make_miner("c", "BM1366", 20.0, 500.0),
+    ]
+
+    jth = efficiency_by_model(miners)
+
+    assert jth["BM1370"] == 16.0
+    assert jth["BM1366"] == 40.0
+
+
+def test_budget_prefers_efficient_models():
+    """Test that spare budget goes to the most efficient model first."""
+    efficient = make_miner("efficient", "BM1370", 15.0, 1000.0)
+    hungry = make_miner("hungry", "BM1366", 20.0, 500.0)
+
+    # Floors: 12 W + 16 W = 28 W; 3 W left raises only the efficient miner
+    targets, over_budget = solve_power_budget([hungry, efficient], 31.0)
+
+    assert targets == {"efficient": 500, "hungry": 400}
+    assert over_budget == 0
+
+
+def test_budget_fills_partially():
+    """Test that the marginal miner gets the highest frequency that fits."""
+    first = make_miner("first", "BM1370", 15.0, 1000.0)
+    second = make_miner("second", "BM1370", 16.0, 1000.0)
+
+    # Floors: 12 W + 12.8 W; first to 500 MHz (+3 W); second +0.8 W per 25 MHz
+    targets, _ = solve_power_budget([first, second], 29.5)
+
+    assert targets == {"first": 500, "second": 450}
+
+
+def test_budget_keeps_floor_when_over_budget():
+    """Test that miners never drop below their minimum frequency and the excess is reported."""
+    miners = [make_miner("a", "BM1370", 15.0, 1000.0), make_miner("b", "BM1370", 15.0, 1000.0)]
+
+    targets, over_budget = solve_power_budget(miners, 5.0)
+
+    assert targets == {"a": 400, "b": 400}
+    # Floors: 2 x 12 W
+    assert over_budget == 19.0
+
+
+def test_budget_uses_autotune_profile():
+    """Test that measured autotune power overrides the linear model."""
+    miner = make_miner("a", "BM1370", 15.0, 1000.0, profile={400: (1100, 9.0), 500: (1200, 15.0)})
+
+    assert miner.power_at(400) == 9.0
+    assert miner.power_at(450) == 13.5
+    assert solve_power_budget([miner], 10.0) == ({"a": 400}, 0)
+
+
+def test_budget_reaches_unaligned_maximum():
+    """Test that a maximum off the frequency grid is still reachable."""
+    miner = make_miner("a", "BM1370", 15.0, 1000.0, frequency=490, max_frequency=490)
+
+    assert miner.frequencies(25)[-1] == 490
+    assert solve_power_budget([miner], 100.0) == ({"a": 490}, 0)
+
+
+@pytest.mark.asyncio
+async def test_plan_keeps_miners_with_the_same_name(fleet, session):
+    """Test that miners sharing a display name each get their own plan entry."""
+    hass = MagicMock()
+    hass.data = {DOMAIN: {}}
+    for index, (_sim, host) in enumerate(fleet[:2]):
+        api = AxeOSAPI(session, host)
+        coordinator = MagicMock(data=await api.get_system_info(), last_update_success=True)
+        coordinator.async_request_refresh = AsyncMock()
+        hass.data[DOMAIN][f"entry{index}"] = {"api": api, "coordinator": coordinator, "name": "BitAxe"}
+    controller = AxeOSPowerBudgetController(hass)
+    controller._store = AsyncMock()
+
+    plan = await controller.async_set_budget(1000.0, 400, None)
+
+    assert list(plan["miners"]) == ["entry0", "entry1"]
+    assert all(target["name"] == "BitAxe" for target in plan["miners"].values())
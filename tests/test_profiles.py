@@ -0,0 +1,169 @@
+"""Tests for the entity profiles."""
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.axeos_ha_integration.binary_sensor import BINARY_SENSOR_TYPES
+from custom_components.axeos_ha_integration.number import NUMBER_TYPES
+from custom_components.axeos_ha_integration.profiles import (
+    ASIC_KEY,
+    ENERGY_KEY,
+    PROFILE_CUSTOM,
+    PROFILE_ENTITIES,
+    PROFILE_FULL,
+    PROFILE_MINIMAL,
+    PROFILE_STANDARD,
+    RESTART_KEY,
+    async_sync_entity_registry,
+    entity_enabled,
+    entity_key,
+)
+from custom_components.axeos_ha_integration.sensor import SENSOR_TYPES
+from custom_components.axeos_ha_integration.switch import SWITCH_TYPES
+
+KNOWN_KEYS = {
+    "sensor": {*SENSOR_TYPES, ENERGY_KEY, ASIC_KEY},
+    "binary_sensor": set(BINARY_SENSOR_TYPES),
+    "number": set(NUMBER_TYPES),
+    "switch": set(SWITCH_TYPES),
+    "button": {RESTART_KEY},
+}
+
+
+@pytest.mark.parametrize("profile", list(PROFILE_ENTITIES))
+def test_profile_keys_exist(profile):
+    """Test that every profile only names existing entities."""
+    for platform, keys in PROFILE_ENTITIES[profile].items():
+        assert set(keys) <= KNOWN_KEYS[platform]
+
+
+def test_minimal_is_small():
+    """Test that the minimal profile stays around a dozen entities."""
+    assert sum(len(keys) for keys in PROFILE_ENTITIES[PROFILE_MINIMAL].values()) <= 15
+
+
+def test_full_is_default():
+    """Test that entries without a profile keep every entity enabled."""
+    assert entity_enabled({}, "sensor", "pidP") is True
+    assert entity_enabled({"entity_profile": PROFILE_FULL}, "switch", "flipscreen") is True
+
+
+def test_minimal_skips_other_entities():
+    """Test that the minimal profile does not create entities outside its set."""
+    options = {"entity_profile": PROFILE_MINIMAL}
+    assert entity_enabled(options, "sensor", "hashRate") is True
+    assert entity_enabled(options, "sensor", "pidP") is None
+    assert entity_enabled(options, "number", "frequency") is None
+
+
+def test_standard_disables_other_entities():
+    """Test that the standard profile creates the rest disabled by default."""
+    options = {"entity_profile": PROFILE_STANDARD}
+    assert entity_enabled(options, "number", "frequency") is True
+    assert entity_enabled(options, "sensor", "pidP") is False
+
+
+def test_custom_selection():
+    """Test the custom profile, including platforms without a selection."""
+    options = {"entity_profile": PROFILE_CUSTOM, "custom_entities": {"sensor": ["power"], "switch": []}}
+    assert entity_enabled(options, "sensor", "power") is True
+    assert entity_enabled(options, "sensor", "hashRate") is None
+    assert entity_enabled(options, "switch", "autofanspeed") is None
+    assert entity_enabled(options, "button", RESTART_KEY) is True
+
+
+def test_entity_key_from_unique_id():
+    """Test that registered unique IDs map back to profile keys."""
+    assert entity_key("sensor", "miner_hashRate", "entry", "miner") == "hashRate"
+    assert entity_key("sensor", "miner_asic3_temp", "entry", "miner") == ASIC_KEY
+    assert entity_key("sensor", "miner_asicCount", "entry", "miner") == "asicCount"
+    assert entity_key("number", "entry_frequency", "entry", "miner") == "frequency"
+    assert entity_key("button", "miner_restart_button", "entry", "miner") == RESTART_KEY
+    assert entity_key("sensor", "other_hashRate", "entry", "miner") is None
+
+
+class FakeRegistry:
+    """Entity registry holding SimpleNamespace entries."""
+
+    def __init__(self, *entities):
+        self.entities = {entity.entity_id: entity for entity in entities}
+
+    def async_update_entity(self, entity_id, disabled_by):
+        self.entities[entity_id].disabled_by = disabled_by
+
+    def async_remove(self, entity_id):
+        del self.entities[entity_id]
+
+
+def sync(registry, entry):
+    hass = MagicMock()
+    hass.config_entries.async_update_entry.side_effect = lambda entry, data: setattr(entry, "data", data)
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(er, "async_get", lambda hass: registry)
+        patch.setattr(er, "async_entries_for_config_entry", lambda registry, entry_id: list(registry.entities.values()))
+        async_sync_entity_registry(hass, entry, "miner")
+
+
+def registered(entity_id, unique_id, disabled_by=None):
+    return SimpleNamespace(
+        entity_id=entity_id, domain=entity_id.split(".")[0], unique_id=unique_id, disabled_by=disabled_by
+    )
+
+
+def test_profile_change_updates_registered_entities():
+    """Test that entities registered under the full profile follow a later profile."""
+    pid = registered("sensor.miner_pid_p", "miner_pidP")
+    frequency = registered("number.miner_frequency", "entry_frequency")
+    hashrate = registered("sensor.miner_hashrate", "miner_hashRate")
+    flipscreen = registered("switch.miner_flip_screen", "miner_flipscreen", er.RegistryEntryDisabler.USER)
+    registry = FakeRegistry(pid, frequency, hashrate, flipscreen)
+    entry = SimpleNamespace(entry_id="entry", data={}, options={"entity_profile": PROFILE_MINIMAL})
+
+    sync(registry, entry)
+    assert pid.disabled_by is er.RegistryEntryDisabler.INTEGRATION
+    assert frequency.disabled_by is er.RegistryEntryDisabler.INTEGRATION
+    assert hashrate.disabled_by is None
+    assert flipscreen.disabled_by is er.RegistryEntryDisabler.USER
+
+    entry.options = {"entity_profile": PROFILE_STANDARD}
+    sync(registry, entry)
+    assert frequency.disabled_by is None
+    assert pid.disabled_by is er.RegistryEntryDisabler.INTEGRATION
+
+    entry.options = {"entity_profile": PROFILE_FULL}
+    sync(registry, entry)
+    assert pid.disabled_by is None
+    assert flipscreen.disabled_by is er.RegistryEntryDisabler.USER
+
+
+def test_standard_keeps_entities_enabled_by_hand():
+    """Test that the standard profile only disables its extras when it is newly applied."""
+    pid = registered("sensor.miner_pid_p", "miner_pidP")
+    registry = FakeRegistry(pid)
+    entry = SimpleNamespace(entry_id="entry", data={}, options={"entity_profile": PROFILE_STANDARD})
+
+    sync(registry, entry)
+    assert pid.disabled_by is er.RegistryEntryDisabler.INTEGRATION
+
+    pid.disabled_by = None
+    sync(registry, entry)
+    assert pid.disabled_by is None
+
+
+def test_excluded_churn_sensors_are_removed():
+    """Test that sensors replaced by the hourly statistics leave no registry entries behind."""
+    hashrate = registered("sensor.miner_hashrate", "miner_hashRate")
+    vr_temp = registered("sensor.miner_vr_temp", "miner_vrTemp")
+    voltage = registered("sensor.miner_voltage", "miner_voltage")
+    registry = FakeRegistry(hashrate, vr_temp, voltage)
+    entry = SimpleNamespace(entry_id="entry", data={}, options={"exclude_churn_sensors": True})
+
+    # Without the hourly statistics the option has no effect
+    sync(registry, entry)
+    assert set(registry.entities) == {"sensor.miner_hashrate", "sensor.miner_vr_temp", "sensor.miner_voltage"}
+
+    entry.options = {"hourly_statistics": True, "exclude_churn_sensors": True}
+    sync(registry, entry)
+    assert set(registry.entities) == {"sensor.miner_voltage"}
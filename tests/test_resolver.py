@@ -0,0 +1,128 @@
+"""Tests for host resolution caching and MAC-based rediscovery."""
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.axeos_ha_integration.api import AxeOSAPI, HostResolver
+
+
+def test_split_host_and_port():
+    """Test parsing of configured hosts."""
+    resolver = HostResolver("bitaxe-12.local:8080")
+    assert (resolver.name, resolver.port, resolver.is_ip) == ("bitaxe-12.local", "8080", False)
+    resolver = HostResolver("192.168.1.100")
+    assert (resolver.name, resolver.port, resolver.is_ip) == ("192.168.1.100", "", True)
+    assert resolver.netloc("10.0.0.2") == "10.0.0.2"
+
+
+@pytest.mark.asyncio
+async def test_host_name_is_resolved_once_per_ttl(miner, session):
+    """Test that polls reuse a cached resolution."""
+    _sim, host = miner
+    port = host.rpartition(":")[2]
+    api = AxeOSAPI(session, f"localhost:{port}")
+
+    for _ in range(3):
+        assert await api.get_system_info() is not None
+
+    assert api.stats["dns_lookups"] == 1
+    assert api.resolver.pinned == "127.0.0.1"
+
+
+@pytest.mark.asyncio
+async def test_failed_lookup_falls_back_to_pinned_address():
+    """Test that the last good address is used when resolution fails."""
+    resolver = HostResolver("bitaxe-12.local", ttl=0)
+    loop = asyncio.get_running_loop()
+
+    async def resolved(*args, **kwargs):
+        return [(None, None, None, "", ("192.168.1.50", 0))]
+
+    with patch.object(loop, "getaddrinfo", resolved):
+        assert await resolver.async_resolve() == "192.168.1.50"
+    resolver.pin("192.168.1.50")
+
+    with patch.object(loop, "getaddrinfo", side_effect=OSError("mDNS timeout")):
+        assert await resolver.async_resolve() == "192.168.1.50"
+        resolver.pinned = None
+        with pytest.raises(OSError):
+            await resolver.async_resolve()
+
+
+@pytest.mark.asyncio
+async def test_moved_miner_is_found_by_mac(miner, session):
+    """Test that a miner is found at a new address after repeated failures."""
+    sim, host = miner
+    port = host.rpartition(":")[2]
+    # Configured address is stale; the miner now answers on 127.0.0.1
+    api = AxeOSAPI(
+        session,
+        f"127.0.0.9:{port}",
+        mac_addr=sim.mac_addr,
+        connect_timeout=0.5,
+        read_timeout=0.5,
+        poll_budget=0,
+    )
+
+    for _ in range(3):
+        assert await api.get_system_info() is None
+
+    # The scan runs in the background; the poll did not wait for it
+    assert api.resolver.relocated is None
+    await api._rediscovery
+    assert api.resolver.relocated == "127.0.0.1"
+    assert api.stats["rediscoveries"] == 1
+    assert await api.get_system_info() is not None
+    assert await api.set_frequency(500) is True
+    assert sim.frequency == 500
+
+
+@pytest.mark.asyncio
+async def test_rediscovery_is_cancelled(miner, session):
+    """Test that a running scan can be stopped, e.g. on unload."""
+    sim, host = miner
+    port = host.rpartition(":")[2]
+    api = AxeOSAPI(
+        session,
+        f"127.0.0.9:{port}",
+        mac_addr=sim.mac_addr,
+        connect_timeout=0.5,
+        read_timeout=0.5,
+        poll_budget=0,
+    )
+
+    for _ in range(3):
+        await api.get_system_info()
+    api.cancel_rediscovery()
+
+    with pytest.raises(asyncio.CancelledError):
+        await api._rediscovery
+    assert api.resolver.relocated is None
+
+
+@pytest.mark.asyncio
+async def test_rediscovery_at_setup(miner, session):
+    """Test that a miner unreachable at setup is searched for right away."""
+    sim, host = miner
+    port = host.rpartition(":")[2]
+    relocated = []
+    api = AxeOSAPI(
+        session,
+        f"127.0.0.9:{port}",
+        mac_addr=sim.mac_addr,
+        connect_timeout=0.5,
+        read_timeout=0.5,
+        poll_budget=0,
+        on_relocate=relocated.append,
+    )
+
+    assert await api.get_system_info() is None
+    assert await api.async_rediscover() is True
+    assert relocated == ["127.0.0.1"]
+    assert await api.get_system_info() is not None
+
+    # A setup retry carries the time of the last scan over
+    retry = AxeOSAPI(session, f"127.0.0.9:{port}", mac_addr=sim.mac_addr, last_rediscovery=api.last_rediscovery)
+    assert await retry.async_rediscover() is False
+    assert retry.stats["rediscoveries"] == 0
@@ -0,0 +1,90 @@
+"""Tests for rolling restarts against simulated miners."""
+import time
+
+import pytest
+
+from custom_components.axeos_ha_integration.api import AxeOSAPI
+from custom_components.axeos_ha_integration.rolling_restart import (
+    STATUS_RECOVERED,
+    RollingRestartSettings,
+    async_rolling_restart,
+)
+
+
+def prepare(fleet, session):
+    """Miners that have been up for a while and need a moment to reboot and warm up."""
+    miners = {}
+    for index, (sim, host) in enumerate(fleet):
+        sim.boot_time = time.monotonic() - 1000
+        sim.reboot_seconds = 0.05
+        sim.warmup_seconds = 0.1
+        miners[f"miner{index}"] = AxeOSAPI(session, host)
+    return miners
+
+
+def settings(**kwargs):
+    values = {"wave_size": 2, "wave_spacing": 0.01, "poll_interval": 0.01, "timeout": 2}
+    values.update(kwargs)
+    return RollingRestartSettings(**values)
+
+
+@pytest.mark.asyncio
+async def test_restarts_in_waves_after_recovery(fleet, session):
+    """Test that the second wave starts only after the first one hashes again."""
+    report = await async_rolling_restart(prepare(fleet, session), settings())
+
+    assert report["status"] == "completed"
+    assert report["waves"] == 2
+    for result in report["miners"].values():
+        assert result["status"] == STATUS_RECOVERED
+        assert result["reboot_seconds"] <= result["recovery_seconds"]
+    assert report["max_recovery_seconds"] is not None
+    # miner2 was restarted after miner0 had rebooted and warmed up
+    first, third = fleet[0][0], fleet[2][0]
+    assert third.boot_time - first.boot_time >= first.reboot_seconds + 0.9 * first.warmup_seconds
+
+
+@pytest.mark.asyncio
+async def test_failed_restart_halts(fleet, session):
+    """Test that a miner rejecting the restart stops the following waves."""
+    miners = prepare(fleet, session)
+    fleet[0][0].faults.extend(["ok", "error"])
+
+    report = await async_rolling_restart(miners, settings(wave_size=1))
+
+    assert report["status"] == "halted"
+    assert report["miners"]["miner0"]["error"] == "restart request failed"
+    assert report["miners"]["miner1"]["status"] == "not_started"
+    assert ("POST", "/api/system/restart") not in fleet[1][0].requests
+
+
+@pytest.mark.asyncio
+async def test_hashrate_that_does_not_recover_fails(fleet, session):
+    """Test the recovery timeout after a successful reboot."""
+    miners = prepare(fleet, session)
+    fleet[0][0].warmup_seconds = 100
+
+    report = await async_rolling_restart(miners, settings(timeout=0.3))
+
+    result = report["miners"]["miner0"]
+    assert report["status"] == "halted"
+    assert result["error"] == "hashrate did not recover"
+    assert result["reboot_seconds"] is not None
+    # miner1 was in the same wave and recovered; miner2 was never restarted
+    assert report["miners"]["miner1"]["status"] == STATUS_RECOVERED
+    assert report["miners"]["miner2"]["status"] == "not_started"
+
+
+@pytest.mark.asyncio
+async def test_miners_with_the_same_name_are_all_restarted(fleet, session):
+    """Test that miners sharing a display name each get their own restart and result."""
+    miners = prepare(fleet, session)
+
+    report = await async_rolling_restart(miners, settings(), dict.fromkeys(miners, "BitAxe"))
+
+    assert report["status"] == "completed"
+    assert list(report["miners"]) == ["miner0", "miner1", "miner2"]
+    for result in report["miners"].values():
+        assert result["name"] == "BitAxe"
+        assert result["status"] == STATUS_RECOVERED
+    assert all(("POST", "/api/system/restart") in sim.requests for sim, _host in fleet)
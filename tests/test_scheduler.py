@@ -0,0 +1,171 @@
+"""Tests for the per-miner request scheduler."""
+import asyncio
+import json
+
+import pytest
+from aiohttp import ClientSession
+from unittest.mock import MagicMock, patch
+
+from custom_components.axeos_ha_integration.api import AxeOSAPI
+from custom_components.axeos_ha_integration.scheduler import (
+    PRIORITY_POLL,
+    PRIORITY_WRITE,
+    RequestScheduler,
+)
+
+
+async def _hold(scheduler, priority, name, order, release):
+    async with scheduler.slot(priority):
+        order.append(name)
+        await release.wait()
+
+
+@pytest.mark.asyncio
+async def test_writes_are_granted_before_queued_polls():
+    """Test that a write queued after polls gets the next free slot."""
+    scheduler = RequestScheduler(max_in_flight=1)
+    order: list[str] = []
+    release = asyncio.Event()
+
+    tasks = [asyncio.create_task(_hold(scheduler, PRIORITY_POLL, "poll-1", order, release))]
+    await asyncio.sleep(0)
+    tasks.append(asyncio.create_task(_hold(scheduler, PRIORITY_POLL, "poll-2", order, release)))
+    tasks.append(asyncio.create_task(_hold(scheduler, PRIORITY_WRITE, "write", order, release)))
+    await asyncio.sleep(0)
+
+    assert order == ["poll-1"]
+    assert scheduler.stats["queue_depth"] == 2
+    release.set()
+    await asyncio.gather(*tasks)
+
+    assert order == ["poll-1", "write", "poll-2"]
+    assert scheduler.stats["queue_depth"] == 0
+    assert scheduler.in_flight == 0
+    assert scheduler.stats["max_queue_wait_seconds"] >= 0
+
+
+@pytest.mark.asyncio
+async def test_limits_requests_in_flight():
+    """Test that no more than max_in_flight requests run at once."""
+    scheduler = RequestScheduler(max_in_flight=2)
+    running = peak = 0
+
+    async def request():
+        nonlocal running, peak
+        async with scheduler.slot(PRIORITY_POLL):
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+    await asyncio.gather(*(request() for _ in range(6)))
+
+    assert peak == 2
+    assert scheduler.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_the_queue():
+    """Test that cancelling a queued request neither leaks nor blocks a slot."""
+    scheduler = RequestScheduler(max_in_flight=1)
+    order: list[str] = []
+    release = asyncio.Event()
+
+    first = asyncio.create_task(_hold(scheduler, PRIORITY_POLL, "first", order, release))
+    await asyncio.sleep(0)
+    cancelled = asyncio.create_task(_hold(scheduler, PRIORITY_WRITE, "cancelled", order, release))
+    last = asyncio.create_task(_hold(scheduler, PRIORITY_POLL, "last", order, release))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    await asyncio.sleep(0)
+    assert scheduler.stats["queue_depth"] == 1
+
+    release.set()
+    await asyncio.gather(first, last)
+
+    assert order == ["first", "last"]
+    assert scheduler.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_queued_polls_are_coalesced():
+    """Test that polls arriving while one is queued share its result."""
+    session = MagicMock(spec=ClientSession)
+    api = AxeOSAPI(session, "192.168.1.100")
+    gate = asyncio.Event()
+
+    class Request:
+        """Stand-in for aiohttp's request context manager."""
+
+        async def __aenter__(self):
+            await gate.wait()
+            body = json.dumps({"power": 12.5}).encode()
+
+            async def iter_any():
+                yield body
+
+            response = MagicMock()
+            response.status = 200
+            response.content_length = len(body)
+            response.content.iter_any = iter_any
+            return response
+
+        async def __aexit__(self, *exc_info):
+            return None
+
+    session.get = MagicMock(side_effect=lambda url, **kwargs: Request())
+
+    # A write holds the only slot, so the polls below have to queue
+    write_gate = asyncio.Event()
+
+    async def blocking_write():
+        async with api.scheduler.slot(PRIORITY_WRITE):
+            await write_gate.wait()
+
+    writer = asyncio.create_task(blocking_write())
+    await asyncio.sleep(0)
+    polls = [asyncio.create_task(api.get_system_info()) for _ in range(3)]
+    await asyncio.sleep(0)
+    write_gate.set()
+    gate.set()
+    results = await asyncio.gather(*polls)
+    await writer
+
+    assert session.get.call_count == 1
+    assert results[0] == {"power": 12.5}
+    assert results[0] is results[1] is results[2]
+    assert api.stats["coalesced_polls"] == 2
+    assert api.stats["polls"] == 1
+
+
+@pytest.mark.asyncio
+async def test_retry_keeps_newer_queued_poll(miner, session):
+    """Test that a retrying poll does not drop a newer poll queued behind it."""
+    sim, host = miner
+    api = AxeOSAPI(session, host, connect_timeout=0.2, read_timeout=0.2, poll_budget=60)
+    # First attempt fails, the retry hangs until its timeout
+    sim.faults = ["error", "hang"]
+    write_gate = asyncio.Event()
+
+    async def blocking_write():
+        async with api.scheduler.slot(PRIORITY_WRITE):
+            await write_gate.wait()
+
+    with patch("custom_components.axeos_ha_integration.api.random.uniform", return_value=0.05):
+        first = asyncio.create_task(api.get_system_info())
+        while not api.stats["retries"]:
+            await asyncio.sleep(0.01)
+        # The retry queues behind a write, then a newer poll queues behind the retry
+        writer = asyncio.create_task(blocking_write())
+        await asyncio.sleep(0.1)
+        second = asyncio.create_task(api.get_system_info())
+        await asyncio.sleep(0)
+        write_gate.set()
+        await asyncio.sleep(0.05)
+        # The retry holds the slot now; this caller has to join the queued poll
+        third = asyncio.create_task(api.get_system_info())
+        results = await asyncio.wait_for(asyncio.gather(first, second, third), 5)
+        await writer
+
+    assert results[1] is not None and results[2] is results[1]
+    assert api.stats["coalesced_polls"] == 1
@@ -8,6 +8,7 @@ from homeassistant.const import EntityCategory
 from custom_components.axeos_ha_integration.sensor import (
     SENSOR_TYPES,
     AxeOSHASensor,
+    SignificantChangeFilter,
     get_value,
 )
 
@@ -35,7 +36,9 @@ def mock_coordinator():
     return coordinator
 
 
-def make_sensor(coordinator, key: str, entry_id: str = "test_entry") -> AxeOSHASensor:
+def make_sensor(
+    coordinator, key: str, entry_id: str = "test_entry", publish_filter=None
+) -> AxeOSHASensor:
     """Create a sensor entity from its SENSOR_TYPES definition."""
     name, unit, path, device_class, state_class, entity_category = SENSOR_TYPES[key]
     return AxeOSHASensor(
@@ -49,6 +52,7 @@ def make_sensor(coordinator, key: str, entry_id: str = "test_entry") -> AxeOSHAS
         device_class,
         state_class,
         entity_category,
+        publish_filter,
     )
 
 
@@ -180,3 +184,65 @@ def test_sensor_hashrate_history_attributes(mock_coordinator):
     assert attrs["hashrate_min"] == 400.0
     assert attrs["hashrate_max"] == 600.0
     assert attrs["hashrate_avg"] == 500.0
+
+
+def test_change_filter_deadband():
+    """Test that sub-deadband jitter is suppressed."""
+    change_filter = SignificantChangeFilter(absolute=0.1, relative=0.01, max_interval=0)
+    change_filter.published(12.5, 0)
+
+    # Deadband is max(0.1, 1 % of 12.5) = 0.125
+    assert change_filter.should_publish(12.5, 10) is False
+    assert change_filter.should_publish(12.6, 10) is False
+    assert change_filter.should_publish(12.7, 10) is True
+
+
+def test_change_filter_heartbeat_and_min_interval():
+    """Test heartbeat publishing and the minimum publish interval."""
+    change_filter = SignificantChangeFilter(absolute=1.0, min_interval=30, max_interval=300)
+    change_filter.published(45.0, 0)
+
+    assert change_filter.should_publish(50.0, 10) is False
+    assert change_filter.should_publish(50.0, 30) is True
+    assert change_filter.should_publish(45.5, 299) is False
+    assert change_filter.should_publish(45.5, 300) is True
+    # Identical values never need a write
+    assert change_filter.should_publish(45.0, 1000) is False
+
+
+def test_change_filter_missing_value():
+    """Test that values appearing or disappearing are always published."""
+    change_filter = SignificantChangeFilter(absolute=1.0, min_interval=60)
+    change_filter.published(45.0, 0)
+
+    assert change_filter.should_publish(None, 1) is True
+
+
+def test_sensor_with_change_filter(mock_coordinator):
+    """Test that the sensor keeps its published state within the deadband."""
+    sensor = make_sensor(
+        mock_coordinator, "power", publish_filter=SignificantChangeFilter(absolute=0.5, max_interval=0)
+    )
+    refresh(sensor)
+    assert sensor.native_value == 12.5
+
+    mock_coordinator.data["power"] = 12.7
+    refresh(sensor)
+    assert sensor.native_value == 12.5
+
+    mock_coordinator.data["power"] = 13.5
+    refresh(sensor)
+    assert sensor.native_value == 13.5
+
+
+def test_sensor_with_change_filter_publishes_availability(mock_coordinator):
+    """Test that a failed update is always written."""
+    sensor = make_sensor(
+        mock_coordinator, "power", publish_filter=SignificantChangeFilter(absolute=0.5, max_interval=0)
+    )
+    refresh(sensor)
+
+    mock_coordinator.last_update_success = False
+    with patch.object(sensor, "async_write_ha_state") as write:
+        sensor._handle_coordinator_update()
+    write.assert_called_once()
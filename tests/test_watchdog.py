@@ -0,0 +1,98 @@
+"""Tests for the hung-miner watchdog."""
+from unittest.mock import AsyncMock
+
+import pytest
+
+from custom_components.axeos_ha_integration.watchdog import (
+    ACTION_GIVE_UP,
+    ACTION_RESTART,
+    REASON_DUPLICATE_NONCES,
+    REASON_SHARES_FLAT,
+    REASON_ZERO_HASHRATE,
+    AxeOSWatchdog,
+    WatchdogSettings,
+)
+
+SETTINGS = WatchdogSettings(
+    shares_window=600,
+    hashrate_window=120,
+    nonce_window=300,
+    nonce_threshold=5,
+    cooldown=300,
+    escalation_window=7200,
+    max_restarts=2,
+)
+
+
+def snapshot(shares=100, hashrate=1000.0, nonces=0, uptime=10_000):
+    return {"sharesAccepted": shares, "hashRate": hashrate, "duplicateHWNonces": nonces, "uptimeSeconds": uptime}
+
+
+def test_healthy_miner_is_left_alone():
+    """Test that rising shares and a positive hashrate never trigger."""
+    watchdog = AxeOSWatchdog(SETTINGS)
+    for step in range(100):
+        assert watchdog.update(snapshot(shares=100 + step, uptime=10_000 + step * 30), now=step * 30) is None
+    assert watchdog.state["stalled"] is False
+
+
+def test_flat_shares_trigger_restart_after_window():
+    """Test detection of an unchanged accepted share counter."""
+    watchdog = AxeOSWatchdog(SETTINGS)
+    assert watchdog.update(snapshot(), now=0) is None
+    assert watchdog.update(snapshot(), now=590) is None
+
+    incident = watchdog.update(snapshot(), now=600)
+
+    assert incident["action"] == ACTION_RESTART
+    assert incident["reasons"] == [REASON_SHARES_FLAT]
+    assert watchdog.state["stalled"] is True
+    assert list(watchdog.incidents) == [incident]
+
+
+def test_zero_hashrate_and_duplicate_nonces():
+    """Test the zero hashrate window and the duplicate nonce rise."""
+    watchdog = AxeOSWatchdog(SETTINGS)
+    watchdog.update(snapshot(shares=1, hashrate=0.0), now=0)
+    assert watchdog.update(snapshot(shares=2, hashrate=0.0, nonces=4), now=100) is None
+
+    incident = watchdog.update(snapshot(shares=3, hashrate=0.0, nonces=6), now=130)
+
+    assert incident["reasons"] == [REASON_ZERO_HASHRATE, REASON_DUPLICATE_NONCES]
+
+
+def test_escalation_cooldown_and_give_up():
+    """Test doubling cooldowns, giving up and recovery."""
+    watchdog = AxeOSWatchdog(SETTINGS)
+    watchdog.update(snapshot(), now=0)
+    assert watchdog.update(snapshot(), now=600)["action"] == ACTION_RESTART
+
+    # Rebooted but not hashing: stalled again, held back by the 300 s cooldown
+    watchdog.update(snapshot(shares=0, hashrate=0.0, uptime=10), now=620)
+    assert watchdog.update(snapshot(shares=0, hashrate=0.0, uptime=150), now=760) is None
+    assert watchdog.state["stalled"] is True
+    assert watchdog.update(snapshot(shares=0, hashrate=0.0, uptime=290), now=900)["action"] == ACTION_RESTART
+    assert watchdog.state["restarts"] == 2
+
+    # The second cooldown is doubled (600 s), then the watchdog gives up
+    watchdog.update(snapshot(shares=0, hashrate=0.0, uptime=10), now=920)
+    assert watchdog.update(snapshot(shares=0, hashrate=0.0, uptime=1000), now=1499) is None
+    assert watchdog.update(snapshot(shares=0, hashrate=0.0, uptime=1010), now=1500)["action"] == ACTION_GIVE_UP
+    assert watchdog.update(snapshot(shares=0, hashrate=0.0, uptime=2000), now=5000) is None
+
+    # Healthy again: the watchdog is armed once more
+    watchdog.update(snapshot(shares=5, uptime=2030), now=5030)
+    assert watchdog.state["gave_up"] is False
+
+
+@pytest.mark.asyncio
+async def test_restart_is_recorded_in_incident():
+    """Test that the restart outcome ends up in the incident log."""
+    watchdog = AxeOSWatchdog(SETTINGS)
+    watchdog.update(snapshot(), now=0)
+    incident = watchdog.update(snapshot(), now=600)
+    api = AsyncMock()
+    api.restart_system.return_value = True
+
+    assert await watchdog.async_restart(api, incident)
+    assert watchdog.incidents[-1]["restarted"] is True